@@ -2,15 +2,32 @@
 
 import argparse as ap
 import curses
-import pathlib
 import os
 from .model import Model
+from .database import Database, logging_config
 from .controller.controller_remote import ControllerRemote
 from .controller.controller_local import ControllerLocal
 from .controller.controller_client import ControllerClient
+from .controller.controller_ai import ControllerAI
+from .controller import load_test
+from .controller.input_stage import InputStage, MODES
 from .view.view_gui import ViewGUI
 from .view.view_shell import ViewShell
 from .event_manager import EventManager, StartEvent
+from .spectator import SpectatorBroadcast
+from .policies import POLICIES
+from . import simulation
+
+
+def target_tile(text: str) -> int:
+    """Converts the argument of --target, a power of two from 4 on"""
+    try:
+        tile = int(text)
+    except ValueError:
+        raise ap.ArgumentTypeError(f"{text!r} is not a number") from None
+    if tile < 4 or tile & (tile - 1):
+        raise ap.ArgumentTypeError(f"the target tile has to be a power of two from 4 on, not {tile}")
+    return tile
 
 
 def main() -> None:
@@ -24,46 +41,84 @@ def main() -> None:
                         type=int, default=4)
     parser.add_argument("--_height", help="choose own height (default=4)",
                         type=int, default=4)
+    parser.add_argument("--target", help="the tile that wins the game (default: 2048)",
+                        type=target_tile, default=2048)
+    parser.add_argument("--no_autosave", help="don't journal the game to recover it after a crash",
+                        action="store_true")
     parser.add_argument("--logging", help="Choose to log the game activity (default: no logging)",
                         action="store_true")
     parser.add_argument('--client', type=str)
+    parser.add_argument("--watch", help="with --client: only show the board of the game on the server",
+                        action="store_true")
+    parser.add_argument("--ai", help="let an expectimax search play the game",
+                        action="store_true")
+    parser.add_argument("--ai_budget", help="milliseconds the --ai search may take per move (default: 10)",
+                        type=float, default=10)
+    parser.add_argument("--simulate", help="play N games without a window and print statistics",
+                        type=int, metavar="N")
+    parser.add_argument("--workers", help="number of processes for --simulate (default: all cores)",
+                        type=int, default=os.cpu_count())
+    parser.add_argument("--policy", help="player for --simulate (default: random)",
+                        choices=list(POLICIES), default="random")
+    parser.add_argument("--seed", help="seed for --simulate (default: 0)",
+                        type=int, default=0)
+    parser.add_argument("--summary", help="write the summary of --simulate to a JSON file",
+                        type=str)
+    parser.add_argument("--asyncio", help="run events, frames and sockets as tasks of one asyncio loop (default: threads)",
+                        action="store_true")
+    parser.add_argument("--load_test", help="connect N clients to a --bci server on this computer and print statistics",
+                        type=int, metavar="N")
+    parser.add_argument("--load_commands", help="commands per client for --load_test (default: 1000)",
+                        type=int, default=1000)
+    parser.add_argument("--input_mode", help="filter for --bci commands within --input_window (default: none)",
+                        choices=MODES, default="none")
+    parser.add_argument("--input_window", help="milliseconds of an --input_mode window (default: 100)",
+                        type=float, default=100)
+    parser.add_argument("--max_rate", help="maximum number of --bci slide commands per second (default: no limit)",
+                        type=float)
+    parser.add_argument("--frame_timing", help="write the timings of the last frames to a CSV file on quit",
+                        type=str)
     args = parser.parse_args()
 
     if args.client:
-        ControllerClient(args.client)
+        ControllerClient(args.client, args.asyncio, watch=args.watch)
         return
 
-    # Create a config file, so that database knows if we should log actions or not
-    file_name = "Config - Logging.txt"
-    current_path = pathlib.Path(__file__).parent.resolve()
-    root_path = current_path.parent
-    file_path = os.path.join(root_path, file_name)
+    if args.load_test:
+        load_test.run(args.load_test, args.load_commands)
+        return
 
+    if args.simulate:
+        simulation.run(args.simulate, args.workers, args.policy, seed=args.seed,
+                       height=args._height, width=args._width, summary_path=args.summary)
+        return
+
+    # Tell the database once, whether we should log actions or not
+    logging_config.set(args.logging)
     if args.logging:
-        file_content = "True"
-        with open(file_path, "w") as file:
-            file.write(file_content)
-    else:
-        file_content = "False"
-        with open(file_path, "w") as file:
-            file.write(file_content)
+        # Keep the disk writes of the logs away from the game and view threads
+        Database.start_log_writer()
 
-    ev_manager = EventManager()
+    ev_manager = EventManager(use_asyncio=args.asyncio)
     
     # Instantiate the model object
-    game = Model(ev_manager)
+    game = Model(ev_manager, target=args.target, autosave=not args.no_autosave)
 
     # Instantiate a view object
     stdscr = None
     if args.shell:
         stdscr = curses.initscr()
-        ViewShell(ev_manager, game, stdscr)
+        ViewShell(ev_manager, game, stdscr, args.frame_timing)
     else:
-        ViewGUI(ev_manager, game, args.bci)
+        ViewGUI(ev_manager, game, args.bci, args.frame_timing)
 
     ControllerLocal(ev_manager, stdscr)
+    if args.ai:
+        ControllerAI(ev_manager, game, time_budget=args.ai_budget / 1000)
     if args.bci:                            # Instantiate a controller object
-        ControllerRemote(ev_manager)
+        # Clients can watch the game with --client HOST --watch
+        stage = InputStage(args.input_mode, args.input_window / 1000, args.max_rate)
+        ControllerRemote(ev_manager, spectators=SpectatorBroadcast(ev_manager, game), input_stage=stage)
 
     # Start the game
     ev_manager.post(StartEvent())
@@ -16,6 +16,10 @@ class Command(Enum):
     EMPTY = 9
 
 
+# The commands that slide the tiles
+DIRECTIONS = (Command.LEFT, Command.RIGHT, Command.UP, Command.DOWN)
+
+
 class Screen(Enum):
     """Possible game screens."""
     INSTRUCTIONS = 1
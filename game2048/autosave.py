@@ -0,0 +1,282 @@
+"""This file implements the crash-safe autosave of a running game
+
+Model hands every slide action to Autosave, which only queues it. A
+background thread keeps a copy of the game, applies the actions to it and
+appends them in batches to a journal file, flushed to the disk once per
+batch. After 'compact_every' actions and after a restart it writes the
+copy into the save file instead (see database.write_atomic) and starts a
+new, empty journal.
+
+The save file and the journal carry a generation number. On startup
+recover() replays the journal onto the loaded save file, if both belong to
+the same generation. A journal, whose actions are already part of a newer
+save file, is ignored.
+
+Journal file: a header (magic, version, generation, height, width)
+followed by one record per action in the format of trace.py.
+"""
+
+import os
+import struct
+import time
+import threading
+from queue import Queue, Empty
+from .arguments import Command
+from .database import Database, write_atomic
+from .game_env import GameEnv
+from .trace import TraceRecord, encode_record, decode_records, apply_record
+
+MAGIC = b"G2048J"
+VERSION = 1
+JOURNAL_NAME = "Save - Journal.g2048j"
+
+_HEADER = struct.Struct("<6sBQHH")
+# Queued around the start of a new game, so that both games are saved at once
+_COMPACT = object()
+
+db = Database()
+
+
+class Autosave:
+    """This class implements the journal of a game and its compaction into the save file.
+
+    Attributes
+    ----------
+    _path : str
+        The path of the journal file.
+    _delay : float
+        Seconds an action may wait in the queue before its batch is written.
+    _batch_size : int
+        Write a batch once it has this many actions.
+    _compact_every : int
+        Write the save file instead of the journal after this many actions.
+    _generation : int
+        The generation of the current save file and journal.
+    _file
+        The open journal file of the writer thread, None until a journal of
+        the current generation exists.
+    """
+
+    def __init__(self, folder, delay=0.2, batch_size=64, compact_every=500):
+        """
+        Constructor of class Autosave.
+
+        Parameters
+        ----------
+        folder
+            The folder of the save files.
+        delay : float
+            Seconds an action may wait before it is written.
+        batch_size : int
+            The maximum number of actions written at once.
+        compact_every : int
+            The number of actions after which the save file is rewritten.
+        """
+        self._path = os.path.join(folder, JOURNAL_NAME)
+        self._delay = delay
+        self._batch_size = batch_size
+        self._compact_every = compact_every
+        self._generation = 0
+        self._file = None
+        self._width = None
+        self._since_compaction = 0
+        self._queue = Queue()
+        self._thread = None
+
+
+    def recover(self, env: GameEnv, generation=None) -> int:
+        """
+        Replays the journal onto the game loaded from the save file.
+
+        Parameters
+        ----------
+        env : GameEnv
+            The game of the save file.
+        generation : int
+            The generation of the save file (None for a save without journal).
+
+        Returns
+        -------
+        int
+            The number of replayed actions.
+        """
+        try:
+            with open(self._path, "rb") as file:
+                header = file.read(_HEADER.size)
+                data = file.read()
+        except FileNotFoundError:
+            header, data = b"", b""
+        if len(header) < _HEADER.size:
+            self._generation = generation or 0
+            return 0
+
+        magic, version, journal_generation, height, width = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            self._generation = generation or 0
+            return 0
+        # A newer generation must differ from the journal on the disk, too
+        self._generation = max(generation or 0, journal_generation)
+        if journal_generation != generation or env.field.shape != (height, width):
+            return 0
+
+        replayed = 0
+        for record in decode_records(data, width):
+            apply_record(env, record)
+            replayed += 1
+        return replayed
+
+
+    def start(self, env: GameEnv) -> None:
+        """
+        Starts the writer thread with a copy of the game, which is saved as a new generation at once.
+
+        Parameters
+        ----------
+        env : GameEnv
+            The game, after recover().
+        """
+        game = GameEnv(*env.field.shape)
+        game.exponents = env.exponents
+        game.score = env.score
+        self._thread = threading.Thread(target=self._run, args=(game,), daemon=True)
+        self._thread.start()
+
+
+    def record(self, command: Command, spawn=None, score=0) -> None:
+        """
+        Queues a slide action, returns at once. Must not be called after
+        close(), the writer thread doesn't take actions anymore.
+
+        Parameters
+        ----------
+        command : Command
+            The executed command.
+        spawn : tuple
+            The position and the value of the new tile or None.
+        score : int
+            The points scored by the action.
+        """
+        self._queue.put(self._trace_record(command, spawn, score))
+
+
+    def restart(self, spawns: list) -> None:
+        """
+        Queues the start of a new game. The finished game is saved first,
+        so that its score reaches the highscore record, then the new game.
+
+        Parameters
+        ----------
+        spawns : list
+            The positions and values of the first tiles of the new game, in
+            the order they were drawn (see GameEnv.start_tiles).
+        """
+        self._queue.put(_COMPACT)
+        self._queue.put(TraceRecord(Command.RESTART, None, 0, 0))
+        for spawn in spawns:
+            self._queue.put(self._trace_record(Command.START, spawn))
+        self._queue.put(_COMPACT)
+
+
+    def close(self) -> None:
+        """Blocks until every queued action is written and stops the writer
+        thread. Call it after the last record() or restart()."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._thread.join()
+        self._thread = None
+
+
+    @staticmethod
+    def _trace_record(command: Command, spawn=None, score=0) -> TraceRecord:
+        """Converts an action into a TraceRecord"""
+        if spawn is None:
+            return TraceRecord(command, None, 0, score)
+        position, value = spawn
+        return TraceRecord(command, position, value, score)
+
+
+    def _run(self, game: GameEnv) -> None:
+        """Writer loop"""
+        self._width = game.field.shape[1]
+        self._compact(game)
+        pending = []
+        first_pending = None
+        while True:
+            timeout = None if not pending else max(0.0, first_pending + self._delay - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                self._write(pending)
+                if self._file is not None:
+                    self._file.close()
+                item.set()
+                return
+            if item is _COMPACT:
+                # the new save file contains the pending actions
+                pending = []
+                self._compact(game)
+                continue
+
+            if item is not None:
+                apply_record(game, item)
+                pending.append(encode_record(self._width, item.command,
+                                             None if item.spawn is None else (item.spawn, item.value),
+                                             item.score))
+                if len(pending) == 1:
+                    first_pending = time.monotonic()
+
+            if pending and (len(pending) >= self._batch_size or time.monotonic() - first_pending >= self._delay):
+                # Without a journal the last compaction failed, it is retried
+                if self._file is None or self._since_compaction + len(pending) >= self._compact_every:
+                    self._compact(game)
+                else:
+                    self._write(pending)
+                pending = []
+
+
+    def _write(self, records: list) -> None:
+        """Appends records to the journal and flushes them to the disk"""
+        if not records or self._file is None:
+            return
+        try:
+            self._file.write(b"".join(records))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._since_compaction += len(records)
+        except OSError as error:
+            db.log(content=f"autosave.py -> the journal couldn't be written: {error}")
+
+
+    def _compact(self, game: GameEnv) -> None:
+        """Writes the game into the save file and starts a new journal"""
+        self._generation += 1
+        height, width = game.field.shape
+        saved = False
+        try:
+            # The save file comes first: until the new journal replaces the
+            # old one, the old journal has another generation and is ignored
+            db.create_save(matrix=None, current_highscore=game.score, board=game.exponents,
+                           generation=self._generation)
+            saved = True
+            write_atomic(self._path, _HEADER.pack(MAGIC, VERSION, self._generation, height, width))
+            journal = open(self._path, "ab")
+        except OSError as error:
+            db.log(content=f"autosave.py -> the game couldn't be saved: {error}")
+            if not saved:
+                # The old save file and journal are still valid
+                self._generation -= 1
+            elif self._file is not None:
+                # The old journal belongs to an older save file now
+                self._file.close()
+                self._file = None
+            return
+        if self._file is not None:
+            self._file.close()
+        self._file = journal
+        self._since_compaction = 0
@@ -0,0 +1,159 @@
+"""This file implements a packed bitboard representation of a 4x4 gamefield
+
+Every tile is stored as a 4-bit exponent (0 = empty, k = 2^k) in one 64-bit
+integer. Cell (i, j) lives at bit 4 * (4 * i + j), so row i is the 16-bit
+block starting at bit 16 * i and its first column is the lowest nibble.
+Slides are computed row by row with lookup tables that are built once at
+import time and follow exactly the move and merge rules of Model._slide.
+"""
+
+import numpy as np
+from .arguments import Command, DIRECTIONS
+
+SIZE = 4
+ROW_MASK = 0xFFFF
+MAX_EXPONENT = 15
+
+# Bit offsets of the 16 cells in row-major order
+_SHIFTS = np.arange(0, 64, 4, dtype=np.uint64)
+
+
+def _build_tables() -> (list, list, list):
+    """Computes the result of a left and a right slide for every possible row.
+
+    Returns
+    -------
+    tuple
+        The left-slide results, the right-slide results and the points
+        scored by a slide, each indexed by the 16-bit row value.
+        (Both directions merge the same pairs, so they share one score table.)
+    """
+    rows = np.arange(ROW_MASK + 1, dtype=np.int64)
+    cells = (rows[:, None] >> (4 * np.arange(SIZE))) & 0xF
+
+    def move_tiles(exps: np.ndarray) -> np.ndarray:
+        """Moves all non-empty tiles to the left, keeping their order"""
+        order = np.argsort(exps == 0, axis=1, kind="stable")
+        return np.take_along_axis(exps, order, axis=1)
+
+    def merge_tiles(exps: np.ndarray) -> (np.ndarray, np.ndarray):
+        """Merges equal neighbours from left to right, like Model._slide"""
+        score = np.zeros(len(exps), dtype=np.int64)
+        for j in range(SIZE - 1):
+            equal = (exps[:, j] == exps[:, j + 1]) & (exps[:, j] != 0)
+            exps[equal, j] += 1
+            exps[equal, j + 1] = 0
+            score[equal] += np.int64(1) << exps[equal, j]
+        return exps, score
+
+    moved, score = merge_tiles(move_tiles(cells))
+    moved = move_tiles(moved)
+    # Merging two 2^15 tiles can't be stored in a nibble: these rows are
+    # marked with a negative score, so that slide() refuses them
+    overflow = (moved > MAX_EXPONENT).any(axis=1)
+    score[overflow] = -1
+    moved[overflow] = 0
+
+    left = (moved << (4 * np.arange(SIZE))).sum(axis=1)
+
+    # A right slide is a left slide of the mirrored row, mirrored back
+    mirrored = (cells[:, ::-1] << (4 * np.arange(SIZE))).sum(axis=1)
+    right_of_mirrored = (moved[:, ::-1] << (4 * np.arange(SIZE))).sum(axis=1)
+    right = np.empty_like(left)
+    right[mirrored] = right_of_mirrored
+
+    return left.tolist(), right.tolist(), score.tolist()
+
+
+ROW_LEFT, ROW_RIGHT, ROW_SCORE = _build_tables()
+
+
+def encode_exponents(exponents: np.ndarray) -> int:
+    """Packs a 4x4 matrix of tile exponents (below MAX_EXPONENT) into a bitboard"""
+    exponents = np.asarray(exponents).ravel().astype(np.uint64)
+    return int(np.bitwise_or.reduce(exponents << _SHIFTS))
+
+
+def decode_exponents(board: int) -> np.ndarray:
+    """Unpacks a bitboard into a 4x4 matrix of tile exponents"""
+    return ((np.uint64(board) >> _SHIFTS) & np.uint64(0xF)).reshape(SIZE, SIZE)
+
+
+def transpose(board: int) -> int:
+    """Mirrors a bitboard along its main diagonal, so columns become rows"""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def slide(board: int, command: Command) -> (int, int):
+    """Performs a slide action on a bitboard.
+
+    Parameters
+    ----------
+    board: int
+        The packed board.
+    command: Command
+        The direction of the slide action.
+
+    Returns
+    -------
+    tuple
+        The packed board after the slide and the points scored by merges.
+
+    Raises
+    ------
+    OverflowError
+        If two 2^15 tiles merge, their tile doesn't fit into the board.
+    """
+    if command is Command.LEFT or command is Command.UP:
+        table = ROW_LEFT
+    elif command is Command.RIGHT or command is Command.DOWN:
+        table = ROW_RIGHT
+    else:
+        raise Exception("Wrong command input for bitboard.slide()")
+
+    columns = command is Command.UP or command is Command.DOWN
+    if columns:
+        board = transpose(board)
+
+    result = 0
+    score = 0
+    for shift in (0, 16, 32, 48):
+        row = (board >> shift) & ROW_MASK
+        if ROW_SCORE[row] < 0:
+            raise OverflowError("a merged tile of 2^16 doesn't fit into a bitboard")
+        result |= table[row] << shift
+        score += ROW_SCORE[row]
+
+    if columns:
+        result = transpose(result)
+    return result, score
+
+
+def empty_cells(board: int) -> list:
+    """Returns the (row, column) positions of all empty cells of a bitboard"""
+    return [(k // SIZE, k % SIZE) for k in range(SIZE * SIZE)
+            if not (board >> (4 * k)) & 0xF]
+
+
+def empty_count(board: int) -> int:
+    """Returns the number of empty cells of a bitboard, by a popcount of the occupied nibbles"""
+    occupied = board | (board >> 1)
+    occupied |= occupied >> 2
+    return SIZE * SIZE - bin(occupied & 0x1111111111111111).count("1")
+
+
+def max_exponent(board: int) -> int:
+    """Returns the exponent of the largest tile of a bitboard"""
+    return max((board >> (4 * k)) & 0xF for k in range(SIZE * SIZE))
+
+
+def legal_moves(board: int) -> list:
+    """Returns the commands that would change a bitboard"""
+    return [command for command in DIRECTIONS if slide(board, command)[0] != board]
@@ -0,0 +1,50 @@
+"""This file implements the compact board format of the game 2048
+
+A board stores one uint8 exponent per tile: 0 is an empty tile, k is a
+tile of the value 2 ** k. It takes one byte per tile instead of eight for
+a float64 matrix of tile values, and boards can be compared and hashed
+cheaply. GameEnv, the save files, the traces and the network protocol use
+boards; the helpers below convert them for display.
+"""
+
+import numpy as np
+
+DTYPE = np.uint8
+
+
+def to_exponents(field: np.ndarray) -> np.ndarray:
+    """Converts a gamefield of tile values into a board of tile exponents.
+
+    Parameters
+    ----------
+    field : np.ndarray
+        A matrix of tiles, that are empty (0) or a power of two from 2 on.
+
+    Returns
+    -------
+    np.ndarray
+        The board, 0 for an empty tile.
+
+    Raises
+    ------
+    ValueError
+        If a tile isn't empty or a power of two.
+    """
+    values = np.asarray(field, dtype=np.float64)
+    mantissa, exponent = np.frexp(values)
+    valid = (values == 0) | ((mantissa == 0.5) & (exponent >= 2))
+    if not valid.all():
+        position = tuple(int(i) for i in np.argwhere(~valid)[0])
+        raise ValueError(f"the tile {values[position]} at {position} is not a power of two")
+    return np.where(values == 0, 0, exponent - 1).astype(DTYPE)
+
+
+def to_values(board: np.ndarray) -> np.ndarray:
+    """Converts a board into an int64 matrix of tile values (0 stays empty)"""
+    exponents = np.asarray(board, dtype=np.int64)
+    return np.where(exponents > 0, np.left_shift(1, exponents), 0)
+
+
+def tile_value(exponent: int) -> int:
+    """Returns the value of a single tile of a board"""
+    return 1 << int(exponent) if exponent else 0
@@ -0,0 +1,61 @@
+"""This file implements an automatic player as input source"""
+
+import numpy as np
+from .interface_controller import InterfaceController
+from ..event_manager import EventManager, InputRequest, Event
+from ..arguments import Screen
+from ..model import Model
+from ..search import Expectimax
+
+
+class ControllerAI(InterfaceController):
+    """This class implements an expectimax search as input source to play 2048."""
+    EVENTS = InterfaceController.EVENTS + (InputRequest,)
+
+    def __init__(self, ev_manager: EventManager, game: Model, time_budget=0.01):
+        """
+        Constructor of the class ControllerAI.
+
+        Parameters:
+        ----------
+        _ev_manager: EventManager
+            controls communication with other modules
+        game: Model
+            Reference to the model instance
+        time_budget: float
+            Seconds the search may take for one move. The search runs on the
+            view thread, so this should stay below one frame (1/60 s).
+        """
+        super().__init__(ev_manager)
+
+        self._game = game
+        self._searcher = Expectimax(time_budget=time_budget)
+        self._last_field = None
+
+    def notify(self, event: Event):
+        """Handles incoming events
+
+        Parameters
+        ----------
+        event: EventManager
+            Specifies incoming event
+        """
+        super().notify(event)
+
+        if isinstance(event, InputRequest):
+            self._next_move()
+
+    def _next_move(self) -> None:
+        """Searches the next slide action and triggers the event"""
+        if self._game_state != Screen.GAME:
+            return
+
+        field = self._game.get_board()[0]
+        # Wait until the model has performed the last move
+        if self._last_field is not None and np.array_equal(field, self._last_field):
+            return
+
+        command = self._searcher.choose(field)
+        if command is not None:
+            self._last_field = np.copy(field)
+            self._play_the_game(command)
@@ -1,12 +1,41 @@
+import asyncio
 import socket
+import time
 from threading import Thread
 import ipaddress
+import numpy as np
+from .protocol import (PORT, ACK, WATCH, LineDecoder, encode_command, parse_ack, apply_update,
+                       set_no_delay)
+from ..board import tile_value
+
+PROMPT = "Please choose command (w, a, s, d, pause, start, exit, restart, quit client): "
 
 
 class ControllerClient:
-    """This class implements the client part that sends commands to the server."""
+    """This class implements the client part that sends commands to the server.
+
+    The client keeps one connection to the server and sends every command
+    as soon as it is entered, without waiting for the answers of the
+    commands before (see protocol.py). Several commands can be entered in
+    one line, e.g. "w a w d".
 
-    def __init__(self, hostname):
+    Attributes
+    ----------
+    _hostname: str
+        ip adress of the server
+    _sequence: int
+        the sequence number of the last sent command
+    _sent: dict
+        sequence number -> perf_counter() time, for commands without answer
+    latencies: list
+        the round trip times of the answered commands in seconds
+    field: np.ndarray
+        the board of tile exponents of the watched game (see watch())
+    score: int
+        the score of the watched game
+    """
+
+    def __init__(self, hostname, use_asyncio=False, interactive=True, watch=False):
         """
         Constructor of the class ControllerClient.
 
@@ -14,6 +43,13 @@ class ControllerClient:
         ----------
         hostname: str
             ip adress of the server
+        use_asyncio: bool
+            run the client as asyncio task instead of a thread
+        interactive: bool
+            ask for commands in the shell; otherwise commands are sent with
+            connect(), send() and close() (e.g. by a BCI decoder)
+        watch: bool
+            only print the board of the game on every change, until the server closes
         """
         # Validate the IP address
         if self._validate_ip_address(ip_string=hostname):
@@ -24,23 +60,163 @@ class ControllerClient:
             ip_address = socket.gethostbyname(hostname)
             self._hostname = ip_address
 
-        t1 = Thread(target=self._send_messages, daemon=False)
-        t1.start()
+        self._sequence = 0
+        self._sent = {}
+        self.latencies = []
+        self._socket = None
+        self._receiver = None
+        self.field = None
+        self.score = 0
+        self._on_update = None
+
+        if watch:
+            self._on_update = self._print_board
+            self.connect()
+            self.send(WATCH)
+            self._receiver.join()
+            return
+        if not interactive:
+            return
+        if use_asyncio:
+            asyncio.run(self._send_messages_async())
+        else:
+            t1 = Thread(target=self._send_messages, daemon=False)
+            t1.start()
+
+    def connect(self, port=PORT) -> None:
+        """Opens the connection to the server and starts receiving its answers"""
+        self._socket = socket.create_connection((self._hostname, port))
+        set_no_delay(self._socket)
+        self._receiver = Thread(target=self._receive_acks, daemon=True)
+        self._receiver.start()
+
+    def send(self, *commands: str) -> int:
+        """Sends commands in one packet, without waiting for their answers.
+
+        Parameters
+        ----------
+        commands: str
+            e.g. "w", "left", "pause"
+
+        Returns
+        -------
+        int
+            The sequence number of the last command.
+        """
+        self._socket.sendall(self._encode(commands))
+        return self._sequence
+
+    def close(self) -> None:
+        """Waits for the answers of all sent commands and closes the connection"""
+        # The server answers the rest and closes its side after our end of stream
+        self._socket.shutdown(socket.SHUT_WR)
+        self._receiver.join()
+        self._socket.close()
+
+    def latency_stats(self) -> dict:
+        """Returns the number of answered commands and the percentiles of their round trip in ms"""
+        if not self.latencies:
+            return {"acked": 0}
+        p50, p95, p99 = np.percentile(self.latencies, (50, 95, 99)) * 1000
+        return {"acked": len(self.latencies), "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+    def _encode(self, commands) -> bytes:
+        """Numbers the commands and returns their lines"""
+        lines = b""
+        now = time.perf_counter()
+        for command in commands:
+            self._sequence += 1
+            self._sent[self._sequence] = now
+            lines += encode_command(self._sequence, command)
+        return lines
+
+    def watch(self, on_update=None) -> None:
+        """Subscribes to the board of the game. The connection has to be open.
+
+        Parameters
+        ----------
+        on_update
+            called without arguments after every change of field and score
+        """
+        self._on_update = on_update
+        self.send(WATCH)
+
+    def _print_board(self) -> None:
+        """Prints the watched board"""
+        print(f"Score: {self.score}")
+        for row in self.field:
+            print(" ".join(f"{tile_value(tile):5d}" if tile else "    ." for tile in row))
+        print()
+
+    def _acknowledge(self, line: str) -> None:
+        """Measures the round trip of an answered command or applies a board update"""
+        if not line.startswith(ACK):
+            self.field, self.score = apply_update(line, self.field)
+            if self._on_update is not None:
+                self._on_update()
+            return
+        sequence, server_time, status = parse_ack(line)
+        sent = self._sent.pop(sequence, None)
+        if sent is not None:
+            self.latencies.append(time.perf_counter() - sent)
+
+    def _receive_acks(self) -> None:
+        """Reads the answers of the server until it closes the connection"""
+        decoder = LineDecoder()
+        while True:
+            try:
+                received_bytes = self._socket.recv(4096)
+            except OSError:
+                return
+            if not received_bytes:
+                return
+            for line in decoder.feed(received_bytes):
+                self._acknowledge(line)
 
     def _send_messages(self) -> None:
         """Sets up the client"""
+        self.connect()
         running = True
         while running:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as client_socket:
-                server_address = (self._hostname, 2048)
-                client_socket.connect(server_address)
+            inp: str = input(PROMPT)
+            if inp.lower() == "quit client":
+                running = False
+                continue
+            commands = inp.replace(",", " ").split()
+            if commands:
+                self.send(*commands)
+        self.close()
+        print("Answered commands:", self.latency_stats())
+
+    async def _send_messages_async(self) -> None:
+        """Sets up the client as asyncio task. The prompt waits in a worker
+        thread, so the loop stays free for receiving the answers."""
+        loop = asyncio.get_running_loop()
+        reader, writer = await asyncio.open_connection(self._hostname, PORT)
+        set_no_delay(writer.get_extra_info("socket"))
 
-                inp: str = input("Please choose command (w, a, s, d, pause, start, exit, restart, quit client): ")
-                if inp.lower() == "quit client":
-                    running = False
+        async def receive_acks() -> None:
+            """Reads the answers of the server until it closes the connection"""
+            while line := await reader.readline():
+                self._acknowledge(str(line, "utf-8").strip())
+
+        receiver = loop.create_task(receive_acks())
+        running = True
+        while running:
+            inp: str = await loop.run_in_executor(None, input, PROMPT)
+            if inp.lower() == "quit client":
+                running = False
+                continue
+            commands = inp.replace(",", " ").split()
+            if commands:
+                writer.write(self._encode(commands))
+                await writer.drain()
 
-                bytes_to_send = bytes(inp, "utf-8")
-                client_socket.sendall(bytes_to_send)
+        writer.write_eof()
+        await receiver
+        writer.close()
+        await writer.wait_closed()
+        print("Answered commands:", self.latency_stats())
 
     def _validate_ip_address(self, ip_string: str) -> bool:
         try:
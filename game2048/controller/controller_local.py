@@ -9,6 +9,8 @@ import pygame
 
 class ControllerLocal(InterfaceController):
     """This class implements the keyboard as input source to play 2048."""
+    EVENTS = InterfaceController.EVENTS + (InputRequest,)
+
     def __init__(self, ev_manager: EventManager, screen: curses.window):
         """
         Constructor of the class ControllerLocal.
@@ -1,19 +1,121 @@
-"""This file implements the remote input decoding"""
+"""This file implements the remote input decoding
 
-import curses
+The server runs in one thread and serves all clients with non-blocking
+sockets and a selector (epoll on Linux). Every connection has its own
+buffer for incomplete received lines and for answers that couldn't be
+sent yet (see protocol.py). Connections that watch the game get the
+messages of a SpectatorBroadcast (see spectator.py).
+"""
+
+import asyncio
 import pathlib
 import os
+import selectors
+from collections import deque
 from ..event_manager import EventManager
 from .interface_controller import InterfaceController
 import socket
-from threading import Thread
+from threading import Thread, Event, Lock
 from ..arguments import *
-from ..event_manager import EventManager
+from .protocol import (PORT, STATUS_OK, STATUS_IGNORED, WATCH, LineDecoder, parse_command,
+                       encode_ack, set_no_delay)
+
+
+def local_ip_address() -> str:
+    """Returns the IP address of this computer in the local network, without
+    asking a name server (which can block for seconds). Connecting a UDP
+    socket only chooses the network interface, it doesn't send anything."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        try:
+            probe.connect(("10.255.255.255", 1))
+            return probe.getsockname()[0]
+        except OSError:
+            return "127.0.0.1"
+
+
+class _Connection:
+    """The buffers of one client connection.
+
+    Attributes
+    ----------
+    sock: socket.socket
+        The non-blocking connection.
+    decoder: LineDecoder
+        Received bytes of an incomplete line.
+    outgoing: bytearray
+        Answers that weren't sent yet.
+    closing: bool
+        The client closed its side, the connection closes after the last answer.
+    subscription: _Subscription
+        The messages for a spectator or None.
+    """
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.decoder = LineDecoder()
+        self.outgoing = bytearray()
+        self.closing = False
+        self.subscription = None
+
+
+class _Subscription:
+    """The messages of a SpectatorBroadcast for a connection of the selector server.
+
+    The broadcast pushes from the event thread, the server thread moves the
+    messages into the outgoing buffer, as soon as it is empty. So messages
+    only pile up here, if the spectator doesn't receive them fast enough.
+    """
+    def __init__(self, wakeup: socket.socket, max_backlog: int):
+        self.messages = deque()
+        self.size = 0
+        self.closed = False
+        self._wakeup = wakeup
+        self._max_backlog = max_backlog
+        self._lock = Lock()
+
+    def push(self, message: bytes) -> bool:
+        """Queues a message, returns False if the spectator is gone or too slow"""
+        with self._lock:
+            if self.closed or self.size + len(message) > self._max_backlog:
+                self.closed = True
+                return False
+            self.messages.append(message)
+            self.size += len(message)
+        try:
+            self._wakeup.send(b"s")
+        except OSError:
+            pass
+        return True
+
+    def take(self) -> bytes:
+        """Returns all queued messages"""
+        with self._lock:
+            messages = b"".join(self.messages)
+            self.messages.clear()
+            self.size = 0
+        return messages
+
+
+class _AsyncSubscription:
+    """The messages of a SpectatorBroadcast for a connection of the asyncio server."""
+    def __init__(self, writer: asyncio.StreamWriter, max_backlog: int):
+        self._writer = writer
+        self._max_backlog = max_backlog
+
+    def push(self, message: bytes) -> bool:
+        """Writes a message, returns False if the spectator is gone or too slow"""
+        if self._writer.is_closing():
+            return False
+        if self._writer.transport.get_write_buffer_size() + len(message) > self._max_backlog:
+            self._writer.close()
+            return False
+        self._writer.write(message)
+        return True
 
 
 class ControllerRemote(InterfaceController):
     """This class implements signals from a client computer as input source to play 2048."""
-    def __init__(self, ev_manager: EventManager):
+    def __init__(self, ev_manager: EventManager, hostname="", port=PORT, write_config=True,
+                 spectators=None, max_backlog=64 * 1024, input_stage=None):
         """
         Constructor of the class ControllerRemote.
 
@@ -21,12 +123,47 @@ class ControllerRemote(InterfaceController):
         ----------
         _ev_manager: EventManager
             controls communication with other modules
-        _screen: curses.window
-            the shell screen or None for GUI view
+        hostname: str
+            the address the server listens on (default: all network interfaces)
+        port: int
+            the server port, 0 chooses a free port (see address)
+        write_config: bool
+            write the IP address and the port into a text file for the client
+        spectators: SpectatorBroadcast
+            the broadcast that clients can subscribe to with "watch" (default: none)
+        max_backlog: int
+            bytes a spectator may lag behind, before it is dropped
+        input_stage: InputStage
+            filters the bursts of commands of a BCI decoder (default: none)
         """
-        super().__init__(ev_manager)
-        t2 = Thread(target=self._set_up_server, daemon=True)
-        t2.start()
+        super().__init__(ev_manager, input_stage)
+        self._hostname = hostname
+        self._port = port
+        self._write_config = write_config
+        self._spectators = spectators
+        self._max_backlog = max_backlog
+        self._serving = True
+        self._ready = Event()
+        # Wakes the selector up to stop the server or to send spectator messages
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()
+        self._wakeup_sender.setblocking(False)
+        self.address = None
+
+        if ev_manager.uses_asyncio:
+            ev_manager.add_task(self._serve_async)
+        else:
+            t2 = Thread(target=self._set_up_server, daemon=True)
+            t2.start()
+
+    def wait_until_ready(self, timeout=None) -> tuple:
+        """Waits until the server listens and returns its address (host, port)"""
+        self._ready.wait(timeout)
+        return self.address
+
+    def stop(self) -> None:
+        """Stops the server and closes all connections"""
+        self._serving = False
+        self._wakeup_sender.send(b"x")
 
     @staticmethod
     def input_parser(inp: str) -> Command:
@@ -51,35 +188,208 @@ class ControllerRemote(InterfaceController):
         else:
             return Command.EMPTY
 
-    def _set_up_server(self, port=2048, hostname="", buffer_size=1024) -> None:
-        """Set up a server to connect to a client.
+    def _set_up_server(self, buffer_size=4096) -> None:
+        """Set up a server, that serves all clients in this thread.
 
         Parameters
         ----------
-        port: int
-            The own server port. The client has to connect to the same port.
-        hostname: str
-            Specify the hostname.
         buffer_size: int
             Specify the number of bytes the server should receive in one receive-action
         """
-        self._create_ip_config_file(port=port)
-        hostname = socket.gethostname()
-        ip_address = socket.gethostbyname(hostname)
-
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket:
-            bind_address = (ip_address, port)
-            server_socket.bind(bind_address)
-            while True:
-                server_socket.listen()
+        connections = {}
+        with selectors.DefaultSelector() as selector, \
+                socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket:
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server_socket.bind((self._hostname, self._port))
+            server_socket.listen(128)
+            server_socket.setblocking(False)
+            selector.register(server_socket, selectors.EVENT_READ)
+            selector.register(self._wakeup_receiver, selectors.EVENT_READ)
+            self.address = server_socket.getsockname()
+            self._ready.set()
+            if self._write_config:
+                self._create_ip_config_file(port=self.address[1])
+
+            while self._serving:
+                for key, mask in selector.select():
+                    if key.fileobj is server_socket:
+                        self._accept(selector, server_socket, connections)
+                    elif key.fileobj is self._wakeup_receiver:
+                        self._wakeup_receiver.recv(4096)
+                        for connection in list(connections.values()):
+                            if connection.subscription is not None and not connection.closing:
+                                self._serve_client(selector, connection, 0, buffer_size, connections)
+                    else:
+                        self._serve_client(selector, key.data, mask, buffer_size, connections)
+
+            for connection in list(connections.values()):
+                self._close(selector, connection, connections)
+            self._wakeup_receiver.close()
+            self._wakeup_sender.close()
+
+    def _accept(self, selector: selectors.BaseSelector, server_socket: socket.socket,
+                connections: dict) -> None:
+        """Accepts all waiting clients"""
+        while True:
+            try:
                 (conn, address) = server_socket.accept()
-                received_bytes = conn.recv(buffer_size)
-                inp: str = str(received_bytes, "utf-8")
-                received_command: Command = self.input_parser(inp)
-                if received_command == Command.EMPTY:
-                    continue
+            except (BlockingIOError, InterruptedError):
+                return
+            conn.setblocking(False)
+            set_no_delay(conn)
+            connection = _Connection(conn)
+            connections[conn] = connection
+            selector.register(conn, selectors.EVENT_READ, connection)
+
+    def _serve_client(self, selector: selectors.BaseSelector, connection: _Connection,
+                      mask: int, buffer_size: int, connections: dict) -> None:
+        """Reads the commands of a client, plays them and sends the answers, as
+        far as possible without waiting.
+
+        Parameters
+        ----------
+        selector: selectors.BaseSelector
+            The selector, that watches the connection.
+        connection: _Connection
+            The buffers of the client.
+        mask: int
+            Whether the connection is readable and/or writable.
+        buffer_size: int
+            Specify the number of bytes the server should receive in one receive-action
+        connections: dict
+            All open connections.
+        """
+        if mask & selectors.EVENT_READ and not connection.closing:
+            try:
+                received_bytes = connection.sock.recv(buffer_size)
+            except (BlockingIOError, InterruptedError):
+                received_bytes = None
+            except OSError:
+                self._close(selector, connection, connections)
+                return
+            if received_bytes is not None:
+                if received_bytes:
+                    lines = connection.decoder.feed(received_bytes)
                 else:
-                    self._play_the_game(received_command)
+                    lines = connection.decoder.close()
+                    connection.closing = True
+                for line in lines:
+                    connection.outgoing += self._handle_line(line, connection)
+
+        subscription = connection.subscription
+        if subscription is not None:
+            if subscription.closed:
+                # too slow for the broadcast
+                self._close(selector, connection, connections)
+                return
+            if not connection.outgoing:
+                connection.outgoing += subscription.take()
+
+        if connection.outgoing:
+            try:
+                sent = connection.sock.send(connection.outgoing)
+                del connection.outgoing[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._close(selector, connection, connections)
+                return
+
+        if connection.closing and not connection.outgoing:
+            self._close(selector, connection, connections)
+            return
+        if subscription is not None and not connection.outgoing:
+            # messages that came in, while the last ones were sent
+            connection.outgoing += subscription.take()
+        events = 0 if connection.closing else selectors.EVENT_READ
+        if connection.outgoing:
+            events |= selectors.EVENT_WRITE
+        selector.modify(connection.sock, events, connection)
+
+    @staticmethod
+    def _close(selector: selectors.BaseSelector, connection: _Connection, connections: dict) -> None:
+        """Closes a client connection"""
+        try:
+            selector.unregister(connection.sock)
+        except (KeyError, ValueError):
+            pass
+        connections.pop(connection.sock, None)
+        connection.sock.close()
+        connection.closing = True
+        if connection.subscription is not None:
+            connection.subscription.closed = True
+
+    def _handle_line(self, line: str, connection=None) -> bytes:
+        """Plays the command of a received line.
+
+        Parameters
+        ----------
+        line: str
+            One line of the protocol.
+        connection
+            The _Connection or the asyncio.StreamWriter of the client, for "watch".
+
+        Returns
+        -------
+        bytes
+            The answer to the client.
+        """
+        sequence, text = parse_command(line)
+        if text.lower() == WATCH:
+            return encode_ack(sequence, self._subscribe(connection))
+        received_command: Command = self.input_parser(text)
+        if received_command == Command.EMPTY:
+            return encode_ack(sequence, STATUS_IGNORED)
+        self._play_the_game(received_command)
+        return encode_ack(sequence, STATUS_OK)
+
+    def _subscribe(self, connection) -> str:
+        """Subscribes a connection to the spectator broadcast and returns the status of the answer"""
+        if self._spectators is None or connection is None:
+            return STATUS_IGNORED
+        if isinstance(connection, _Connection):
+            if connection.subscription is None:
+                connection.subscription = _Subscription(self._wakeup_sender, self._max_backlog)
+                self._spectators.subscribe(connection.subscription)
+        else:
+            self._spectators.subscribe(_AsyncSubscription(connection, self._max_backlog))
+        return STATUS_OK
+
+    async def _serve_async(self, buffer_size=4096) -> None:
+        """Runs the server as task of the asyncio loop of the EventManager.
+        Every client connection is handled by its own task.
+
+        Parameters
+        ----------
+        buffer_size: int
+            Specify the number of bytes the server should receive in one receive-action
+        """
+        async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            """Plays the commands of one client until it closes the connection"""
+            set_no_delay(writer.get_extra_info("socket"))
+            decoder = LineDecoder()
+            try:
+                while True:
+                    received_bytes = await reader.read(buffer_size)
+                    lines = decoder.feed(received_bytes) if received_bytes else decoder.close()
+                    for line in lines:
+                        writer.write(self._handle_line(line, writer))
+                    await writer.drain()
+                    if not received_bytes:
+                        break
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle_client, self._hostname or "0.0.0.0", self._port,
+                                            reuse_address=True)
+        self.address = server.sockets[0].getsockname()
+        self._ready.set()
+        if self._write_config:
+            self._create_ip_config_file(port=self.address[1])
+        async with server:
+            await server.serve_forever()
 
     def _create_ip_config_file(self, port: int) -> pathlib.Path:
         """Creates a text file in the root folder of this project with the server IP & port.
@@ -95,8 +405,7 @@ class ControllerRemote(InterfaceController):
             The file path of the created config file.
         """
         file_name = "Config - Server IP & Port.txt"
-        hostname = socket.gethostname()
-        ip_address = socket.gethostbyname(hostname)
+        ip_address = local_ip_address()
         file_content = f"Server Information:\n\nIP-Address : {ip_address}\nPort : {port}"
         current_path = pathlib.Path(__file__).parent.resolve()
         root_path = current_path.parent.parent
@@ -0,0 +1,196 @@
+"""This file implements the filtering of noisy input commands
+
+A BCI decoder often sends bursts of slide commands for one intended move.
+InputStage sits between the input source and the EventManager and passes
+on fewer slide commands:
+
+    none      every command is passed on
+    debounce  a repeated command is dropped until the source was quiet for
+              one window
+    coalesce  the last command of a window is passed on
+    vote      the most frequent command of a window is passed on (the
+              latest of equally frequent ones)
+
+In addition, slide commands above a maximum rate are dropped. All other
+commands (pause, start, ...) are passed on at once. A window ends with the
+next command or the next InputRequest after its end.
+"""
+
+import time
+from collections import Counter
+from threading import Lock
+from ..arguments import DIRECTIONS
+
+MODES = ("none", "debounce", "coalesce", "vote")
+
+
+class InputStage:
+    """This class implements the windowing and rate limiting of slide commands.
+
+    Attributes
+    ----------
+    _mode : str
+        One of MODES.
+    _window : float
+        The length of a window in seconds.
+    _min_interval : float
+        The minimum time between two passed slide commands in seconds.
+    _pending : list
+        The slide commands of the current window with their arrival times.
+    _counters : dict
+        The number of received, passed and dropped slide commands.
+    _latency : dict
+        Stage -> [count, total seconds, maximum seconds]. 'window' is the
+        time from the arrival of a command until it is passed on, 'post' the
+        time to translate and post it.
+    """
+
+    def __init__(self, mode="none", window=0.05, max_rate=None, clock=time.perf_counter):
+        """
+        Constructor of class InputStage.
+
+        Parameters
+        ----------
+        mode : str
+            One of MODES.
+        window : float
+            The length of a window in seconds.
+        max_rate : float
+            The maximum number of slide commands per second (default: no limit).
+        clock
+            Returns the current time in seconds.
+        """
+        if mode not in MODES:
+            raise ValueError(f"unknown input mode {mode!r}, choose one of {', '.join(MODES)}")
+        self._mode = mode
+        self._window = window
+        self._min_interval = 1.0 / max_rate if max_rate else 0.0
+        self._clock = clock
+        self._lock = Lock()
+
+        self._pending = []
+        self._window_end = None
+        self._last_command = None
+        self._last_arrival = float("-inf")
+        self._last_passed = float("-inf")
+        self._counters = {"received": 0, "passed": 0, "debounced": 0, "merged": 0, "rate_limited": 0}
+        self._latency = {"window": [0, 0.0, 0.0], "post": [0, 0.0, 0.0]}
+
+
+    @property
+    def windowed(self) -> bool:
+        """True, if commands wait for the end of a window"""
+        return self._mode in ("coalesce", "vote")
+
+
+    def submit(self, command, now=None) -> list:
+        """
+        Receives a command.
+
+        Parameters
+        ----------
+        command : Command
+            The received command or None.
+        now : float
+            The arrival time (default: the clock).
+
+        Returns
+        -------
+        list
+            (command, arrival time) of the commands that are passed on now.
+        """
+        now = self._clock() if now is None else now
+        with self._lock:
+            passed = self._close_window(now)
+            if command is None:
+                return passed
+            if command not in DIRECTIONS:
+                return passed + [(command, now)]
+
+            self._counters["received"] += 1
+            if self._mode == "debounce":
+                bouncing = command == self._last_command and now - self._last_arrival < self._window
+                self._last_command, self._last_arrival = command, now
+                if bouncing:
+                    self._counters["debounced"] += 1
+                else:
+                    passed += self._limit(command, now, now)
+            elif self.windowed:
+                if not self._pending:
+                    self._window_end = now + self._window
+                self._pending.append((command, now))
+            else:
+                passed += self._limit(command, now, now)
+            return passed
+
+
+    def poll(self, now=None) -> list:
+        """
+        Passes on the command of a window that has ended.
+
+        Returns
+        -------
+        list
+            (command, arrival time) of the commands that are passed on now.
+        """
+        now = self._clock() if now is None else now
+        with self._lock:
+            return self._close_window(now)
+
+
+    def record_post(self, seconds: float) -> None:
+        """Counts the time to translate and post a passed command"""
+        with self._lock:
+            self._record("post", seconds)
+
+
+    def stats(self) -> dict:
+        """
+        Returns the counters and the latencies.
+
+        Returns
+        -------
+        dict
+            The counters and for every stage {'count', 'mean', 'max'} in seconds.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            for stage, (count, total, maximum) in self._latency.items():
+                stats[stage] = {"count": count, "mean": total / count if count else 0.0, "max": maximum}
+            return stats
+
+
+    def _close_window(self, now: float) -> list:
+        """Chooses the command of an ended window"""
+        if not self._pending or now < self._window_end:
+            return []
+        commands = [command for command, _ in self._pending]
+        if self._mode == "coalesce":
+            chosen = commands[-1]
+        else:
+            votes = Counter(commands)
+            most = max(votes.values())
+            chosen = next(command for command in reversed(commands) if votes[command] == most)
+        first_arrival = self._pending[0][1]
+        self._counters["merged"] += len(commands) - 1
+        self._pending = []
+        return self._limit(chosen, first_arrival, now)
+
+
+    def _limit(self, command, arrival: float, now: float) -> list:
+        """Drops a command above the maximum rate"""
+        if now - self._last_passed < self._min_interval:
+            self._counters["rate_limited"] += 1
+            return []
+        self._last_passed = now
+        self._counters["passed"] += 1
+        self._record("window", now - arrival)
+        return [(command, arrival)]
+
+
+    def _record(self, stage: str, seconds: float) -> None:
+        """Adds a latency to a stage"""
+        latency = self._latency[stage]
+        latency[0] += 1
+        latency[1] += seconds
+        latency[2] = max(latency[2], seconds)
@@ -1,5 +1,6 @@
 """This file implements the abstract controller class"""
 
+import time
 from abc import ABC, abstractmethod
 import pygame
 import curses
@@ -7,26 +8,40 @@ from ..event_manager import (EventManager, InputRequest, StateEvent,
                              SlideEvent, QuitEvent, Event)
 from ..arguments import (Screen, Command)
 from ..database import Database
+from .input_stage import InputStage
 
 db = Database()
 
 
 class InterfaceController(ABC):
-    """Interface for the Controller module of the 2048 game."""
+    """Interface for the Controller module of the 2048 game.
+
+    Attributes
+    ----------
+    EVENTS: tuple
+        the Event classes the controller is notified of
+    """
+    EVENTS = (StateEvent,)
+
     @abstractmethod
-    def __init__(self, ev_manager: EventManager):
+    def __init__(self, ev_manager: EventManager, input_stage=None):
         """Constructor of the class ControllerLocal.
 
         Parameters:
         ----------
         _ev_manager: EventManager
             controls communication with other modules
-        _screen: curses.window
-            the shell screen or None for GUI view
+        input_stage: InputStage
+            filters the commands before they are played (default: none)
         """
         self._game_state = Screen.INSTRUCTIONS
         self._ev_manager = ev_manager
-        ev_manager.register_observer(self)
+        self._input_stage = InputStage() if input_stage is None else input_stage
+        events = self.EVENTS
+        if self._input_stage.windowed and InputRequest not in events:
+            # windows end between two commands, so check them every frame
+            events = events + (InputRequest,)
+        ev_manager.register_observer(self, events)
 
     def notify(self, event: Event):
         """Handles incoming events
@@ -38,6 +53,9 @@ class InterfaceController(ABC):
         """
         if isinstance(event, StateEvent):
             self._game_state = event.data
+        if isinstance(event, InputRequest) and self._input_stage.windowed:
+            for command, _ in self._input_stage.poll():
+                self._post_command(command)
 
     def translate_command(self, command: Command) -> Event:
         """Verify input with the current game state and return matching event
@@ -61,7 +79,9 @@ class InterfaceController(ABC):
                 return StateEvent(Screen.PAUSE)
         else:
             if command == Command.EXIT:
-                db.log(content="End the game", final_log=True)
+                db.log(content="interface_controller.py -> input stage: " + str(self._input_stage.stats()))
+                # The view finalizes the logs, after its frame statistics (see InterfaceView._report_timing)
+                db.log(content="End the game")
                 return QuitEvent()
             if command == Command.START:
                 if self._game_state in [Screen.WIN, Screen.LOSE]:
@@ -71,7 +91,14 @@ class InterfaceController(ABC):
                 return SlideEvent(command)
 
     def _play_the_game(self, command: Command):
-        """Execute a command if possible in the current game state"""
+        """Execute a command if possible in the current game state, after the input stage"""
+        for command, _ in self._input_stage.submit(command):
+            self._post_command(command)
+
+    def _post_command(self, command: Command):
+        """Execute a command that passed the input stage"""
+        start = time.perf_counter()
         event = self.translate_command(command)
         if event is not None:
             self._ev_manager.post(event)
+        self._input_stage.record_post(time.perf_counter() - start)
@@ -0,0 +1,83 @@
+"""This file implements a load test of ControllerRemote on this computer
+
+Many clients connect at the same time to a server on the loopback
+interface and send their commands pipelined in small batches. The test
+checks that every command is answered and passed to the EventManager, and
+reports the throughput and the round trip times.
+"""
+
+import time
+from threading import Thread, Barrier
+import numpy as np
+from ..event_manager import EventManager
+from ..arguments import Screen
+from .controller_remote import ControllerRemote
+from .controller_client import ControllerClient
+
+COMMANDS = ("w", "a", "s", "d")
+
+
+def load_test(clients=50, commands=1000, batch=10) -> dict:
+    """Runs a server on a free loopback port and lets clients send commands.
+
+    Parameters
+    ----------
+    clients : int
+        The number of simultaneous connections.
+    commands : int
+        The number of commands every client sends.
+    batch : int
+        The number of commands a client sends in one packet.
+
+    Returns
+    -------
+    dict
+        'clients', 'commands' (sent in total), 'acked', 'events' (passed to
+        the EventManager), 'time' (seconds), 'rate' (commands per second)
+        and 'p50'/'p95'/'p99' of the round trip in ms.
+    """
+    ev_manager = EventManager()
+    remote = ControllerRemote(ev_manager, hostname="127.0.0.1", port=0, write_config=False)
+    # Slide commands are only passed to the game during a game
+    remote._game_state = Screen.GAME
+    _, port = remote.wait_until_ready(timeout=5)
+
+    barrier = Barrier(clients + 1)
+    senders = [ControllerClient("127.0.0.1", interactive=False) for _ in range(clients)]
+
+    def send_all(client: ControllerClient) -> None:
+        """Sends the commands of one client and waits for the answers"""
+        client.connect(port)
+        barrier.wait()
+        for start in range(0, commands, batch):
+            client.send(*(COMMANDS[i % len(COMMANDS)] for i in range(start, min(start + batch, commands))))
+        client.close()
+
+    threads = [Thread(target=send_all, args=(client,)) for client in senders]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - start
+    remote.stop()
+
+    latencies = np.concatenate([client.latencies for client in senders]) * 1000
+    p50, p95, p99 = np.percentile(latencies, (50, 95, 99)) if len(latencies) else (0.0, 0.0, 0.0)
+    return {"clients": clients,
+            "commands": clients * commands,
+            "acked": len(latencies),
+            "events": ev_manager.queue_size(),
+            "time": wall_time,
+            "rate": clients * commands / wall_time,
+            "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+
+def run(clients=50, commands=1000) -> None:
+    """Runs the load test and prints the results."""
+    result = load_test(clients, commands)
+    print(f"{result['clients']} clients sent {result['commands']} commands in {result['time']:.2f} s "
+          f"({result['rate']:.0f} commands/s)")
+    print(f"answered: {result['acked']}, passed to the game: {result['events']}")
+    print(f"round trip: p50 {result['p50']:.2f} ms, p95 {result['p95']:.2f} ms, p99 {result['p99']:.2f} ms")
@@ -0,0 +1,188 @@
+"""This file implements the protocol between ControllerClient and ControllerRemote
+
+A client keeps one TCP connection open and sends one line per command:
+
+    <sequence number> <command>\n         e.g. "17 left\n"
+
+The sequence number may be left out ("left\n"), then it counts as 0. A
+client doesn't wait for the answer of a command before it sends the next
+one. The server answers every line in the same order with
+
+    ACK <sequence number> <server time in ns> <status>\n
+
+where the status is "ok", if the command was passed to the game, or
+"ignored", if the command is unknown.
+
+The command "watch" subscribes the connection to the game. The server
+then sends the whole board once and afterwards only the changed tiles,
+every tile as its exponent (0 = empty, k = 2^k, see board.py):
+
+    BOARD <height> <width> <score> <tile> <tile> ...\n   (row by row)
+    DELTA <score> <row> <column> <tile> <row> <column> <tile> ...\n
+"""
+
+import socket
+import time
+import numpy as np
+from ..board import DTYPE
+
+PORT = 2048
+ENCODING = "utf-8"
+ACK = "ACK"
+BOARD = "BOARD"
+DELTA = "DELTA"
+WATCH = "watch"
+STATUS_OK = "ok"
+STATUS_IGNORED = "ignored"
+
+
+class LineDecoder:
+    """This class implements the splitting of a byte stream into lines.
+
+    Attributes
+    ----------
+    _buffer : bytearray
+        The received bytes after the last complete line.
+    _max_line : int
+        The maximum length of a line. Longer lines are dropped.
+    """
+
+    def __init__(self, max_line=1024):
+        """
+        Constructor of class LineDecoder.
+
+        Parameters
+        ----------
+        max_line : int
+            The maximum length of a line in bytes.
+        """
+        self._buffer = bytearray()
+        self._max_line = max_line
+
+
+    def feed(self, data: bytes) -> list:
+        """
+        Adds received bytes.
+
+        Parameters
+        ----------
+        data : bytes
+            The received bytes.
+
+        Returns
+        -------
+        list
+            The lines that are complete now, without the newline.
+        """
+        self._buffer += data
+        *lines, rest = self._buffer.split(b"\n")
+        self._buffer = bytearray(rest) if len(rest) <= self._max_line else bytearray()
+        return [str(line, ENCODING, "replace").strip() for line in lines if len(line) <= self._max_line]
+
+
+    def close(self) -> list:
+        """Returns the last line of a stream, that didn't end with a newline."""
+        rest, self._buffer = self._buffer, bytearray()
+        line = str(rest, ENCODING, "replace").strip()
+        return [line] if line else []
+
+
+def encode_command(sequence: int, command: str) -> bytes:
+    """Returns the line of a command"""
+    return f"{sequence} {command}\n".encode(ENCODING)
+
+
+def parse_command(line: str) -> (int, str):
+    """
+    Splits the line of a command.
+
+    Returns
+    -------
+    tuple
+        The sequence number (0 if there is none) and the command.
+    """
+    number, _, command = line.partition(" ")
+    if number.isdigit() and command:
+        return int(number), command.strip()
+    return 0, line
+
+
+def encode_ack(sequence: int, status: str, server_time=None) -> bytes:
+    """Returns the answer to a command, stamped with the current server time"""
+    if server_time is None:
+        server_time = time.time_ns()
+    return f"{ACK} {sequence} {server_time} {status}\n".encode(ENCODING)
+
+
+def parse_ack(line: str) -> (int, int, str):
+    """
+    Splits an answer of the server.
+
+    Returns
+    -------
+    tuple
+        The sequence number, the server time in ns and the status.
+    """
+    ack, sequence, server_time, status = line.split(" ")
+    if ack != ACK:
+        raise ValueError(f"not an answer of the server: {line!r}")
+    return int(sequence), int(server_time), status
+
+
+def encode_board(field: np.ndarray, score: int) -> bytes:
+    """Returns the line of a whole board of tile exponents"""
+    height, width = np.shape(field)
+    tiles = " ".join(str(int(tile)) for tile in np.ravel(field))
+    return f"{BOARD} {height} {width} {int(score)} {tiles}\n".encode(ENCODING)
+
+
+def encode_delta(field: np.ndarray, cells, score: int) -> bytes:
+    """Returns the line of the changed tiles of a board
+
+    Parameters
+    ----------
+    field : np.ndarray
+        The new board of tile exponents.
+    cells
+        The positions (row, column) of the changed tiles.
+    score : int
+        The new score.
+    """
+    tiles = "".join(f" {row} {column} {int(field[row, column])}" for row, column in cells)
+    return f"{DELTA} {int(score)}{tiles}\n".encode(ENCODING)
+
+
+def apply_update(line: str, field: np.ndarray) -> (np.ndarray, int):
+    """
+    Applies a BOARD or DELTA line to the board of a spectator.
+
+    Parameters
+    ----------
+    line : str
+        The received line.
+    field : np.ndarray
+        The board before (None before the first BOARD line).
+
+    Returns
+    -------
+    tuple
+        The new board of uint8 tile exponents and the score.
+    """
+    kind, *numbers = line.split(" ")
+    numbers = [int(number) for number in numbers]
+    if kind == BOARD:
+        height, width, score = numbers[:3]
+        return np.array(numbers[3:], dtype=DTYPE).reshape(height, width), score
+    if kind == DELTA:
+        if field is None:
+            raise ValueError("DELTA before BOARD")
+        field = np.array(field)
+        for row, column, tile in zip(numbers[1::3], numbers[2::3], numbers[3::3]):
+            field[row, column] = tile
+        return field, numbers[0]
+    raise ValueError(f"not a board update: {line!r}")
+
+
+def set_no_delay(connection: socket.socket) -> None:
+    """Sends small packets at once instead of collecting them (Nagle's algorithm)"""
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
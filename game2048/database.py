@@ -5,7 +5,314 @@ import os
 import datetime as dt
 import numpy as np
 import json
+import threading
+import time
+from queue import Queue, Empty
 from .arguments import Logging
+from .board import DTYPE, to_exponents, to_values
+from .trace import TraceWriter
+
+# Size limit of a log file
+LOG_SIZE_LIMIT = (1024 ** 2) * 10  # <- Change the 10 to adjust the MB size
+# Largest tile of a loaded save file is 2 ** MAX_EXPONENT (131072 fits on a 4x4 board)
+MAX_EXPONENT = 17
+
+
+def write_atomic(path, content) -> None:
+    """
+    Replaces a file, so that it has either its old or its new content after a crash.
+
+    The content is written to a temporary file next to it, which is flushed
+    to the disk and then renamed (os.replace is atomic).
+
+    Parameters
+    ----------
+    path
+        The path of the file.
+    content
+        The new content as str or bytes.
+    """
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb" if isinstance(content, bytes) else "w") as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def sanitize_gamefield(gamefield, max_exponent=MAX_EXPONENT) -> (np.ndarray, int):
+    """
+    Checks the tiles of a loaded gamefield in one vectorized pass.
+
+    A tile has to be 0 or a power of two from 2 up to 2 ** max_exponent.
+    Other tiles (1, 3, 2.5, -4, nan, too large, ...) are replaced with 0.
+
+    Parameters
+    ----------
+    gamefield
+        A matrix of numbers (nested lists or a numpy array) of any shape.
+    max_exponent : int
+        The exponent of the largest permitted tile.
+
+    Returns
+    -------
+    tuple
+        The gamefield as np.int64 matrix and the number of replaced tiles.
+
+    Raises
+    ------
+    ValueError
+        If the gamefield isn't a non-empty rectangular matrix of numbers.
+    """
+    values = _as_matrix(gamefield)
+    # x = mantissa * 2 ** exponent with 0.5 <= |mantissa| < 1, so 2 ** k has mantissa 0.5 and exponent k + 1
+    mantissa, exponent = np.frexp(values)
+    valid = (values == 0) | ((mantissa == 0.5) & (exponent >= 2) & (exponent <= max_exponent + 1))
+    return np.where(valid, values, 0).astype(np.int64), int(values.size - np.count_nonzero(valid))
+
+
+def sanitize_board(board, max_exponent=MAX_EXPONENT) -> (np.ndarray, int):
+    """
+    Checks the tile exponents of a loaded board (see board.py) in one vectorized pass.
+
+    An exponent has to be an integer from 0 (empty) up to max_exponent,
+    other exponents are replaced with 0.
+
+    Returns
+    -------
+    tuple
+        The board as uint8 matrix and the number of replaced tiles.
+
+    Raises
+    ------
+    ValueError
+        If the board isn't a non-empty rectangular matrix of numbers.
+    """
+    values = _as_matrix(board)
+    valid = (values == np.floor(values)) & (values >= 0) & (values <= max_exponent)
+    return np.where(valid, values, 0).astype(DTYPE), int(values.size - np.count_nonzero(valid))
+
+
+def _as_matrix(gamefield) -> np.ndarray:
+    """Converts a loaded gamefield into a float64 matrix, see sanitize_gamefield"""
+    try:
+        values = np.asarray(gamefield, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("the gamefield is not a rectangular matrix of numbers") from None
+    if values.ndim != 2 or values.size == 0:
+        raise ValueError(f"the gamefield has to be a non-empty matrix, not of shape {values.shape}")
+    return values
+
+
+
+class LoggingConfig:
+    """Decides once per process, whether the game should be logged.
+
+    The decision comes from (highest priority first) set(), e.g. by the
+    --logging flag, the environment variable GAME2048_LOGGING or the file
+    "Config - Logging.txt" in the project folder. Without any of them, the
+    game isn't logged. Environment and file are only read on the first use
+    and on reload().
+    """
+
+    ENV_VARIABLE = "GAME2048_LOGGING"
+    FILE_NAME = "Config - Logging.txt"
+
+    def __init__(self):
+        """Constructor of class LoggingConfig."""
+        self._enabled = None
+
+
+    @property
+    def enabled(self) -> bool:
+        """True, if the game should be logged"""
+        if self._enabled is None:
+            self.reload()
+        return self._enabled
+
+
+    def set(self, enabled: bool) -> None:
+        """Decides explicitly, whether the game should be logged."""
+        self._enabled = bool(enabled)
+
+
+    def reload(self) -> bool:
+        """
+        Reads the environment variable or the config file again.
+
+        Returns
+        -------
+        bool
+            If True, then we will log content, otherwise not
+        """
+        value = os.environ.get(self.ENV_VARIABLE)
+        if value is not None:
+            self._enabled = value.strip().lower() in ("true", "1", "yes", "on")
+            return self._enabled
+
+        # Get config file path:
+        root_path = pathlib.Path(__file__).parent.resolve().parent
+        file_path = os.path.join(root_path, self.FILE_NAME)
+
+        if not os.path.exists(file_path):
+            self._enabled = False
+        else:
+            with open(file_path, "r") as file:
+                self._enabled = file.read() == "True"
+        return self._enabled
+
+
+logging_config = LoggingConfig()
+
+
+class _LogWriter:
+    """Writes log entries of all Database objects from one background thread.
+
+    Entries are collected per file and written, once enough text is waiting
+    or flush_interval seconds have passed. The files stay open in between.
+    """
+
+    def __init__(self, formatter, flush_size: int, flush_interval: float):
+        """
+        Constructor of class _LogWriter.
+
+        Parameters
+        ----------
+        formatter
+            Turns (content, option, time) into the text of an entry.
+        flush_size
+            Write the queued entries once they have this many characters.
+        flush_interval
+            Write the queued entries at least every flush_interval seconds.
+        """
+        self._formatter = formatter
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._queue = Queue()
+        self._files = {}
+        self._sizes = {}
+        self._pending = {}
+        self._pending_size = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def put(self, paths: tuple, content, option: Logging, current_time: dt.datetime) -> None:
+        """Queues an entry for the given log files."""
+        self._queue.put((paths, content, option, current_time))
+
+
+    def drain(self) -> None:
+        """Blocks until every queued entry is written and closes the files."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+
+    def stop(self) -> None:
+        """Writes every queued entry, closes the files and ends the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+
+    def _run(self) -> None:
+        """Writer loop. Problems are reported (see _report) instead of raised,
+        so that the thread keeps running and drain() is always answered."""
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, last_flush + self._flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = None
+
+            if item is _STOP or isinstance(item, threading.Event):
+                self._flush()
+                self._close()
+                last_flush = time.monotonic()
+                if item is _STOP:
+                    return
+                item.set()
+                continue
+
+            if item is not None:
+                paths, content, option, current_time = item
+                try:
+                    log = self._formatter(content, option, current_time)
+                except Exception as error:
+                    self._report(f"database.py -> a log entry couldn't be formatted: {error}")
+                    log = ""
+                for path in paths:
+                    self._pending.setdefault(path, []).append(log)
+                    self._pending_size += len(log)
+
+            if self._pending_size >= self._flush_size or time.monotonic() - last_flush >= self._flush_interval:
+                self._flush()
+                last_flush = time.monotonic()
+
+
+    def _flush(self) -> None:
+        """Writes the waiting entries to their files. The entries of a file
+        that can't be written are dropped, the other files are written anyway."""
+        failed = []
+        for path, logs in self._pending.items():
+            error = self._write(path, "".join(logs))
+            if error is not None:
+                failed.append((path, error))
+
+        self._pending = {}
+        self._pending_size = 0
+        for path, error in failed:
+            self._report(f"database.py -> the log file {path} couldn't be written: {error}")
+
+
+    def _write(self, path, text: str) -> OSError:
+        """Appends text to a log file and returns the error, if that failed."""
+        size = len(text.encode('utf-8'))
+        try:
+            if path not in self._files:
+                self._files[path] = open(path, "a")
+                self._sizes[path] = os.path.getsize(path)
+            if self._sizes[path] + size > LOG_SIZE_LIMIT:
+                print("Logging not possible, the file is too big!")
+                return None
+            self._files[path].write(text)
+            self._files[path].flush()
+            self._sizes[path] += size
+        except OSError as error:
+            # The file is opened again for the next entries
+            file = self._files.pop(path, None)
+            self._sizes.pop(path, None)
+            if file is not None:
+                try:
+                    file.close()
+                except OSError:
+                    pass
+            return error
+        return None
+
+
+    def _report(self, message: str) -> None:
+        """Logs a problem of the writer into the open log files, or prints it, if none of them can be written."""
+        text = self._formatter(message, Logging.COMMENT, dt.datetime.now())
+        written = [path for path in list(self._files) if self._write(path, text) is None]
+        if not written:
+            print("Logging not possible:", message)
+
+
+    def _close(self) -> None:
+        """Closes all open log files"""
+        for file in self._files.values():
+            try:
+                file.close()
+            except OSError:
+                pass
+        self._files = {}
+        self._sizes = {}
+
+_log_writer = None
+# Ends the thread of a _LogWriter
+_STOP = object()
 
 
 class Database:
@@ -40,29 +347,14 @@ class Database:
 
     def _logging_option(self) -> bool:
         """
-        Reads the config file and determines whether we should log something or not.
+        Determines whether we should log something or not (see LoggingConfig).
 
         Returns
         -------
         bool
             If True, then we will log content, otherwise not
         """
-
-        # Get config file path:
-        file_name = "Config - Logging.txt"
-        current_path = pathlib.Path(__file__).parent.resolve()
-        root_path = current_path.parent
-        file_path = os.path.join(root_path, file_name)
-
-        if not os.path.exists(file_path):
-            return True
-        else:
-            with open(file_path, "r") as file:
-                file_content = file.read()
-                if file_content == "True":
-                    return True
-                else:
-                    return False
+        return logging_config.enabled
 
 
     def _create_folder(self) -> pathlib.Path:
@@ -166,8 +458,9 @@ class Database:
         bool
             Indicates if a file is too big when content is inserted.
         """
-        size_limit = (1024 ** 2) * 10  # <- Change the 10 to adjust the MB size
-        file_size = os.path.getsize(file)
+        size_limit = LOG_SIZE_LIMIT
+        # A log file that was removed in the meantime is recreated by appending
+        file_size = os.path.getsize(file) if os.path.exists(file) else 0
         content_size = len(added_content.encode('utf-8'))
         combined_size = file_size + content_size
         comparison = combined_size > size_limit
@@ -260,15 +553,60 @@ class Database:
             new_record = last_record
 
         # Create the record save file
-        with open(self._path_save_record, "w") as file:
-            file.write(str(new_record))
+        write_atomic(self._path_save_record, str(new_record))
 
         return self._path_save_record
 
+    def _format_log(self, content, option: Logging, current_time: dt.datetime) -> str:
+        """
+        Creates the Markdown entry of a log.
+
+        Parameters
+        ----------
+        content
+            Either a numpy matrix or a string.
+        option
+            Choosing the content type, like a matrix or a comment.
+        current_time
+            The time of the log.
+
+        Returns
+        -------
+        str
+            The formatted entry.
+        """
+        current_time = current_time.strftime("%Y.%m.%d - %H:%M:%S")
+
+        ## Create the log string based on the chosen option
+        if option == Logging.GAMEFIELD:
+            # Convert the matrix to markdown
+            matrix_content = self._matrix_to_markdown(content)
+            # Create the final log string
+            alignment_spaces = " " * 12
+            return ":large_orange_diamond: **GAMEFIELD**" + alignment_spaces + "at _" + current_time + "_:\n" + matrix_content + "\n\n"
+
+        if option == Logging.COMMAND:
+            alignment_spaces = " " * 24
+            return ":red_circle: **COMMAND**" + alignment_spaces + "at _" + current_time + "_:\\\n**" + str(
+                content) + "**\n\n"
+
+        if option == Logging.USER_INPUT:
+            alignment_spaces = " " * 14
+            return ":large_blue_circle: **USER INPUT**" + alignment_spaces + "at _" + current_time + "_:\\\n**" + str(
+                content) + "**\n\n"
+
+        alignment_spaces = " " * 3
+        return ":diamond_shape_with_a_dot_inside: **COMMENT**" + alignment_spaces + "at _" + current_time + "_:\\\n**" + str(
+            content) + "**\n\n"
+
+
     def log(self, content, option=Logging.COMMENT, final_log=False) -> (pathlib.Path, pathlib.Path):
         """
         Logs content into two logs files, which have different level of detail.
 
+        If a log writer was started (see start_log_writer), the entry is only
+        handed over to the writer thread, which formats and writes it later.
+
         Parameters
         ----------
         content
@@ -284,7 +622,7 @@ class Database:
             Returns the path of the adjusted file.
         """
         # Skip the logging if necessary
-        if not self._logging_option():
+        if not logging_config.enabled:
             return (None, None)
 
         # Check if this is the first log
@@ -293,82 +631,118 @@ class Database:
             self._started = True
             self._create_temp_logs()
 
-        # Get the current time
-        current_time = dt.datetime.now().strftime("%Y.%m.%d - %H:%M:%S")
-        # This will be the logged content
-        log = ""
-
-        ## Create the log string based on the chosen option
-        if option == Logging.GAMEFIELD:
-            # Check if the content is actually a matrix
-            if not isinstance(content, np.ndarray):
-                print("ERROR in the log() function from database.py")
-                print("Content is not an instance of numpy.ndarray, yet option was set to 'Logging.GAMEFIELD'")
-                # End the function
-                return
-            # Convert the matrix to markdown
-            matrix_content = self._matrix_to_markdown(content)
-            # Create the final log string
-            alignment_spaces = " " * 12
-            log = ":large_orange_diamond: **GAMEFIELD**" + alignment_spaces + "at _" + current_time + "_:\n" + matrix_content + "\n\n"
-
-        elif option == Logging.COMMAND:
-            alignment_spaces = " " * 24
-            log = ":red_circle: **COMMAND**" + alignment_spaces + "at _" + current_time + "_:\\\n**" + str(
-                content) + "**\n\n"
-
-        elif option == Logging.USER_INPUT:
-            alignment_spaces = " " * 14
-            log = ":large_blue_circle: **USER INPUT**" + alignment_spaces + "at _" + current_time + "_:\\\n**" + str(
-                content) + "**\n\n"
-
-        elif option == Logging.COMMENT:
-            alignment_spaces = " " * 3
-            log = ":diamond_shape_with_a_dot_inside: **COMMENT**" + alignment_spaces + "at _" + current_time + "_:\\\n**" + str(
-                content) + "**\n\n"
+        # Check if the content is actually a matrix
+        if option == Logging.GAMEFIELD and not isinstance(content, np.ndarray):
+            print("ERROR in the log() function from database.py")
+            print("Content is not an instance of numpy.ndarray, yet option was set to 'Logging.GAMEFIELD'")
+            # End the function
+            return
 
         # No valid option was entered
-        else:
+        if not isinstance(option, Logging):
             print("ERROR IN THE LOG FUNCTION.\n")
             print("Enter an option string with the following options: 'matrix', 'command', 'user_input', 'comment'.\n")
             print("Upper and lower case is irrelevant for the option-string!\n")
             return
 
-        # Log the content, if the file and the content itself is small enough
         # Comment-Logs will only be displayed in the "Log - System.md" files
-        if not option == Logging.COMMENT:
-            if not self._is_file_too_big(self._path_log_system, log):
-                # Add content to "Log - System.md"
-                with open(self._path_log_system, "a") as system_file:
-                    system_file.write(log)
-
-            if not self._is_file_too_big(self._path_log_game, log):
-                # Add content to "Log - Game.md"
-                with open(self._path_log_game, "a") as game_file:
-                    game_file.write(log)
+        if option == Logging.COMMENT:
+            paths = (self._path_log_system,)
+        else:
+            paths = (self._path_log_system, self._path_log_game)
+
+        if _log_writer is not None:
+            # The matrix may change, before the writer thread formats it
+            if isinstance(content, np.ndarray):
+                content = np.copy(content)
+            _log_writer.put(paths, content, option, dt.datetime.now())
         else:
-            if not self._is_file_too_big(self._path_log_system, log):
-                # Add content to "Log - System.md"
-                with open(self._path_log_system, "a") as system_file:
-                    system_file.write(log)
+            log = self._format_log(content, option, dt.datetime.now())
+            # Log the content, if the file and the content itself is small enough
+            for path in paths:
+                if not self._is_file_too_big(path, log):
+                    with open(path, "a") as file:
+                        file.write(log)
 
         # End the writing process for the files completely when final_log is True
         if final_log:
+            if _log_writer is not None:
+                _log_writer.drain()
             names = self._finalize_log_files()
             return names
 
         return (self._path_log_system, self._path_log_game)
 
-    def create_save(self, matrix: np.ndarray, current_highscore: int) -> (pathlib.Path, pathlib.Path):
+
+    @staticmethod
+    def start_log_writer(flush_size=64 * 1024, flush_interval=0.5) -> None:
         """
-        Creates a JSON file, in which the content of a numpy matrix is stored.
+        Switches all Database objects to asynchronous logging.
+
+        From now on log() only queues its entries. One writer thread formats
+        them, keeps the log files open and writes them in batches.
+
+        Parameters
+        ----------
+        flush_size
+            Write the queued entries once they have this many characters.
+        flush_interval
+            Write the queued entries at least every flush_interval seconds.
+        """
+        global _log_writer
+        if _log_writer is None:
+            _log_writer = _LogWriter(Database()._format_log, flush_size, flush_interval)
+
+
+    @staticmethod
+    def stop_log_writer() -> None:
+        """Writes all queued entries, ends the writer thread and switches back to synchronous logging."""
+        global _log_writer
+        if _log_writer is not None:
+            _log_writer.stop()
+            _log_writer = None
+
+
+    def create_trace(self, field: np.ndarray, seed=None) -> TraceWriter:
+        """
+        Creates a binary trace file for the game (see trace.py).
+
+        Parameters
+        ----------
+        field
+            The gamefield the recording starts with.
+        seed
+            The seed of the tile generator, if known.
+
+        Returns
+        -------
+        TraceWriter
+            The writer for the new file or None, if we don't log.
+        """
+        if not logging_config.enabled:
+            return None
+
+        folder_path = self._create_folder()
+        current_time = dt.datetime.now().strftime("%Y_%m_%d %H-%M-%S")
+        path = os.path.join(folder_path, current_time + "   Trace - Game.g2048")
+        return TraceWriter(path, field, seed)
+
+
+    def create_save(self, matrix: np.ndarray, current_highscore: int, board=None,
+                    generation=None) -> (pathlib.Path, pathlib.Path):
+        """
+        Creates a JSON file, in which the gamefield is stored as tile exponents (see board.py).
 
         Parameters
         ----------
         matrix
-            The matrix we want to store in a JSON file.
+            The matrix of tile values we want to store in a JSON file.
         current_highscore
             The highscore of the current gaming session.
+        board
+            The gamefield as tile exponents, used instead of the matrix if given.
+        generation
+            The generation of the autosave journal, that continues this save (see autosave.py).
 
         Returns
         -------
@@ -381,26 +755,29 @@ class Database:
         self._path_save_game = os.path.join(folder_path, file_name)
 
         # If the input is currupted, then return basic values
-        if matrix is None:
-            matrix = np.array([[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+        if board is None and matrix is None:
+            board = np.zeros((4, 4), dtype=DTYPE)
+        elif board is None:
+            board = to_exponents(matrix)
         if current_highscore is None:
             current_highscore = 0
 
         # JSON can't handle numpy arrays, so we need to convert them first
-        matrix_to_list = matrix.tolist()
+        board_to_list = np.asarray(board).tolist()
 
         # The highscore and gamefield will be stored in a python dictionary
         python_save = {
-            "highscore": current_highscore,
-            "gamefield": matrix_to_list
+            "highscore": int(current_highscore),
+            "exponents": board_to_list
         }
+        if generation is not None:
+            python_save["generation"] = generation
 
         # Convert python_save to the JSON format
         save_converted = json.dumps(python_save)
 
-        # Write the save state content within the file of savestate_path
-        with open(self._path_save_game, "w") as file:
-            file.write(save_converted)
+        # Write the save state content within the file of savestate_path, never leaving half a file
+        write_atomic(self._path_save_game, save_converted)
 
         # Also create or update the highscore record
         self._update_highscore_record(current_highscore)
@@ -408,7 +785,7 @@ class Database:
         return (self._path_save_game, self._path_save_record)
 
 
-    def read_save(self, file: pathlib.Path) -> tuple:
+    def read_save(self, file: pathlib.Path, max_exponent=MAX_EXPONENT) -> tuple:
         """
         Creates a tuple containing the last highscore and gamefield, based on an input JSON file.
 
@@ -416,51 +793,55 @@ class Database:
         ----------
         file
             The path to a JSON file that should be read.
+        max_exponent
+            Tiles above 2 ** max_exponent are replaced with 0 (see sanitize_board).
 
         Returns
         -------
         tuple
-            A tuple containing the last highscore, gamefield or the highscore record.
+            A tuple containing the last highscore, gamefield (as tile values) and the autosave
+            generation (or None) or the highscore record.
+            If the file is missing or broken: False and the reason.
         """
-        # If the save file doesn't exit, return a warning message in the returned load
-        if not os.path.exists(file):
-            return (False, "Save file doesn't exit!")
-
         # /.../.../file -> "file"
         file_name = os.path.basename(file)
+        if file_name not in ("Save - Highscore.json", "Save - Game.json"):
+            return (False, "Invalid file!")
+
+        try:
+            with open(file, "r") as save_file:
+                file_content = save_file.read()
+        except FileNotFoundError:
+            # If the save file doesn't exit, return a warning message in the returned load
+            return (False, "Save file doesn't exit!")
 
         # If the file is the highscore record file, then return the record
         if file_name == "Save - Highscore.json":
-            with open(file, "r") as record_file:
-                record_file_content = record_file.read()
-                load_record = int(float(record_file_content))
-            return (load_record,)
+            try:
+                return (int(float(file_content)),)
+            except ValueError:
+                return (False, f"Invalid highscore record in {file_name}: {file_content[:50]!r}")
 
         # If the file is the game save file, then return the last gamefield and highscore
-        if file_name == "Save - Game.json":
-            with open(file, "r") as game_file:
-                game_file_content = game_file.read()
-                # Get the last gamefield and highscore
-                converted_content = json.loads(game_file_content)
-                load_highscore = converted_content['highscore']
-                temporary_gamefield = converted_content['gamefield']
-
-                # Convert the list in temporary_gamefield to a numpy matrix
-                load_gamefield = np.asarray(temporary_gamefield)
-
-                # Make sure that the numbers in the matrix are permitted!
-                permitted_num = (0, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1042, 2048)
-                # Make sure that the numbers are only integers and not float!
-                load_highscore = int(float(load_highscore))
-
-                for i, row in enumerate(load_gamefield):
-                    for j, column in enumerate(row):
-                        # Integer conversion
-                        load_gamefield[i][j] = int(float(column))
-                        # Replace invalid numbers with 0
-                        if column not in permitted_num:
-                            load_gamefield[i][j] = 0
-
-                return (load_highscore, load_gamefield)
-
-        return (False, "Invalid file!")
+        try:
+            converted_content = json.loads(file_content)
+            # Make sure that the numbers are only integers and not float!
+            load_highscore = int(float(converted_content['highscore']))
+            # Make sure that the numbers in the matrix are permitted!
+            if 'exponents' in converted_content:
+                load_board, replaced = sanitize_board(converted_content['exponents'], max_exponent)
+                load_gamefield = to_values(load_board)
+            else:
+                # Saves of older versions store the tile values
+                load_gamefield, replaced = sanitize_gamefield(converted_content['gamefield'], max_exponent)
+        except KeyError as error:
+            message = f"Invalid save file {file_name}: missing {error}"
+        except (ValueError, TypeError) as error:
+            message = f"Invalid save file {file_name}: {error}"
+        else:
+            if replaced:
+                self.log(content=f"database.py -> read_save replaced {replaced} invalid tiles with 0.")
+            return (load_highscore, load_gamefield, converted_content.get('generation'))
+
+        self.log(content="database.py -> read_save: " + message)
+        return (False, message)
@@ -1,5 +1,6 @@
 """This file implements the Observer Pattern for 2048"""
 
+import asyncio
 from abc import ABC, abstractmethod
 from queue import Queue
 from threading import Thread
@@ -64,16 +65,64 @@ class EventManager:
     Attributes
     ----------
     _observers: list
+        (observer, event classes or None for all events) in the order of registration
+    _handlers: dict
+        Event class -> the observers that are notified of it
+    _use_asyncio: bool
+        runs the events and the tasks of the observers on one asyncio loop
+        instead of an event thread
+    _loop: asyncio.AbstractEventLoop
+        the running loop in asyncio mode
+    _tasks: list
+        coroutine functions that are started with the loop, then the running tasks
     """
-    def __init__(self):
-        """Construct Event Manager and start event loop"""
+    def __init__(self, use_asyncio=False):
+        """Construct Event Manager and start event loop
+
+        Parameters
+        ----------
+        use_asyncio: bool
+            run the event loop as asyncio task instead of a thread (default: thread)
+        """
         self._observers: list = []
-        self._event_queue = Queue()
+        self._handlers: dict = {}
+        self._use_asyncio = use_asyncio
+        self._loop = None
+        self._tasks: list = []
+        self._stopped = None
+        self._event_queue = None if use_asyncio else Queue()
+        self._pending: list = []
 
 
-    def register_observer(self, observer) -> None:
-        """Add object to broadcast list"""
-        self._observers.append(observer)
+    @property
+    def uses_asyncio(self) -> bool:
+        """True, if the events are handled by an asyncio loop"""
+        return self._use_asyncio
+
+
+    def register_observer(self, observer, event_types=None) -> None:
+        """Add object to broadcast list
+
+        Parameters
+        ----------
+        observer
+            object with a notify(event) method
+        event_types: tuple
+            the Event classes (and their subclasses) the observer is notified of
+            (default: all events)
+        """
+        types = None if event_types is None else tuple(event_types)
+        self._observers.append((observer, types))
+        # Event classes, that weren't announced yet, are indexed on their first event
+        for event_type, observers in self._handlers.items():
+            if types is None or issubclass(event_type, types):
+                observers.append(observer)
+
+
+    def _subscribers(self, event_type: type) -> list:
+        """Returns the observers of an event class in the order of registration"""
+        return [observer for observer, types in self._observers
+                if types is None or issubclass(event_type, types)]
 
 
     def post(self, event: Event) -> None:
@@ -83,19 +132,109 @@ class EventManager:
             self._announce(event)
         # StartEvent starts the event loop
         elif isinstance(event, StartEvent):
+            if self._use_asyncio:
+                asyncio.run(self.run(event))
+                return
             t = Thread(target=self._next_event, daemon=True)
             t.start()
             self._announce(event)
+        elif self._use_asyncio:
+            self._put_async(event)
         else:
             self._event_queue.put(event)
 
 
+    def _put_async(self, event: Event) -> None:
+        """Queues an event for the asyncio loop from any thread"""
+        if self._loop is None:
+            self._pending.append(event)
+            return
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._event_queue.put_nowait(event)
+        else:
+            self._loop.call_soon_threadsafe(self._event_queue.put_nowait, event)
+
+
+    def add_task(self, coroutine_function) -> None:
+        """Runs a coroutine function as task of the asyncio loop, as soon as the loop runs.
+        Tasks that still run, when the game quits, are cancelled.
+
+        Parameters
+        ----------
+        coroutine_function
+            an async function without arguments, e.g. the frame ticker of a view
+        """
+        if self._loop is None:
+            self._tasks.append(coroutine_function)
+        else:
+            self._tasks.append(self._loop.create_task(coroutine_function()))
+
+
+    async def run(self, start_event=None) -> None:
+        """Runs the game on the current asyncio loop until a QuitEvent.
+        Several EventManagers can run on the same loop.
+
+        Parameters
+        ----------
+        start_event: StartEvent
+            the event that starts the observers (default: a new one)
+        """
+        self._loop = asyncio.get_running_loop()
+        self._event_queue = asyncio.Queue()
+        self._stopped = asyncio.Event()
+        for event in self._pending:
+            self._event_queue.put_nowait(event)
+        self._pending.clear()
+
+        waiting, self._tasks = self._tasks, []
+        for coroutine_function in waiting:
+            self.add_task(coroutine_function)
+        consumer = self._loop.create_task(self._next_event_async())
+
+        self._announce(start_event or StartEvent())
+        await self._stopped.wait()
+
+        consumer.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(consumer, *self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+
+    def queue_size(self) -> int:
+        """Returns the number of events that wait for the event loop"""
+        if self._event_queue is None:
+            return len(self._pending)
+        return self._event_queue.qsize()
+
+
     def _announce(self, event) -> None:
-        """Broadcast event to all observers"""
-        for observer in self._observers:
+        """Broadcast event to the observers of its class"""
+        observers = self._handlers.get(type(event))
+        if observers is None:
+            # the first event of its class
+            observers = self._handlers[type(event)] = self._subscribers(type(event))
+        for observer in observers:
             observer.notify(event)
 
 
+    async def _next_event_async(self) -> None:
+        """Event loop task, that announces next event to the observers"""
+        while True:
+            event = await self._event_queue.get()
+            try:
+                self._announce(event)
+            finally:
+                self._event_queue.task_done()
+                if isinstance(event, QuitEvent):
+                    self._stopped.set()
+
+
     def _next_event(self) -> None:
         """Event loop, that announces next event to the observers"""
         while True:
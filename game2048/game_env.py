@@ -0,0 +1,608 @@
+"""This file implements the headless core of the game 2048
+
+GameEnv holds a gamefield, its score and its own random number generator.
+It doesn't read or write files, doesn't log and doesn't know about the
+EventManager, so many games can run side by side in one process (e.g. for
+bots or replays). Model wraps a GameEnv for the interactive game.
+"""
+
+import random
+import numpy as np
+from .arguments import Command, DIRECTIONS
+from .board import DTYPE, to_exponents, to_values
+from . import bitboard
+
+# The tile that wins the game, if no other target is chosen
+WIN_TILE = 2048
+
+
+def legal_move_mask(boards: np.ndarray) -> np.ndarray:
+    """Finds the directions that would change a gamefield in one pass.
+
+    A slide changes a gamefield, if two equal tiles are next to each other
+    along its direction, or if a tile has an empty neighbour in front of
+    it. Both are checked with shifted views of the whole gamefield.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        A gamefield of shape (height, width) or a stack of shape
+        (N, height, width), of tile values or tile exponents.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask of shape (4,) or (N, 4) in the order of DIRECTIONS.
+    """
+    boards = np.asarray(boards)
+
+    def changes(first: np.ndarray, second: np.ndarray) -> (np.ndarray, np.ndarray):
+        """Whether neighbours change by a slide towards first / towards second"""
+        merge = (first == second) & (first != 0)
+        towards_first = (merge | ((first == 0) & (second != 0))).any(axis=(-2, -1))
+        towards_second = (merge | ((second == 0) & (first != 0))).any(axis=(-2, -1))
+        return towards_first, towards_second
+
+    left, right = changes(boards[..., :, :-1], boards[..., :, 1:])
+    up, down = changes(boards[..., :-1, :], boards[..., 1:, :])
+    mask = {Command.LEFT: left, Command.RIGHT: right, Command.UP: up, Command.DOWN: down}
+    return np.stack([mask[command] for command in DIRECTIONS], axis=-1)
+
+
+def slide_batch(boards: np.ndarray, command: Command, exponents=False) -> (np.ndarray, np.ndarray, np.ndarray):
+    """Performs the same slide action on many gamefields at once.
+
+    Follows the rules of Model._slide, but works on a whole stack of boards
+    with array operations only: the direction is turned into a left slide by
+    a transposed/mirrored view, non-empty tiles are compacted with a stable
+    sort, and equal neighbours are merged pairwise from the left of every run.
+    No tiles are added and nothing is logged.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        An array of shape (N, height, width) holding N gamefields.
+    command : Command
+        A command that determines the direction of slide action.
+    exponents : bool
+        If True, the boards hold tile exponents (see board.py) instead
+        of tile values, so a merge adds 1 instead of doubling.
+
+    Returns
+    -------
+    tuple
+        The N boards after the slide, the points scored on each board and
+        a boolean mask telling which boards were changed by the slide.
+    """
+    return _slide_batch(boards, command, exponents)[:3]
+
+
+def _slide_batch(boards: np.ndarray, command: Command, exponents: bool) -> tuple:
+    """slide_batch(), that also returns the largest merged tile of every board (0 if none)"""
+    boards = np.asarray(boards)
+    if boards.ndim != 3:
+        raise ValueError("slide_batch() expects an array of shape (N, height, width)")
+
+    def to_left(stack: np.ndarray) -> np.ndarray:
+        """Turns the stack so that the slide direction points to the left"""
+        if command is Command.LEFT:
+            return stack
+        if command is Command.RIGHT:
+            return stack[:, :, ::-1]
+        if command is Command.UP:
+            return stack.transpose(0, 2, 1)
+        if command is Command.DOWN:
+            return stack.transpose(0, 2, 1)[:, :, ::-1]
+        raise Exception("Wrong command input for model.slide_batch()")
+
+    def from_left(stack: np.ndarray) -> np.ndarray:
+        """Reverses to_left()"""
+        if command is Command.RIGHT:
+            return stack[:, :, ::-1]
+        if command is Command.UP:
+            return stack.transpose(0, 2, 1)
+        if command is Command.DOWN:
+            return stack[:, :, ::-1].transpose(0, 2, 1)
+        return stack
+
+    def move_tiles(rows: np.ndarray) -> np.ndarray:
+        """Moves all non-empty tiles to the left, keeping their order"""
+        order = np.argsort(rows == 0, axis=1, kind="stable")
+        return np.take_along_axis(rows, order, axis=1)
+
+    turned = to_left(boards)
+    count, height, width = turned.shape
+    rows = move_tiles(turned.reshape(count * height, width))
+
+    # Within every run of equal tiles the 1st merges with the 2nd, the 3rd
+    # with the 4th, ... – exactly what the left-to-right merge loop does.
+    index = np.arange(width)
+    run_start = np.ones(rows.shape, dtype=bool)
+    run_start[:, 1:] = rows[:, 1:] != rows[:, :-1]
+    start_index = np.maximum.accumulate(np.where(run_start, index, 0), axis=1)
+    first_of_pair = ((index - start_index) % 2 == 0)[:, :-1]
+    merge = (rows[:, :-1] == rows[:, 1:]) & (rows[:, :-1] != 0) & first_of_pair
+
+    if exponents:
+        merged_tiles = np.where(merge, rows[:, :-1] + 1, 0).astype(rows.dtype)
+        merged_values = np.where(merge, np.left_shift(1, merged_tiles.astype(np.int64)), 0)
+    else:
+        merged_tiles = merged_values = np.where(merge, rows[:, :-1] * 2, 0)
+    rows[:, :-1] = np.where(merge, merged_tiles, rows[:, :-1])
+    rows[:, 1:][merge] = 0
+    rows = move_tiles(rows)
+
+    result = np.ascontiguousarray(from_left(rows.reshape(count, height, width)))
+    score = merged_values.reshape(count, -1).sum(axis=1)
+    changed = (result != boards).reshape(count, -1).any(axis=1)
+    largest = merged_tiles.reshape(count, -1).max(axis=1, initial=0)
+    return result, score, changed, largest
+
+
+class GameEnv:
+    """This class implements a gym-style environment of the game 2048.
+
+    A 4x4 gamefield is stored as a packed board (see bitboard.py), every
+    other gamefield as a uint8 matrix of tile exponents, so that a board of
+    1024x1024 tiles needs 1 MB. Both are handed out as a board of tile
+    exponents by 'exponents' (see board.py) and as a matrix of tile values
+    by 'field'.
+
+    Attributes
+    ----------
+    _height: int
+        The height of the gamefield.
+    _width: int
+        The width of the gamefield.
+    _board : int
+        The packed board or None, if the field is stored as exponents.
+    _exponents : np.ndarray
+        The tile exponents of the gamefield, if it can't be packed.
+    _free : np.ndarray
+        The flat indices of the empty tiles of _exponents in its first
+        _free_count entries. A slide action moves most tiles, so it collects
+        them again (like the slide itself in O(height * width)), a new tile
+        removes its own in O(1) by moving the last entry into its slot.
+    _slot : np.ndarray
+        The index into _free of every empty tile, -1 for the other tiles.
+    _free_count : int
+        The number of empty tiles of _exponents.
+    _score : int
+        The points achieved in the current game.
+    _rng : random.Random
+        The random number generator for new tiles.
+    _seed : int
+        The seed of _rng, so that a game can be recorded and repeated.
+    _version : int
+        Counts the changes of the gamefield and the score, so that views
+        only redraw after a change.
+    _max_exponent : int
+        The exponent of the largest tile, updated by every merge and new tile.
+    _target_exponent : int
+        The exponent of the tile that wins the game.
+    _start_tiles : list
+        The tiles drawn by the last reset(), in their order.
+    """
+
+    def __init__(self, height=4, width=4, seed=None, rng=None, target=WIN_TILE):
+        """Constructor of class GameEnv.
+
+        Parameters
+        ----------
+        height : int
+            The number of rows.
+        width : int
+            The number of columns.
+        seed : int
+            Seed for the random number generator (default: drawn from rng)
+        rng : random.Random
+            The random number generator for new tiles (default: a new one)
+        target : int
+            The tile that wins the game, a power of two.
+        """
+        if target < 2 or target & (target - 1):
+            raise ValueError(f"the target tile has to be a power of two, not {target}")
+        self._target_exponent = int(target).bit_length() - 1
+        self._max_exponent = 0
+        self._height = height
+        self._width = width
+        self._rng = random.Random() if rng is None else rng
+        self.reseed(seed)
+        self._board = None
+        self._exponents = None
+        self._free = None
+        self._slot = None
+        self._free_count = 0
+        self._decoded = (None, None, None)
+        self._start_tiles = []
+        self._score = 0
+        self._version = 0
+        self.exponents = np.zeros((height, width), dtype=DTYPE)
+
+
+    @property
+    def exponents(self) -> np.ndarray:
+        """The gamefield as a read-only board of tile exponents, unpacked once per change."""
+        return self._decode()[1]
+
+
+    @exponents.setter
+    def exponents(self, exponents: np.ndarray) -> None:
+        """Stores a board packed, if possible, otherwise as it is."""
+        exponents = np.array(exponents, dtype=DTYPE)
+        self._height, self._width = exponents.shape
+        self._max_exponent = int(exponents.max())
+        if exponents.shape == (bitboard.SIZE, bitboard.SIZE) and self._max_exponent < bitboard.MAX_EXPONENT:
+            self._board = bitboard.encode_exponents(exponents)
+            self._exponents = None
+            self._free = None
+            self._slot = None
+        else:
+            self._board = None
+            self._exponents = exponents
+            self._index_empty_tiles()
+        self._version += 1
+
+
+    @property
+    def field(self) -> np.ndarray:
+        """The gamefield as a read-only int64 matrix of tile values, for display."""
+        version, exponents, field = self._decoded
+        if version != self._version or field is None:
+            version, exponents, _ = self._decode()
+            field = to_values(exponents)
+            field.flags.writeable = False
+            self._decoded = (version, exponents, field)
+        return field
+
+
+    def _decode(self) -> tuple:
+        """Returns the cached version, exponents and values, unpacking the exponents after a change"""
+        # The version is read first: if another thread slides meanwhile, the
+        # board is cached under the older version and unpacked again next time
+        version = self._version
+        decoded = self._decoded
+        if decoded[0] != version:
+            if self._board is not None:
+                exponents = bitboard.decode_exponents(self._board).astype(DTYPE)
+            else:
+                exponents = self._exponents.copy()
+            exponents.flags.writeable = False
+            decoded = (version, exponents, None)
+            self._decoded = decoded
+        return decoded
+
+
+    @field.setter
+    def field(self, field: np.ndarray) -> None:
+        """Stores a gamefield of tile values (see exponents)."""
+        self.exponents = to_exponents(field)
+
+
+    @property
+    def board(self) -> int:
+        """The packed board or None, if the gamefield is stored as a matrix"""
+        return self._board
+
+
+    @property
+    def seed(self) -> int:
+        """The seed of the random number generator"""
+        return self._seed
+
+
+    @property
+    def score(self) -> int:
+        """The points achieved in the current game"""
+        return self._score
+
+
+    @score.setter
+    def score(self, score: int) -> None:
+        self._score = score
+        self._version += 1
+
+
+    @property
+    def max_tile(self) -> int:
+        """The largest tile of the gamefield, in O(1)"""
+        return 1 << self._max_exponent if self._max_exponent else 0
+
+
+    @property
+    def target(self) -> int:
+        """The tile that wins the game"""
+        return 1 << self._target_exponent
+
+
+    @property
+    def start_tiles(self) -> list:
+        """The positions and values of the first tiles of the game, in the order they were drawn"""
+        return list(self._start_tiles)
+
+
+    @property
+    def version(self) -> int:
+        """Increases with every change of the gamefield or the score"""
+        return self._version
+
+
+    def reseed(self, seed=None) -> int:
+        """Restarts the random number generator.
+
+        Parameters
+        ----------
+        seed : int
+            The new seed (default: drawn from the current generator, so
+            a seeded game stays reproducible)
+
+        Returns
+        -------
+        int
+            The new seed.
+        """
+        if seed is None:
+            seed = self._rng.getrandbits(63)
+        self._seed = seed
+        self._rng.seed(seed)
+        return seed
+
+
+    def reset(self, seed=None) -> np.ndarray:
+        """Starts a new game with two random tiles.
+
+        Parameters
+        ----------
+        seed : int
+            Reseeds the random number generator, if given.
+
+        Returns
+        -------
+        np.ndarray
+            The new gamefield.
+        """
+        if seed is not None:
+            self.reseed(seed)
+        self.exponents = np.zeros((self._height, self._width), dtype=DTYPE)
+        self._score = 0
+        self._start_tiles = [self.add_tile(), self.add_tile()]
+        return self.field
+
+
+    def step(self, command: Command) -> (np.ndarray, int, bool, dict):
+        """Performs a slide action and adds a new tile, if the field changed.
+
+        Parameters
+        ----------
+        command : Command
+            A command that determines the direction of slide action.
+
+        Returns
+        -------
+        tuple
+            The gamefield, the points scored by this move, whether the game
+            is lost and a dictionary with further information:
+            'changed' (bool), 'spawn' (position and value of the new tile
+            or None), 'score' (the total score) and 'won' (bool).
+        """
+        changed, reward = self.slide(command)
+        spawn = None
+        if changed and self.empty_count():
+            spawn = self.add_tile()
+
+        done = self.empty_count() == 0 and not self.legal_moves()
+        info = {"changed": changed,
+                "spawn": spawn,
+                "score": self._score,
+                "won": self.won()}
+        return self.field, reward, done, info
+
+
+    def slide(self, command: Command) -> (bool, int):
+        """Performs a slide action without adding a new tile.
+
+        Parameters
+        ----------
+        command : Command
+            A command that determines the direction of slide action.
+
+        Returns
+        -------
+        tuple
+            Whether the gamefield changed and the points scored by merges.
+        """
+        if self._board is not None:
+            board, points = bitboard.slide(self._board, command)
+            changed = board != self._board
+            self._board = board
+            if points:
+                self._max_exponent = bitboard.max_exponent(board)
+                if self._max_exponent >= bitboard.MAX_EXPONENT:
+                    # The next merge of this tile wouldn't fit into a nibble
+                    self._unpack()
+        else:
+            boards, points, changed, largest = _slide_batch(self._exponents[np.newaxis], command, True)
+            points, changed = int(points[0]), bool(changed[0])
+            if changed:
+                self._exponents = boards[0]
+                self._index_empty_tiles()
+                self._max_exponent = max(self._max_exponent, int(largest[0]))
+        self._score += points
+        if changed or points:
+            self._version += 1
+        return changed, points
+
+
+    def preview(self, command: Command) -> (np.ndarray, int, bool):
+        """Computes a slide action without changing the game.
+
+        Parameters
+        ----------
+        command : Command
+            A command that determines the direction of slide action.
+
+        Returns
+        -------
+        tuple
+            The gamefield after the slide (without a new tile), the points
+            scored by merges and whether the gamefield would change.
+        """
+        if self._board is not None:
+            board, points = bitboard.slide(self._board, command)
+            return to_values(bitboard.decode_exponents(board)), points, board != self._board
+        boards, points, changed = slide_batch(self._exponents[np.newaxis], command, exponents=True)
+        return to_values(boards[0]), int(points[0]), bool(changed[0])
+
+
+    def legal_moves(self) -> list:
+        """Returns the directions that would change the gamefield.
+
+        Returns
+        -------
+        list
+            The commands of all possible slide actions.
+        """
+        if self._board is not None:
+            return bitboard.legal_moves(self._board)
+        return [command for command, legal in zip(DIRECTIONS, legal_move_mask(self._exponents)) if legal]
+
+
+    def won(self) -> bool:
+        """Checks in O(1), if the largest tile reached the target tile"""
+        return self._max_exponent >= self._target_exponent
+
+
+    def add_tile(self) -> ((int, int), int):
+        """Inserts either a new 2- or 4-tile randomly, in an empty tile.
+
+        Returns
+        -------
+        tuple
+            The position and the value of the new tile.
+        """
+        if self._board is not None:
+            position = self._rng.choice(bitboard.empty_cells(self._board))
+        else:
+            # randrange(n) draws like choice() of a list of n empty tiles
+            flat = self._nth_empty_tile(self._rng.randrange(self.empty_count()))
+            position = divmod(int(flat), self._width)
+        # There is a 10% chance a tile 4 will be inserted, 90% of a 2
+        value = 4 if self._rng.random() < 0.1 else 2
+        self.put_tile(position, value)
+        return position, value
+
+
+    def put_tile(self, position: (int, int), value: int) -> None:
+        """Inserts a tile with a given value into an empty tile.
+
+        Parameters
+        ----------
+        position : tuple
+            The row and column of the empty tile.
+        value : int
+            The value of the new tile, a power of two.
+        """
+        exponent = int(value).bit_length() - 1
+        self._max_exponent = max(self._max_exponent, exponent)
+        if self._board is not None and exponent >= bitboard.MAX_EXPONENT:
+            self._unpack()
+        if self._board is not None:
+            row, column = position
+            self._board |= exponent << (4 * (bitboard.SIZE * row + column))
+        else:
+            was_empty = self._exponents[position] == 0
+            self._exponents[position] = exponent
+            if was_empty:
+                self._take_empty_tile(position)
+        self._version += 1
+
+
+    def _unpack(self) -> None:
+        """Stores the packed board as a matrix of exponents from now on"""
+        self._exponents = bitboard.decode_exponents(self._board).astype(DTYPE)
+        self._board = None
+        self._index_empty_tiles()
+
+
+    def empty_tiles(self) -> list:
+        """Returns the positions of the current empty tiles in the gamefield"""
+        if self._board is not None:
+            return bitboard.empty_cells(self._board)
+        rows, columns = np.divmod(np.sort(self._free[:self._free_count]), self._width)
+        return list(zip(rows.tolist(), columns.tolist()))
+
+
+    def empty_count(self) -> int:
+        """Returns the number of empty tiles, in O(1)"""
+        if self._board is not None:
+            return bitboard.empty_count(self._board)
+        return self._free_count
+
+
+    def _index_empty_tiles(self) -> None:
+        """Collects the empty tiles after the gamefield was changed as a whole"""
+        size = self._exponents.size
+        if self._free is None or len(self._free) != size:
+            self._free = np.empty(size, dtype=np.int64)
+            self._slot = np.empty(size, dtype=np.int64)
+        free = np.flatnonzero(self._exponents == 0)
+        self._free[:len(free)] = free
+        self._slot.fill(-1)
+        self._slot[free] = np.arange(len(free))
+        self._free_count = len(free)
+
+
+    def _nth_empty_tile(self, n: int) -> int:
+        """Returns the flat index of the n-th empty tile (in row-major order until the first new tile)"""
+        return self._free[n]
+
+
+    def _take_empty_tile(self, position: (int, int)) -> None:
+        """Removes a filled tile from the empty tiles"""
+        row, column = position
+        flat = row * self._width + column
+        slot = self._slot[flat]
+        self._free_count -= 1
+        last = self._free[self._free_count]
+        self._free[slot] = last
+        self._slot[last] = slot
+        self._slot[flat] = -1
+
+
+    @staticmethod
+    def check_losing(field: np.ndarray) -> bool:
+        """Checks if the player is still capable of playing the game
+        in its current state. If not, then the player lost.
+
+        Parameter
+        ---------
+        field: np.ndarray
+            A matrix of the current tiles (or their exponents) in the game.
+
+        Returns
+        -------
+        bool
+            True, if the player lost the game.
+        """
+        field = np.asarray(field)
+        # an empty gamefield has no legal move either, but isn't lost
+        return bool(field.any()) and not legal_move_mask(field).any()
+
+
+    @staticmethod
+    def check_winning(field: np.ndarray, target=WIN_TILE) -> bool:
+        """Checks if the player won the game.
+
+        Parameter
+        ---------
+        field: np.ndarray
+            A matrix of the current tiles in the game.
+        target: int
+            The tile that wins the game.
+
+        Returns
+        -------
+        bool
+            True, if the gamefield has a tile of at least the target.
+        """
+        return bool((np.asarray(field) >= target).any())
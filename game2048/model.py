@@ -1,12 +1,13 @@
 """This file implements the game logic behind 2048"""
 
-import random
 import pathlib
 import os
 import numpy as np
-from .event_manager import (EventManager, SlideEvent, StateEvent, StartEvent)
-from .arguments import (Command, Screen, Logging)
-from .database import Database
+from .event_manager import (EventManager, SlideEvent, StateEvent, StartEvent, QuitEvent)
+from .arguments import (Command, Screen)
+from .database import Database, logging_config
+from .game_env import GameEnv, slide_batch, WIN_TILE
+from .autosave import Autosave
 
 db = Database()
 
@@ -19,16 +20,25 @@ class Model:
     with a specific value or is empty.
     Tiles can be moved and merged.
 
+    The game itself is played by a GameEnv (see game_env.py). Model connects
+    it with the save files, the logs and the EventManager.
+
     Attributes
     ----------
+    _env : GameEnv
+        The headless game, that holds the gamefield and the score.
     _field : np.ndarray
         Represents the actual _game _field with every tile.
     _highscore : int
         The current achieved high score.
-    _height: int
-        The _height of the _game _field.
-    _width: int
-        The _width of the _game _field.
+    _record_highscore : int
+        The best high score of all games.
+    _trace : TraceWriter
+        Records every action into a trace file, if we log the game.
+    _trace_seed : int
+        The seed of the tile generator from the first action on.
+    _autosave : Autosave
+        Journals every action, so that a crashed game can be recovered.
     _ev_manager : EventManager
         controls communication with other modules
     """
@@ -37,7 +47,11 @@ class Model:
                  ev_manager: EventManager,
                  height=4,
                  width=4,
-                 field=None):
+                 field=None,
+                 seed=None,
+                 rng=None,
+                 target=WIN_TILE,
+                 autosave=False):
         """Constructor of class Model.
 
         Parameters
@@ -50,8 +64,15 @@ class Model:
             A matrix representation of the _game.
         ev_manager : EventManager
             controls communication with other modules
-        load : bool
-            Indicate if we want to load a previous game
+        seed : int
+            Seed for the new tiles, to make a game reproducible.
+        rng : random.Random
+            The random number generator for new tiles (default: a new one)
+        target : int
+            The tile that wins the game, a power of two.
+        autosave : bool
+            Journal every action in the background and recover the journal
+            of a crashed game (see autosave.py).
         """
         ## Load savestate
         # /.../project2048/2048/
@@ -70,16 +91,11 @@ class Model:
         loaded_game = db.read_save(game_save_path)
         loaded_record = db.read_save(self.record_path)
 
+        self._env = GameEnv(height, width, seed=seed, rng=rng, target=target)
         if field is None:
-            self._height = height
-            self._width = width
-            self._field = np.zeros((self._height, self._width))
             self._start_game()
         else:
             self._field = field
-            self._height = len(field)
-            self._width = len(field[0])
-        self._highscore = 0
 
         if loaded_game[0] is not False:
             self._highscore = loaded_game[0]
@@ -90,15 +106,77 @@ class Model:
         else:
             self._record_highscore = loaded_record[0]
 
+        self._trace = None
+        self._trace_seed = None
+
+        self._autosave = None
+        if autosave:
+            self._autosave = Autosave(database_path)
+            generation = loaded_game[2] if loaded_game[0] is not False else None
+            replayed = self._autosave.recover(self._env, generation)
+            if replayed:
+                db.log(content=f"model.py -> {replayed} actions were recovered from the journal.")
+            self._autosave.start(self._env)
+
         self._ev_manager = ev_manager
-        self._ev_manager.register_observer(self)
+        self._ev_manager.register_observer(self, (SlideEvent, QuitEvent))
+
+
+    @property
+    def _field(self) -> np.ndarray:
+        """The gamefield of the GameEnv"""
+        return self._env.field
+
+
+    @_field.setter
+    def _field(self, field: np.ndarray) -> None:
+        self._env.field = field
+
+
+    @property
+    def _highscore(self) -> int:
+        """The score of the GameEnv"""
+        return self._env.score
+
+
+    @_highscore.setter
+    def _highscore(self, highscore: int) -> None:
+        self._env.score = highscore
 
 
     def get_game(self) -> (np.ndarray, int, int):
-        """Returns field, highscore and record highscore"""
+        """Returns field (as tile values), highscore and record highscore"""
         return self._field, self._highscore, self._record_highscore
 
 
+    def get_board(self) -> (np.ndarray, int, int):
+        """Returns the field as uint8 tile exponents (see board.py), highscore and record highscore"""
+        return self._env.exponents, self._highscore, self._record_highscore
+
+
+    def get_target(self) -> int:
+        """Returns the tile that wins the game"""
+        return self._env.target
+
+
+    def legal_moves(self) -> list:
+        """Returns the directions that would change the gamefield, e.g. to
+        grey out the others (see GameEnv.legal_moves).
+
+        Returns
+        -------
+        list
+            The commands of all possible slide actions.
+        """
+        return self._env.legal_moves()
+
+
+    def get_version(self) -> int:
+        """Returns a number that increases with every change of the game,
+        so that views know when to redraw"""
+        return self._env.version
+
+
     def notify(self, event: EventManager) -> None:
         """Handles incoming events
 
@@ -112,32 +190,40 @@ class Model:
                 self._restart()
             else:
                 self._slide(event.data)
+        if isinstance(event, QuitEvent):
+            if self._trace is not None:
+                self._trace.close()
+                self._trace = None
+            if self._autosave is not None:
+                self._autosave.close()
 
 
     def _start_game(self):
-        """Adds the first two randomized tiles to the gamefield."""
+        """Clears the gamefield and adds the first two randomized tiles."""
         db.log(content="model.py -> _start_game was called.")
-        tiles_required = 2
-
-        while tiles_required > 0:
-            self._add_tile()
-            tiles_required -= 1
+        self._env.reset()
 
 
     def _restart(self) -> None:
         """Resets _field and _highscore to play again."""
         db.log(content="model.py -> _restart was called.")
-        self.update_savestate()
+        if self._autosave is None:
+            self.update_savestate()
 
-        loaded_record = db.read_save(self.record_path)
-        if loaded_record[0] is False:
-            self._record_highscore = 0
+            loaded_record = db.read_save(self.record_path)
+            if loaded_record[0] is False:
+                self._record_highscore = 0
+            else:
+                self._record_highscore = loaded_record[0]
         else:
-            self._record_highscore = loaded_record[0]
+            # The autosave thread saves the finished game, with its record, and the new game
+            self._record_highscore = max(self._record_highscore, self._highscore)
 
-        self._field = np.zeros((self._height, self._width))
-        self._highscore = 0
         self._start_game()
+        if self._trace is not None:
+            self._trace.restart(self._env.start_tiles)
+        if self._autosave is not None:
+            self._autosave.restart(self._env.start_tiles)
         self._ev_manager.post(StateEvent(Screen.GAME))
 
 
@@ -150,118 +236,34 @@ class Model:
             A command that determines the direction of slide action.
         """
         db.log(content="model.py -> _slide was called.")
+        self._open_trace()
 
-        def rotation_nr(cmd: Command, reverse: bool) -> int:
-            """Determines how many rotation (counter-clockwise) are necessary
-            to turn the field, so that the direction of cmd is pointing
-            to the left or to reverse the described rotation.
-
-            Parameters
-            ----------
-            cmd: Command
-                A command that determines the number of rotations.
-            reverse : bool
-                Indicates if the rotations process started (False)
-                or if we want to go back to the original state (True)
-
-            Returns
-            -------
-            int
-                The number of rotations.
-            """
-            db.log(content="model.py -> rotation_nr was called.")
-            if cmd is Command.LEFT:
-                return 0
-            if cmd is Command.RIGHT:
-                return 2
-
-            if reverse:
-                if cmd is Command.DOWN:
-                    return 1
-                if cmd is Command.UP:
-                    return 3
-            else:
-                if cmd is Command.DOWN:
-                    return 3
-                if cmd is Command.UP:
-                    return 1
-
-            raise Exception("Wrong command input for model.rotation_nr()")
-
-
-        def move_tiles(field: np.ndarray) -> np.ndarray:
-            """Moves the tiles in a field to the left.
-
-            Attributes
-            ----------
-            field: np.ndarray
-                A gamefield where all tiles should be moved to the left.
-
-            Returns
-            -------
-            np.ndarray
-                A gamefield, in which every tile were moved to the left.
-            """
-            db.log(content="model.py -> move_tiles was called.")
-
-            width = len(field[0])
-            height = len(field)
-
-            for i in range(height):
-                moved = [j for j in field[i] if j != 0]
-                moved += [0 for _ in range(width - len(moved))]
-                field[i] = moved
-            return field
-
-
-        def merge_tiles(field: np.ndarray) -> np.ndarray:
-            """ Merges the tiles in a gamefield and
-            updates the high score accordingly.
-
-            Attributes
-            ----------
-            field: np.ndarray
-                A gamefield, where all tiles should be merged to the left.
-
-            Returns
-            -------
-            np.ndarray
-                A gamefield – every possible merge to the left was executed.
-            """
-            db.log(content="model.py -> merge_tiles was called.")
-
-            width = len(field[0])
-            height = len(field)
-
-            for i in range(height):
-                for j in range(width - 1):
-                    if field[i][j] == field[i][j + 1]:
-                        field[i][j] *= 2
-                        field[i][j + 1] = 0
-                        self._update_highscore(field[i][j])
-
-            return field
-
-        cpy = np.copy(self._field)
-        cpy = np.rot90(cpy, rotation_nr(command, False))
-        cpy = move_tiles(cpy)
-        cpy = merge_tiles(cpy)
-        cpy = move_tiles(cpy)
-        cpy = np.rot90(cpy, rotation_nr(command, True))
-
-        db.log(content=cpy, option=Logging.GAMEFIELD)
-
-        if not np.array_equal(self._field, cpy):
-            self._field = cpy
-            if self._empty_tiles_exist():
-                self._add_tile()
-
-        if self._check_losing(self._field):
+        _, score, lost, info = self._env.step(command)
+
+        if self._trace is not None:
+            self._trace.record(command, info["spawn"], score)
+        if self._autosave is not None and info["changed"]:
+            self._autosave.record(command, info["spawn"], score)
+
+        if lost:
             self._ev_manager.post(StateEvent(Screen.LOSE))
-        if self._check_winning(self._field):
+        if info["won"]:
             self._ev_manager.post(StateEvent(Screen.WIN))
 
 
+    def _open_trace(self) -> None:
+        """Starts the trace file (see trace.py) before the first action, if we
+        log the game. The tile generator gets a new seed before the first
+        action, logged or not, so that a seeded game draws the same tiles in
+        both cases. The seed is stored in the trace, so the recorded game can
+        be repeated."""
+        if self._trace_seed is not None:
+            return
+        self._trace_seed = self._env.reseed()
+        if logging_config.enabled:
+            self._trace = db.create_trace(self._field, self._trace_seed)
+
+
     def _update_highscore(self, add) -> None:
         """Updates the high score.
 
@@ -277,12 +279,7 @@ class Model:
     def _add_tile(self) -> None:
         """Inserts either a new 2- or 4-tile randomly, in an empty tile."""
         db.log(content="model.py -> _add_tile was called.")
-        for this_tile_pos in random.sample(self._update_empty_tiles(), k=1):
-            # There is a 10% chance a tile 4 will be inserted, 90% of a 2
-            if random.random() < 0.1:
-                self._field[this_tile_pos] = 4
-            else:
-                self._field[this_tile_pos] = 2
+        self._env.add_tile()
 
 
     def _update_empty_tiles(self) -> list:
@@ -294,8 +291,7 @@ class Model:
             The set of the current empty tiles.
         """
         db.log(content="model.py -> update_empty_tiles was called.")
-        free_tiles = list(zip(*np.where(self._field == 0)))
-        return free_tiles
+        return self._env.empty_tiles()
 
 
     def _empty_tiles_exist(self) -> bool:
@@ -307,17 +303,17 @@ class Model:
             True, if we still have an empty tile in the gamefield.
         """
         db.log(content="model.py -> _empty_tiles_exist was called.")
-        return len(self._update_empty_tiles()) > 0
+        return self._env.empty_count() > 0
 
 
-    def _check_losing(self, field: np.ndarray) -> bool:
+    def _check_losing(self, field=None) -> bool:
         """Checks if the player is still capable of playing the game
         in its current state. If not, then the player lost.
 
         Parameter
         ---------
         _field: np.ndarray
-            A matrix of the current tiles in the game.
+            A matrix of the tiles to check (default: the current game).
 
         Returns
         -------
@@ -325,53 +321,31 @@ class Model:
             True, if the player lost the _game.
         """
         db.log(content="model.py -> _check_losing was called.")
-        if self._empty_tiles_exist():
-            return False
-
-        # checks if matching tiles are next to each other
-        width = len(field[0])
-        height = len(field)
-        tile = False
-        for i in range(height):
-            for j in range(width):
-                if i < height-1 and field[i][j] == field[i+1][j]:
-                    tile = True
-                    break
-                if j < width-1 and field[i][j] == field[i][j+1]:
-                    tile = True
-                    break
-
-        return not tile
-
-
-    @staticmethod
-    def _check_winning(field: np.ndarray) -> bool:
+        if field is None:
+            return not self._empty_tiles_exist() and not self.legal_moves()
+        return GameEnv.check_losing(field)
+
+
+    def _check_winning(self, field=None) -> bool:
         """Checks if the player won the game.
 
         Parameter
         ---------
         _field: np.ndarray
-            A matrix of the current tiles in the game.
+            A matrix of the tiles to check (default: the current game,
+            whose largest tile is tracked).
 
         Returns
         -------
         bool
-            True, if the gamefield has a 2048-tile.
+            True, if the gamefield has a tile of at least the target tile.
         """
         db.log(content="model.py -> _check_winning was called.")
-
-        width = len(field[0])
-        height = len(field)
-
-        win = False
-        for i in range(height):
-            for j in range(width):
-                if field[i][j] == 2048:
-                    win = True
-                    break
-        return win
+        if field is None:
+            return self._env.won()
+        return GameEnv.check_winning(field, self._env.target)
 
 
     def update_savestate(self) -> None:
         """Update the save file for the current gamefield and highscore"""
-        db.create_save(matrix=self._field, current_highscore=self._highscore)
+        db.create_save(matrix=None, current_highscore=self._highscore, board=self._env.exponents)
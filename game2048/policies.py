@@ -0,0 +1,51 @@
+"""This file implements simple automatic players for the headless game
+
+A policy is a function that gets a GameEnv and a random number generator
+and returns the next slide command. It is only asked while the game isn't
+lost, so there is always at least one legal move.
+"""
+
+import random
+import numpy as np
+from .arguments import Command
+from .game_env import GameEnv
+from .search import Expectimax
+
+
+def random_policy(env: GameEnv, rng: random.Random) -> Command:
+    """Chooses one of the legal moves at random"""
+    return rng.choice(env.legal_moves())
+
+
+def greedy_policy(env: GameEnv, rng: random.Random) -> Command:
+    """Chooses the legal move with the most points, then with the most
+    empty tiles left. Remaining ties are broken at random."""
+    best_value = None
+    best_moves = []
+    for command in env.legal_moves():
+        field, points, _ = env.preview(command)
+        value = (points, np.count_nonzero(field == 0))
+        if best_value is None or value > best_value:
+            best_value = value
+            best_moves = [command]
+        elif value == best_value:
+            best_moves.append(command)
+    return rng.choice(best_moves)
+
+
+def expectimax_policy(env: GameEnv, rng: random.Random, depth=2) -> Command:
+    """Chooses the move with the best expected outcome, looking 'depth'
+    moves ahead (see search.py). Other board sizes than 4x4 play greedy.
+
+    The search has no time budget, so simulations stay reproducible.
+    """
+    if env.board is None:
+        return greedy_policy(env, rng)
+    return Expectimax(time_budget=None, max_depth=depth).best_move(env.board)
+
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "expectimax": expectimax_policy,
+}
@@ -0,0 +1,143 @@
+"""This file implements the replay of recorded games
+
+A Replay re-runs the actions of a trace (see trace.py) with the slide rules
+of GameEnv. When the trace is opened, it is replayed once and a copy of the
+gamefield and the score is kept every 'checkpoint_interval' actions, so
+jumping to any action only replays the actions since the closest checkpoint.
+"""
+
+import numpy as np
+from .arguments import Command, DIRECTIONS
+from .game_env import GameEnv
+from .trace import TraceReader, apply_record
+
+
+class Replay:
+    """This class implements a seekable replay of a trace file.
+
+    Attributes
+    ----------
+    _reader : TraceReader
+        The trace that is replayed.
+    _interval : int
+        The number of actions between two checkpoints.
+    _checkpoints : list
+        The gamefield and the score after 0, _interval, 2 * _interval, ...
+        actions.
+    """
+
+    def __init__(self, trace, checkpoint_interval=256):
+        """
+        Constructor of class Replay.
+
+        Parameters
+        ----------
+        trace
+            A TraceReader or the path of a trace file.
+        checkpoint_interval : int
+            The number of actions between two checkpoints.
+        """
+        self._reader = trace if isinstance(trace, TraceReader) else TraceReader(trace)
+        self._interval = checkpoint_interval
+        self._checkpoints = [(np.copy(self._reader.field), 0)]
+        self._create_checkpoints()
+
+
+    def __len__(self) -> int:
+        """The number of recorded actions"""
+        return len(self._reader)
+
+
+    def _create_checkpoints(self) -> None:
+        """Replays the whole trace once and keeps every checkpoint"""
+        env = self._env_at_checkpoint(0)
+        for number, record in enumerate(self._reader, 1):
+            apply_record(env, record)
+            if number % self._interval == 0:
+                self._checkpoints.append((np.copy(env.field), env.score))
+
+
+    def _env_at_checkpoint(self, index: int) -> GameEnv:
+        """Returns a GameEnv in the state of a checkpoint"""
+        field, score = self._checkpoints[index]
+        env = GameEnv(self._reader.height, self._reader.width, seed=0)
+        env.field = np.copy(field)
+        env.score = score
+        return env
+
+
+    def frames(self, start=0):
+        """Replays the trace lazily from a given action on.
+
+        Parameters
+        ----------
+        start : int
+            The number of actions that are skipped (by seeking).
+
+        Yields
+        ------
+        tuple
+            The gamefield, the score and the command of every action.
+        """
+        checkpoint = min(start // self._interval, len(self._checkpoints) - 1)
+        env = self._env_at_checkpoint(checkpoint)
+        number = checkpoint * self._interval
+
+        for record in self._reader.records(number):
+            apply_record(env, record)
+            number += 1
+            if number > start:
+                yield np.copy(env.field), env.score, record.command
+
+
+    def seek(self, index: int) -> (np.ndarray, int):
+        """Returns the gamefield and the score after the first 'index' actions.
+
+        Parameters
+        ----------
+        index : int
+            The number of actions.
+        """
+        if not 0 <= index <= len(self):
+            raise IndexError(f"the trace has {len(self)} actions, not {index}")
+        if index == 0:
+            field, score = self._checkpoints[0]
+            return np.copy(field), score
+        field, score, _ = next(self.frames(index - 1))
+        return field, score
+
+
+    def verify(self) -> int:
+        """Checks, whether the recorded game can be repeated with its seed.
+
+        The tiles are drawn again with a generator seeded like the recorded
+        game and compared with the recorded tiles.
+
+        Returns
+        -------
+        int
+            The index of the first action with a different new tile or None,
+            if the whole game was repeated.
+        """
+        if self._reader.seed is None:
+            return 0
+
+        env = GameEnv(self._reader.height, self._reader.width, seed=self._reader.seed)
+        env.field = np.copy(self._reader.field)
+        for number, record in enumerate(self._reader):
+            spawn = None
+            if record.command is Command.RESTART:
+                env.field = np.zeros(env.field.shape)
+                env.score = 0
+            elif record.command is Command.START:
+                spawn = env.add_tile()
+            elif record.command in DIRECTIONS:
+                changed, _ = env.slide(record.command)
+                if changed and env.empty_count():
+                    spawn = env.add_tile()
+
+            expected = None if record.spawn is None else (tuple(record.spawn), record.value)
+            found = None if spawn is None else (tuple(int(i) for i in spawn[0]), spawn[1])
+            if found != expected:
+                return number
+        return None
@@ -0,0 +1,268 @@
+"""This file implements an expectimax search for the best slide action
+
+The search works on packed 4x4 boards (see bitboard.py). Boards are rated
+with a heuristic that is precomputed for every possible row, like the
+slide tables. Other board sizes are played greedy.
+"""
+
+import time
+from collections import OrderedDict
+import numpy as np
+from .arguments import Command, DIRECTIONS
+from .game_env import slide_batch
+from . import bitboard
+
+# Weights of the row heuristic
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+
+def _build_heuristic_table() -> list:
+    """Rates every possible row: empty tiles, possible merges and
+    monotone rows are good, many big tiles are bad.
+
+    Returns
+    -------
+    list
+        The rating of every row, indexed by the 16-bit row value.
+    """
+    rows = np.arange(bitboard.ROW_MASK + 1, dtype=np.int64)
+    cells = ((rows[:, None] >> (4 * np.arange(bitboard.SIZE))) & 0xF).astype(np.float64)
+
+    empty = (cells == 0).sum(axis=1)
+    tiles_sum = (cells ** SUM_POWER).sum(axis=1)
+
+    # Equal neighbours, ignoring empty tiles in between
+    merges = np.zeros(len(rows))
+    previous = np.zeros(len(rows))
+    counter = np.zeros(len(rows))
+    for j in range(bitboard.SIZE):
+        rank = cells[:, j]
+        filled = rank != 0
+        same = filled & (rank == previous)
+        counter = np.where(same, counter + 1, counter)
+        ended = filled & ~same & (counter > 0)
+        merges = np.where(ended, merges + 1 + counter, merges)
+        counter = np.where(ended, 0, counter)
+        previous = np.where(filled, rank, previous)
+    merges = merges + np.where(counter > 0, 1 + counter, 0)
+
+    powered = cells ** MONOTONICITY_POWER
+    falling = powered[:, :-1] - powered[:, 1:]
+    monotonicity_left = np.where(cells[:, :-1] > cells[:, 1:], falling, 0).sum(axis=1)
+    monotonicity_right = np.where(cells[:, :-1] > cells[:, 1:], 0, -falling).sum(axis=1)
+
+    table = (LOST_PENALTY + EMPTY_WEIGHT * empty + MERGES_WEIGHT * merges
+             - MONOTONICITY_WEIGHT * np.minimum(monotonicity_left, monotonicity_right)
+             - SUM_WEIGHT * tiles_sum)
+    return table.tolist()
+
+
+ROW_HEURISTIC = _build_heuristic_table()
+
+
+def evaluate(board: int) -> float:
+    """Rates a packed board by its rows and columns"""
+    columns = bitboard.transpose(board)
+    return (ROW_HEURISTIC[board & 0xFFFF] + ROW_HEURISTIC[(board >> 16) & 0xFFFF]
+            + ROW_HEURISTIC[(board >> 32) & 0xFFFF] + ROW_HEURISTIC[(board >> 48) & 0xFFFF]
+            + ROW_HEURISTIC[columns & 0xFFFF] + ROW_HEURISTIC[(columns >> 16) & 0xFFFF]
+            + ROW_HEURISTIC[(columns >> 32) & 0xFFFF] + ROW_HEURISTIC[(columns >> 48) & 0xFFFF])
+
+
+class _Timeout(Exception):
+    """Raised inside the search, when the time budget is used up."""
+
+
+class Expectimax:
+    """This class implements a depth-limited expectimax search.
+
+    Max nodes choose the best slide action, chance nodes average over all
+    possible new tiles (2 with 90%, 4 with 10%). The search deepens one move
+    at a time until the time budget is used up and returns the best move of
+    the deepest finished search.
+
+    Attributes
+    ----------
+    _time_budget : float
+        Seconds per decision or None for a search of exactly _max_depth.
+    _max_depth : int
+        The maximum number of own moves to look ahead.
+    _probability_cutoff : float
+        Chance nodes, that are less likely to be reached, are rated by the
+        heuristic instead of being searched.
+    _table : OrderedDict
+        Transposition table: board -> (depth, value, best move), in order
+        of their last use, so the least recently used entry is evicted first.
+    _table_size : int
+        The maximum number of entries of the transposition table.
+    last_depth : int
+        The depth of the last finished search.
+    last_latency : float
+        The duration of the last decision in seconds.
+    """
+
+    def __init__(self, time_budget=0.01, max_depth=8, probability_cutoff=0.0001, table_size=200000):
+        """Constructor of class Expectimax.
+
+        Parameters
+        ----------
+        time_budget : float
+            Seconds per decision or None for a search of exactly max_depth.
+        max_depth : int
+            The maximum number of own moves to look ahead.
+        probability_cutoff : float
+            Don't search chance nodes that are less likely to be reached.
+        table_size : int
+            The maximum number of entries of the transposition table.
+        """
+        self._time_budget = time_budget
+        self._max_depth = max_depth
+        self._probability_cutoff = probability_cutoff
+        self._table = OrderedDict()
+        self._table_size = table_size
+        self._deadline = None
+        self.last_depth = 0
+        self.last_latency = 0.0
+
+
+    def choose(self, exponents: np.ndarray) -> Command:
+        """Returns the best slide action for a gamefield or None, if there is none.
+
+        Parameters
+        ----------
+        exponents : np.ndarray
+            A matrix of the tile exponents of the game (see Model.get_board).
+        """
+        exponents = np.asarray(exponents)
+        # Tiles from 2^15 on could merge beyond the 4-bit range of a bitboard
+        if exponents.shape == (bitboard.SIZE, bitboard.SIZE) and exponents.max() < bitboard.MAX_EXPONENT:
+            return self.best_move(bitboard.encode_exponents(exponents))
+
+        # Other sizes: the move with the most points, then the most empty tiles
+        best = None
+        best_value = None
+        for command in DIRECTIONS:
+            boards, points, changed = slide_batch(exponents[np.newaxis], command, exponents=True)
+            value = (points[0], np.count_nonzero(boards[0] == 0))
+            if changed[0] and (best_value is None or value > best_value):
+                best, best_value = command, value
+        return best
+
+
+    def best_move(self, board: int) -> Command:
+        """Searches the best slide action for a packed board.
+
+        Parameters
+        ----------
+        board : int
+            The packed board.
+
+        Returns
+        -------
+        Command
+            The best slide action or None, if no slide changes the board.
+        """
+        start = time.perf_counter()
+        if self._time_budget is None:
+            self._deadline = None
+        else:
+            self._deadline = start + self._time_budget
+
+        best = None
+        depth = 1
+        try:
+            while depth <= self._max_depth:
+                value, move = self._max_node(board, depth, 1.0)
+                if move is None:
+                    break
+                best = move
+                self.last_depth = depth
+                depth += 1
+        except _Timeout:
+            pass
+
+        if best is None:
+            # Not even the shallowest search finished in time
+            moves = bitboard.legal_moves(board)
+            best = moves[0] if moves else None
+        self.last_latency = time.perf_counter() - start
+        return best
+
+
+    def _max_node(self, board: int, depth: int, probability: float) -> (float, Command):
+        """Returns the value of the best slide action and the action itself.
+
+        Parameters
+        ----------
+        board : int
+            The packed board.
+        depth : int
+            The number of own moves that are still searched.
+        probability : float
+            The probability to reach this board.
+        """
+        entry = self._table.get(board)
+        if entry is not None:
+            self._table.move_to_end(board)
+            if entry[0] >= depth:
+                return entry[1], entry[2]
+
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _Timeout()
+
+        # Search the best move of an earlier search first
+        moves = list(DIRECTIONS)
+        if entry is not None and entry[2] is not None:
+            moves.remove(entry[2])
+            moves.insert(0, entry[2])
+
+        best_value = 0.0
+        best_move = None
+        for command in moves:
+            try:
+                result, _ = bitboard.slide(board, command)
+            except OverflowError:
+                # A 65536 tile can't be searched on a packed board
+                continue
+            if result == board:
+                continue
+            value = self._chance_node(result, depth - 1, probability)
+            if best_move is None or value > best_value:
+                best_value = value
+                best_move = command
+
+        self._table[board] = (depth, best_value, best_move)
+        if len(self._table) > self._table_size:
+            self._table.popitem(last=False)
+        return best_value, best_move
+
+
+    def _chance_node(self, board: int, depth: int, probability: float) -> float:
+        """Returns the expected value over all possible new tiles.
+
+        Parameters
+        ----------
+        board : int
+            The packed board after a slide action.
+        depth : int
+            The number of own moves that are still searched.
+        probability : float
+            The probability to reach this board.
+        """
+        if depth == 0 or probability < self._probability_cutoff:
+            return evaluate(board)
+
+        empty = bitboard.empty_cells(board)
+        probability /= len(empty)
+        total = 0.0
+        for row, column in empty:
+            shift = 4 * (bitboard.SIZE * row + column)
+            total += 0.9 * self._max_node(board | (1 << shift), depth, probability * 0.9)[0]
+            total += 0.1 * self._max_node(board | (2 << shift), depth, probability * 0.1)[0]
+        return total / len(empty)
@@ -0,0 +1,173 @@
+"""This file implements the self-play runner for headless games
+
+Games are spread over worker processes. Every game gets its own seed,
+derived from one base seed, so a run can be repeated exactly no matter how
+many workers are used or in which order the games finish.
+"""
+
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from .game_env import GameEnv
+from .policies import POLICIES
+
+
+def game_seeds(base_seed: int, games: int) -> list:
+    """Derives independent seeds for the game and the policy of every game.
+
+    Parameters
+    ----------
+    base_seed: int
+        The seed of the whole run.
+    games: int
+        The number of games.
+
+    Returns
+    -------
+    list
+        One (game seed, policy seed) tuple per game.
+    """
+    children = np.random.SeedSequence(base_seed).spawn(games)
+    return [tuple(int(n) for n in child.generate_state(2)) for child in children]
+
+
+def play_game(policy: str, game_seed: int, policy_seed: int, height=4, width=4) -> dict:
+    """Plays one game until it is lost.
+
+    Parameters
+    ----------
+    policy: str
+        The name of a policy from policies.POLICIES.
+    game_seed: int
+        Seed for the new tiles.
+    policy_seed: int
+        Seed for the random decisions of the policy.
+    height: int
+        The number of rows.
+    width: int
+        The number of columns.
+
+    Returns
+    -------
+    dict
+        The score, max tile, number of moves and wall time of the game.
+    """
+    choose = POLICIES[policy]
+    policy_rng = random.Random(policy_seed)
+    env = GameEnv(height, width, seed=game_seed)
+    env.reset()
+
+    start = time.perf_counter()
+    moves = 0
+    done = not env.legal_moves()
+    while not done:
+        _, _, done, _ = env.step(choose(env, policy_rng))
+        moves += 1
+
+    return {"seed": game_seed,
+            "score": int(env.score),
+            "max_tile": int(env.field.max()),
+            "moves": moves,
+            "time": time.perf_counter() - start}
+
+
+def simulate(games: int, workers: int, policy: str, seed=0, height=4, width=4):
+    """Plays games in worker processes and yields each result when it is done.
+
+    Parameters
+    ----------
+    games: int
+        The number of games.
+    workers: int
+        The number of worker processes.
+    policy: str
+        The name of a policy from policies.POLICIES.
+    seed: int
+        The seed of the whole run.
+    height: int
+        The number of rows.
+    width: int
+        The number of columns.
+
+    Yields
+    ------
+    dict
+        The result of play_game(), with the number of the game as 'game'.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}', choose from {', '.join(POLICIES)}")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(play_game, policy, game_seed, policy_seed, height, width): number
+                   for number, (game_seed, policy_seed) in enumerate(game_seeds(seed, games))}
+        for future in as_completed(futures):
+            result = future.result()
+            result["game"] = futures[future]
+            yield result
+
+
+def summarize(results: list, wall_time: float) -> dict:
+    """Aggregates the results of a run.
+
+    Parameters
+    ----------
+    results: list
+        The dictionaries of play_game().
+    wall_time: float
+        The duration of the whole run in seconds.
+
+    Returns
+    -------
+    dict
+        Score statistics, how often each max tile was reached and throughput.
+    """
+    scores = [result["score"] for result in results]
+    moves = sum(result["moves"] for result in results)
+    max_tiles = {}
+    for result in results:
+        max_tiles[result["max_tile"]] = max_tiles.get(result["max_tile"], 0) + 1
+
+    return {"games": len(results),
+            "score_mean": statistics.mean(scores) if scores else 0,
+            "score_median": statistics.median(scores) if scores else 0,
+            "score_max": max(scores, default=0),
+            "max_tiles": dict(sorted(max_tiles.items())),
+            "moves": moves,
+            "moves_per_game": moves / len(results) if results else 0,
+            "wall_time": wall_time,
+            "moves_per_second": moves / wall_time if wall_time > 0 else 0}
+
+
+def run(games: int, workers: int, policy: str, seed=0, height=4, width=4, summary_path=None) -> dict:
+    """Runs a simulation, prints every game and a summary at the end.
+
+    Parameters
+    ----------
+    summary_path: str
+        If given, the summary is also written to this JSON file.
+
+    (The other parameters are the same as for simulate().)
+
+    Returns
+    -------
+    dict
+        The summary of the run.
+    """
+    start = time.perf_counter()
+    results = []
+    for result in simulate(games, workers, policy, seed, height, width):
+        results.append(result)
+        print(f"game {result['game']:>5}: score {result['score']:>7}  max tile {result['max_tile']:>5}  "
+              f"moves {result['moves']:>5}  time {result['time']:.3f} s", flush=True)
+
+    summary = summarize(results, time.perf_counter() - start)
+    summary.update({"policy": policy, "seed": seed, "workers": workers})
+    print(json.dumps(summary, indent=4))
+
+    if summary_path is not None:
+        with open(summary_path, "w") as file:
+            file.write(json.dumps(summary, indent=4))
+    return summary
@@ -0,0 +1,96 @@
+"""This file implements the broadcast of a running game to spectators
+
+SpectatorBroadcast observes the EventManager and sends the tiles that
+changed by a slide action to every subscribed connection of
+ControllerRemote (see controller/protocol.py). A subscriber only buffers a
+limited number of bytes; a spectator that can't keep up is dropped, so it
+never slows down the game.
+"""
+
+from threading import Lock
+import numpy as np
+from .event_manager import EventManager, SlideEvent, Event
+from .controller.protocol import encode_board, encode_delta
+from .model import Model
+
+
+class SpectatorBroadcast:
+    """This class implements the observer, that sends board deltas to spectators.
+
+    It has to be registered after the Model, so that the Model has
+    performed a slide action, when the broadcast is notified of it.
+
+    Attributes
+    ----------
+    _game : Model
+        The watched game.
+    _subscribers : list
+        Objects with push(message) -> bool, which returns False, if the
+        subscriber is gone or too slow.
+    _last_field : np.ndarray
+        The board of tile exponents that was sent last.
+    _last_score : int
+        The score that was sent last.
+    """
+
+    def __init__(self, ev_manager: EventManager, game: Model):
+        """
+        Constructor of class SpectatorBroadcast.
+
+        Parameters
+        ----------
+        ev_manager : EventManager
+            controls communication with other modules
+        game : Model
+            Reference to the model instance
+        """
+        self._game = game
+        self._subscribers = []
+        self._lock = Lock()
+        self._last_field = None
+        self._last_score = None
+        ev_manager.register_observer(self, (SlideEvent,))
+
+
+    def __len__(self) -> int:
+        """The number of subscribers"""
+        return len(self._subscribers)
+
+
+    def subscribe(self, subscriber) -> None:
+        """
+        Adds a spectator and sends it the whole board.
+
+        Parameters
+        ----------
+        subscriber
+            An object with push(message: bytes) -> bool.
+        """
+        field, score, _ = self._game.get_board()
+        with self._lock:
+            if subscriber.push(encode_board(field, score)):
+                self._subscribers.append(subscriber)
+
+
+    def notify(self, event: Event) -> None:
+        """Sends the changes of a slide action to all spectators"""
+        if isinstance(event, SlideEvent):
+            self.broadcast()
+
+
+    def broadcast(self) -> None:
+        """Sends the changes since the last broadcast to all spectators."""
+        field, score, _ = self._game.get_board()
+        if self._last_field is None or np.shape(field) != np.shape(self._last_field):
+            message = encode_board(field, score)
+        else:
+            cells = np.argwhere(field != self._last_field)
+            if len(cells) == 0 and score == self._last_score:
+                return
+            message = encode_delta(field, cells, score)
+        self._last_field = np.array(field)
+        self._last_score = score
+
+        with self._lock:
+            self._subscribers = [subscriber for subscriber in self._subscribers
+                                 if subscriber.push(message)]
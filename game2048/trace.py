@@ -0,0 +1,250 @@
+"""This file implements a compact binary trace of played games
+
+A trace file starts with a header (board size, seed of the tile generator
+and the gamefield the recording started with, one exponent byte per tile)
+and continues with one fixed-width record per action:
+
+    command        1 byte   (Command value)
+    spawn position 4 bytes  (row * width + column, NO_SPAWN if none)
+    spawn value    1 byte   (exponent of the new tile, 0 if none)
+    score delta    8 bytes  (points scored by the action)
+
+A Command.RESTART record clears the gamefield and the score and is
+followed by one Command.START record per tile of the new game. Records are
+only appended, so a trace can be read while it is still being written.
+"""
+
+import os
+import struct
+from collections import namedtuple
+import numpy as np
+from .arguments import Command, DIRECTIONS
+from .board import DTYPE, to_exponents, to_values
+from .game_env import GameEnv
+
+MAGIC = b"G2048T"
+VERSION = 1
+NO_SPAWN = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<6sBBHHQ")
+_RECORD = struct.Struct("<BIBQ")
+_SEED_KNOWN = 1
+
+TraceRecord = namedtuple("TraceRecord", ["command", "spawn", "value", "score"])
+TraceRecord.__doc__ = """One action of a trace: command, spawn position (or None),
+value of the new tile (or 0) and the points scored."""
+
+
+def encode_record(width: int, command: Command, spawn=None, score=0) -> bytes:
+    """
+    Packs one action into a record.
+
+    Parameters
+    ----------
+    width : int
+        The number of columns of the gamefield.
+    command : Command
+        The executed command.
+    spawn : tuple
+        The position and the value of the new tile or None.
+    score : int
+        The points scored by the action.
+    """
+    if spawn is None:
+        position, exponent = NO_SPAWN, 0
+    else:
+        (row, column), value = spawn
+        position, exponent = row * width + column, int(value).bit_length() - 1
+    return _RECORD.pack(command.value, position, exponent, int(score))
+
+
+def decode_records(data: bytes, width: int):
+    """Yields the TraceRecords of packed records, skipping an incomplete last record"""
+    usable = len(data) - len(data) % _RECORD.size
+    for command, position, exponent, score in _RECORD.iter_unpack(data[:usable]):
+        spawn = None if position == NO_SPAWN else divmod(position, width)
+        yield TraceRecord(Command(command), spawn, 1 << exponent if exponent else 0, score)
+
+
+def _exponents(field: np.ndarray) -> bytes:
+    """Converts a gamefield into one exponent byte per tile (see board.py)"""
+    return to_exponents(field).tobytes()
+
+
+class TraceWriter:
+    """This class implements the recording of a game into a trace file."""
+
+    def __init__(self, path, field: np.ndarray, seed=None):
+        """
+        Constructor of class TraceWriter. Writes the header.
+
+        Parameters
+        ----------
+        path
+            The path of the new trace file.
+        field : np.ndarray
+            The gamefield the recording starts with.
+        seed : int
+            The seed of the tile generator, if known.
+        """
+        height, width = np.shape(field)
+        self._width = width
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, _SEED_KNOWN if seed is not None else 0,
+                                      height, width, seed or 0))
+        self._file.write(_exponents(field))
+
+
+    def record(self, command: Command, spawn=None, score=0) -> None:
+        """
+        Appends one action.
+
+        Parameters
+        ----------
+        command : Command
+            The executed command.
+        spawn : tuple
+            The position and the value of the new tile or None.
+        score : int
+            The points scored by the action.
+        """
+        self._file.write(encode_record(self._width, command, spawn, score))
+
+
+    def restart(self, spawns: list) -> None:
+        """
+        Records the start of a new game.
+
+        Parameters
+        ----------
+        spawns : list
+            The positions and values of the first tiles of the new game, in
+            the order they were drawn (see GameEnv.start_tiles), so that the
+            game can be repeated with its seed.
+        """
+        self.record(Command.RESTART)
+        for spawn in spawns:
+            self.record(Command.START, spawn)
+        self._file.flush()
+
+
+    def flush(self) -> None:
+        """Writes buffered records to the file."""
+        self._file.flush()
+
+
+    def close(self) -> None:
+        """Closes the trace file."""
+        self._file.close()
+
+
+class TraceReader:
+    """This class implements the streaming of a trace file.
+
+    Attributes
+    ----------
+    height : int
+        The number of rows.
+    width : int
+        The number of columns.
+    seed : int
+        The seed of the tile generator or None, if unknown.
+    field : np.ndarray
+        The gamefield the recording started with.
+    """
+
+    def __init__(self, path):
+        """
+        Constructor of class TraceReader. Reads the header.
+
+        Parameters
+        ----------
+        path
+            The path of the trace file.
+        """
+        self._path = path
+        with open(path, "rb") as file:
+            magic, version, flags, height, width, seed = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a trace file of version {VERSION}")
+            exponents = np.frombuffer(file.read(height * width), dtype=DTYPE)
+
+        self.height = height
+        self.width = width
+        self.seed = seed if flags & _SEED_KNOWN else None
+        self.field = to_values(exponents).reshape(height, width)
+        self._offset = _HEADER.size + height * width
+
+
+    def __len__(self) -> int:
+        """The number of complete records in the file"""
+        return (os.path.getsize(self._path) - self._offset) // _RECORD.size
+
+
+    def __iter__(self):
+        """Yields every TraceRecord"""
+        return self.records()
+
+
+    def records(self, start=0):
+        """Yields the TraceRecords from the action 'start' on, reading the file in chunks.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first record. Records have a fixed width, so
+            the file is read from there on.
+        """
+        chunk_size = _RECORD.size * 4096
+        with open(self._path, "rb") as file:
+            file.seek(self._offset + start * _RECORD.size)
+            while True:
+                chunk = file.read(chunk_size)
+                # An incomplete last record of a trace that is still written is skipped
+                yield from decode_records(chunk, self.width)
+                if len(chunk) < chunk_size:
+                    return
+
+
+    def states(self):
+        """Reconstructs the game action by action.
+
+        Yields
+        ------
+        tuple
+            The gamefield and the score after an action and its TraceRecord.
+        """
+        env = GameEnv(self.height, self.width, seed=0)
+        env.field = np.copy(self.field)
+        for record in self:
+            apply_record(env, record)
+            yield np.copy(env.field), env.score, record
+
+
+    def state_at(self, index: int) -> (np.ndarray, int):
+        """Returns the gamefield and the score after the first 'index' actions."""
+        if index == 0:
+            return np.copy(self.field), 0
+        for number, (field, score, _) in enumerate(self.states(), 1):
+            if number == index:
+                return field, score
+        raise IndexError(f"the trace has less than {index} actions")
+
+
+def apply_record(env: GameEnv, record: TraceRecord) -> None:
+    """Performs a recorded action on a GameEnv.
+
+    Parameters
+    ----------
+    env : GameEnv
+        The game that is reconstructed.
+    record : TraceRecord
+        The recorded action.
+    """
+    if record.command is Command.RESTART:
+        env.field = np.zeros(env.field.shape)
+        env.score = 0
+    elif record.command in DIRECTIONS:
+        env.slide(record.command)
+    if record.spawn is not None:
+        env.put_tile(record.spawn, record.value)
@@ -0,0 +1,108 @@
+"""This file implements the measurement of the frames of the views
+
+Every frame of InterfaceView._run is split into the time to draw, the time
+the frame started after its slot, the time to ask the controllers for
+input and the number of events that wait for the event thread. The last
+frames are kept in a ring buffer of fixed size.
+"""
+
+import csv
+import numpy as np
+
+FIELDS = ("draw", "overshoot", "poll", "queue")
+
+
+class FrameTimer:
+    """This class implements a ring buffer of frame timings.
+
+    Attributes
+    ----------
+    _buffer : np.ndarray
+        One row per frame: draw time, overshoot and poll time in seconds,
+        and the length of the event queue.
+    _count : int
+        The number of recorded frames, including overwritten ones.
+    """
+
+    def __init__(self, size=3600):
+        """
+        Constructor of class FrameTimer.
+
+        Parameters
+        ----------
+        size : int
+            The number of frames that are kept (default: one minute at 60 fps).
+        """
+        self._buffer = np.zeros((size, len(FIELDS)))
+        self._count = 0
+
+
+    def __len__(self) -> int:
+        """The number of kept frames"""
+        return min(self._count, len(self._buffer))
+
+
+    def record(self, draw: float, overshoot: float, poll: float, queue: int) -> None:
+        """
+        Stores the timings of a frame, overwriting the oldest one.
+
+        Parameters
+        ----------
+        draw : float
+            Seconds to draw the frame.
+        overshoot : float
+            Seconds the frame started after its slot.
+        poll : float
+            Seconds to poll the controllers for input.
+        queue : int
+            The number of events in the event queue.
+        """
+        self._buffer[self._count % len(self._buffer)] = (draw, overshoot, poll, queue)
+        self._count += 1
+
+
+    def samples(self) -> np.ndarray:
+        """Returns the kept frames from the oldest to the newest, one row per frame"""
+        if self._count <= len(self._buffer):
+            return self._buffer[:self._count].copy()
+        return np.roll(self._buffer, -(self._count % len(self._buffer)), axis=0)
+
+
+    def percentiles(self, percents=(50, 95, 99)) -> dict:
+        """
+        Computes percentiles of every measured value.
+
+        Parameters
+        ----------
+        percents : tuple
+            The percentiles that are computed.
+
+        Returns
+        -------
+        dict
+            Field name -> {'p50': ..., 'p95': ..., 'p99': ...}, empty if no
+            frame was recorded.
+        """
+        samples = self.samples()
+        if len(samples) == 0:
+            return {}
+        values = np.percentile(samples, percents, axis=0)
+        return {field: {f"p{percent}": float(values[i, column]) for i, percent in enumerate(percents)}
+                for column, field in enumerate(FIELDS)}
+
+
+    def dump_csv(self, path) -> None:
+        """
+        Writes the kept frames into a CSV file.
+
+        Parameters
+        ----------
+        path
+            The path of the CSV file.
+        """
+        first = self._count - len(self)
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("frame",) + FIELDS)
+            for number, row in enumerate(self.samples(), first):
+                writer.writerow([number] + row[:-1].tolist() + [int(row[-1])])
@@ -6,7 +6,10 @@ import numpy as np
 from ..event_manager import Event, StateEvent, QuitEvent, StartEvent, InputRequest, EventManager
 from ..model import Model
 from ..arguments import Screen
+from ..board import to_values
 from ..database import Database
+from .stimulus import StimulusScheduler
+from .frame_timing import FrameTimer
 
 db = Database()
 
@@ -14,7 +17,7 @@ db = Database()
 class InterfaceView(ABC):
     """Implements the view of our 2048 game."""
 
-    def __init__(self, ev_manager: EventManager, game: Model):
+    def __init__(self, ev_manager: EventManager, game: Model, timing_path=None):
         """Constructs the shell output window
 
         Parameters
@@ -23,13 +26,24 @@ class InterfaceView(ABC):
             controls communication with other modules
         game: Model
             Reference to the model instance
+        timing_path: str
+            CSV file for the timings of the last frames, written on quit (default: none)
         """
-        ev_manager.register_observer(self)
+        # InputRequests come from the view itself, so it doesn't need them
+        ev_manager.register_observer(self, (QuitEvent, StateEvent, StartEvent))
         self._ev_manager = ev_manager
         self._game_state = Screen.INSTRUCTIONS
         self._game = game
         self._running = True
         self._fps = 60
+        self._scheduler = StimulusScheduler(self._fps)
+        self._timer = FrameTimer()
+        self._timing_path = timing_path
+
+        # What is on the screen: redraw only if one of them changes
+        self._drawn_screen = None
+        self._drawn_version = None
+        self._drawn_field = None
 
     def notify(self, event: Event) -> None:
         """
@@ -47,10 +61,36 @@ class InterfaceView(ABC):
         if isinstance(event, StateEvent):
             self._game_state = event.data
         if isinstance(event, StartEvent):
-            self._run()
+            if self._ev_manager.uses_asyncio:
+                self._ev_manager.add_task(self._run_async)
+            else:
+                self._run()
 
     def _draw(self) -> None:
-        """Outputs the current Screen"""
+        """Outputs the current Screen, but only the parts that changed since the last frame.
+
+        A new state or a new screen size redraws everything. During the game
+        only the tiles that differ from the drawn field and the score are
+        redrawn, after the model reported a change by its version.
+        """
+        # The version is read first: a change in between is drawn in the next frame
+        version = self._game.get_version()
+        field, score, record = self._game.get_board()
+        screen = (self._game_state, self._screen_key())
+
+        if screen != self._drawn_screen or np.shape(field) != np.shape(self._drawn_field):
+            self._drawn_screen = screen
+            self._redraw()
+        elif self._game_state == Screen.GAME and version != self._drawn_version:
+            changed = np.argwhere(field != self._drawn_field)
+            self._update_game(field, score, record, [tuple(cell) for cell in changed])
+        self._drawn_version = version
+        self._drawn_field = np.array(field)
+
+        self._animate()
+
+    def _redraw(self) -> None:
+        """Outputs the whole current Screen"""
         if self._game_state == Screen.INSTRUCTIONS:
             self._print_instructions()
         elif self._game_state == Screen.GAME:
@@ -63,16 +103,75 @@ class InterfaceView(ABC):
     def _run(self) -> None:
         """Main game loop runs with fps speed"""
         db.log(content="interface_view.py -> _run was called.")
+        self._scheduler.start()
         while self._running:
-            end = time.time() + 1.0 / self._fps
-
+            start = time.perf_counter()
             self._draw()
+            drawn = time.perf_counter()
+
+            overshoot = self._scheduler.wait()
+            self._request_input(drawn - start, overshoot)
 
-            time.sleep(max([0, end - time.time()]))
-            self._ev_manager.post(InputRequest())
+        self._report_timing()
         # wait for the endscreen (main thread terminates here)
         time.sleep(3)
 
+    async def _run_async(self) -> None:
+        """Main game loop as task of the asyncio loop of the EventManager.
+        The input is polled in the same task, between two frames."""
+        db.log(content="interface_view.py -> _run_async was called.")
+        self._scheduler.start()
+        try:
+            while self._running:
+                start = time.perf_counter()
+                self._draw()
+                drawn = time.perf_counter()
+
+                overshoot = await self._scheduler.wait_async()
+                self._request_input(drawn - start, overshoot)
+        finally:
+            # the EventManager cancels the task after the QuitEvent
+            self._report_timing()
+
+    def _request_input(self, draw_time: float, overshoot: float) -> None:
+        """Asks the controllers for input and records the timing of the frame"""
+        polling = time.perf_counter()
+        self._ev_manager.post(InputRequest())
+        self._timer.record(draw_time, overshoot, time.perf_counter() - polling,
+                           self._ev_manager.queue_size())
+
+    def _report_timing(self) -> None:
+        """Logs the frame statistics, writes the frames into the CSV file and
+        finalizes the logs, as the view loop is the last to end"""
+        db.log(content="interface_view.py -> frame timing: " + str(self._scheduler.stats()))
+        db.log(content="interface_view.py -> frame percentiles: " + str(self._timer.percentiles()))
+        if self._timing_path:
+            self._timer.dump_csv(self._timing_path)
+        db.log(content="interface_view.py -> the view loop ended.", final_log=True)
+
+    def _screen_key(self):
+        """Returns the size of the screen, a change redraws the whole screen"""
+        return None
+
+    def _update_game(self, field: np.ndarray, score: int, record: int, cells: list) -> None:
+        """Redraws the game after a change.
+
+        Parameters
+        ----------
+        field: np.ndarray
+            The current gamefield as tile exponents (see board.py).
+        score: int
+            The current high score.
+        record: int
+            The record high score.
+        cells: list
+            The positions of the tiles that changed since the last frame.
+        """
+        self._print_game(to_values(field), score, record)
+
+    def _animate(self) -> None:
+        """Draws the parts of the screen that change in every frame"""
+
     @abstractmethod
     def _quit(self, field: np.ndarray, highscore: int):
         pass
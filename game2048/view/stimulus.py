@@ -0,0 +1,196 @@
+"""This file implements the frame timing and the flickering stimuli of the views
+
+The BCI recognises a direction by the frequency of the flickering field the
+player looks at, so the fields have to flicker at exactly their frequency.
+The luminance of every frequency is computed once for a whole period, and
+the frames are timed by a monotonic clock: every frame has a fixed slot
+after the start, so a late frame doesn't delay the following ones, and
+frames that couldn't be drawn in time are skipped and counted.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+import numpy as np
+
+FREQUENCIES = (6, 8, 10, 15)
+
+
+class StimulusScheduler:
+    """This class implements the frame clock and the luminance tables.
+
+    Attributes
+    ----------
+    _fps : int
+        The frames per second.
+    _tables : dict
+        Frequency -> the colours of one period, one per frame.
+    _spin : float
+        The last seconds before a frame are waited actively, because
+        time.sleep() returns too late.
+    _start : float
+        The perf_counter() time of frame 0.
+    _frame : int
+        The index of the current frame.
+    _times : deque
+        The times of the latest frames.
+    _frames : deque
+        The indices of the latest frames.
+    dropped : int
+        The number of frames that were skipped, because a frame took too long.
+    """
+
+    def __init__(self, fps=60, frequencies=FREQUENCIES, history=600, spin=0.001):
+        """
+        Constructor of class StimulusScheduler.
+
+        Parameters
+        ----------
+        fps : int
+            The frames per second.
+        frequencies : tuple
+            The flicker frequencies in Hertz, whose tables are computed in advance.
+        history : int
+            The number of frames the statistics are computed of.
+        spin : float
+            Seconds before a frame, that are waited actively.
+        """
+        self._fps = fps
+        self._tables = {frequency: self._build_table(frequency, fps) for frequency in frequencies}
+        self._spin = spin
+        self._times = deque(maxlen=history)
+        self._frames = deque(maxlen=history)
+        self.start()
+
+
+    @staticmethod
+    def _build_table(frequency: int, fps: int) -> tuple:
+        """Computes the grey values of one period. If a period isn't a whole
+        number of frames (8 Hz at 60 fps), the table holds the shortest whole
+        number of periods instead.
+
+        Returns
+        -------
+        tuple
+            One (r, g, b) colour per frame.
+        """
+        length = fps // math.gcd(fps, frequency)
+        phase = np.arange(length) / fps * frequency * 2 * np.pi
+        values = (255 * 0.5 * (1 + np.sin(phase))).astype(int)
+        return tuple((value, value, value) for value in values.tolist())
+
+
+    @property
+    def frame(self) -> int:
+        """The index of the current frame"""
+        return self._frame
+
+
+    def start(self) -> None:
+        """Starts the clock with frame 0 and clears the statistics."""
+        self._start = time.perf_counter()
+        self._frame = 0
+        self.dropped = 0
+        self._times.clear()
+        self._frames.clear()
+        self._times.append(self._start)
+        self._frames.append(0)
+
+
+    def colour(self, frequency: int) -> (int, int, int):
+        """Returns the colour of a flickering field in the current frame.
+
+        Parameters
+        ----------
+        frequency : int
+            The flicker frequency in Hertz.
+        """
+        table = self._tables.get(frequency)
+        if table is None:
+            table = self._tables[frequency] = self._build_table(frequency, self._fps)
+        return table[self._frame % len(table)]
+
+
+    def wait(self) -> float:
+        """Waits for the slot of the next frame. If the slot has already
+        passed, the frames in between are skipped.
+
+        Returns
+        -------
+        float
+            The seconds the next frame starts after its slot.
+        """
+        remaining = self._next_slot() - time.perf_counter()
+        if remaining > self._spin:
+            time.sleep(remaining - self._spin)
+        return self._next_frame()
+
+
+    async def wait_async(self) -> float:
+        """Like wait(), but lets other tasks of the event loop run meanwhile."""
+        remaining = self._next_slot() - time.perf_counter()
+        if remaining > self._spin:
+            await asyncio.sleep(remaining - self._spin)
+        return self._next_frame()
+
+
+    def _next_slot(self) -> float:
+        """Returns the perf_counter() time of the next frame"""
+        return self._start + (self._frame + 1) / self._fps
+
+
+    def _next_frame(self) -> float:
+        """Waits actively for the rest of the time until the next frame and starts it.
+
+        Returns
+        -------
+        float
+            The seconds the frame starts after its slot.
+        """
+        target = self._next_slot()
+        while time.perf_counter() < target:
+            pass
+
+        now = time.perf_counter()
+        frame = int((now - self._start) * self._fps)
+        if frame > self._frame + 1:
+            self.dropped += frame - self._frame - 1
+        self._frame = max(frame, self._frame + 1)
+
+        self._times.append(now)
+        self._frames.append(self._frame)
+        return now - (self._start + self._frame / self._fps)
+
+
+    def stats(self) -> dict:
+        """Measures how exact the latest frames were.
+
+        Returns
+        -------
+        dict
+            'frames' (the number of measured frames), 'dropped', 'jitter'
+            (standard deviation of the frame durations in seconds) and
+            'frequencies': frequency -> 'measured' (the frequency that was
+            displayed in Hertz), 'error' (measured - frequency) and
+            'luminance_error' (mean difference of the displayed grey values
+            to the exact ones at the time of the frames).
+        """
+        times = np.array(self._times)
+        frames = np.array(self._frames)
+        result = {"frames": len(frames), "dropped": self.dropped,
+                  "jitter": float(np.std(np.diff(times))) if len(times) > 2 else 0.0,
+                  "frequencies": {}}
+        if len(times) < 2 or times[-1] == times[0]:
+            return result
+
+        # The frames show frame / fps seconds of the stimulus in the measured time
+        speed = float((frames[-1] - frames[0]) / self._fps / (times[-1] - times[0]))
+        for frequency, table in self._tables.items():
+            shown = np.array([table[frame % len(table)][0] for frame in frames])
+            exact = 255 * 0.5 * (1 + np.sin((times - self._start) * frequency * 2 * np.pi))
+            result["frequencies"][frequency] = {
+                "measured": frequency * speed,
+                "error": frequency * speed - frequency,
+                "luminance_error": float(np.mean(np.abs(shown - exact)))}
+        return result
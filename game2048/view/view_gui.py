@@ -2,19 +2,22 @@ from .interface_view import InterfaceView
 from ..event_manager import EventManager, Screen
 from ..model import Model
 from ..colour_library import Colours
+from ..board import tile_value
 import numpy as np
 import pygame as pg
 import time
-import math
 from ..database import Database
 
 
 db = Database()
 
+# Changing texts like the score would let the surface cache grow endlessly
+SURFACE_CACHE_SIZE = 256
+
 
 class ViewGUI(InterfaceView):
     """This class implements a graphic output to display the game 2048"""
-    def __init__(self, ev_manager: EventManager, game: Model, bci: bool):
+    def __init__(self, ev_manager: EventManager, game: Model, bci: bool, timing_path=None):
         """Constructs the output GUI window
 
         Parameters
@@ -25,8 +28,10 @@ class ViewGUI(InterfaceView):
             Reference to the model instance
         bci: bool
             checks if the bci controller is active
+        timing_path: str
+            CSV file for the timings of the last frames, written on quit
         """
-        super().__init__(ev_manager, game)
+        super().__init__(ev_manager, game, timing_path)
 
         self._screen_size = (700, 700)
         self._font = pg.font.Font("NotoSans.ttf", 24)
@@ -35,8 +40,13 @@ class ViewGUI(InterfaceView):
         self._screen = pg.display.set_mode(self._screen_size, pg.RESIZABLE)
         pg.display.set_caption('Project2048')
         self._bci = bci
-        self._count = 0
         self._shadow_distance = (-2.5, 2.5)
+        # Fonts by size and pre-rendered surfaces, see _get_font and _add_drop_shadow
+        self._fonts = {24: self._font}
+        self._surface_cache = {}
+        self._cached_screen_size = self._screen_size
+        # The part of the window covered by the score text, cleared before the next score
+        self._score_rect = None
 
     def _coord(self, x, y) -> (int, int):
         """Transfers generalized coordinates (10x10) to actual screen (pixels)"""
@@ -70,21 +80,78 @@ class ViewGUI(InterfaceView):
         pg.quit()
 
 
-    def _draw(self) -> None:
-        """Outputs the current Screen"""
-        self._screen.fill(Colours.LIGHT_LILAC)
+    def _screen_key(self) -> (int, int):
+        """Returns the size of the window, a change redraws the whole window"""
         self._screen_size = self._screen.get_size()
 
-        super()._draw()
+        # Tiles are rendered in the size of the screen, so they are outdated now
+        if self._screen_size != self._cached_screen_size:
+            self._surface_cache.clear()
+            self._cached_screen_size = self._screen_size
+
+        return self._screen_size
+
+
+    def _redraw(self) -> None:
+        """Outputs the whole current Screen"""
+        self._screen.fill(Colours.LIGHT_LILAC)
+        self._score_rect = None
+        super()._redraw()
 
         pg.display.update()
 
 
+    def _update_game(self, field: np.ndarray, score: int, record: int, cells: list) -> None:
+        """Redraws the score and the changed tiles of a board of tile exponents
+        and updates only their part of the window"""
+        rects = [self._print_score(score, record)]
+        for i, j in cells:
+            if i < 4 and j < 4:
+                rects.append(self._print_tile(i, j, tile_value(field[i][j])))
+
+        pg.display.update(rects)
+
+
+    def _animate(self) -> None:
+        """Draws the flickering fields, they change in every frame of the game"""
+        # test flicker function without bci by replacing the condition by:
+        # if self._game_state == Screen.GAME:
+        if self._bci and self._game_state == Screen.GAME:
+            pg.display.update(self._print_flicker())
+
+
+    def _get_font(self, size: int) -> pg.font.Font:
+        """Returns the font in a given size, loading the font file only once per size"""
+        font = self._fonts.get(size)
+        if font is None:
+            font = pg.font.Font("NotoSans.ttf", size)
+            self._fonts[size] = font
+        return font
+
+
     def _add_drop_shadow(self,
                         text, colour,
                         shadow_distance,
                         shadow_colour=Colours.DROP_PURPLE,
                         shadow_alpha = 0):
+        """Renders a given text with a drop shadow. Each text is rendered only
+        once, until the window size changes."""
+        key = ("shadow", text, tuple(colour), tuple(shadow_distance), tuple(shadow_colour), shadow_alpha)
+        surface = self._surface_cache.get(key)
+        if surface is None:
+            surface = self._render_drop_shadow(text, colour, shadow_distance, shadow_colour, shadow_alpha)
+            self._cache_surface(key, surface)
+        return surface
+
+
+    def _cache_surface(self, key: tuple, surface: pg.Surface) -> None:
+        """Stores a rendered surface and drops the oldest one, if the cache is full"""
+        self._surface_cache[key] = surface
+        if len(self._surface_cache) > SURFACE_CACHE_SIZE:
+            del self._surface_cache[next(iter(self._surface_cache))]
+
+
+    def _render_drop_shadow(self, text, colour, shadow_distance, shadow_colour, shadow_alpha):
         """Renders a given text with a drop shadow"""
 
         dx = shadow_distance[0]
@@ -128,7 +195,7 @@ class ViewGUI(InterfaceView):
         text_surf = self._add_drop_shadow("Your aim in this game is to reach", Colours.DARK_PURPLE, self._shadow_distance)
         self._screen.blit(text_surf, self._coord(1.5, 4))
 
-        text_surf = self._add_drop_shadow("the number 2048 on one of the tiles.", Colours.DARK_PURPLE, self._shadow_distance)
+        text_surf = self._add_drop_shadow(f"the number {self._game.get_target()} on one of the tiles.", Colours.DARK_PURPLE, self._shadow_distance)
         self._screen.blit(text_surf, self._coord(1.5, 4.5))
 
         text_surf = self._add_drop_shadow("You should do so by cleverly sliding", Colours.DARK_PURPLE, self._shadow_distance)
@@ -165,34 +232,6 @@ class ViewGUI(InterfaceView):
         score: int
             The current high score.
         """
-        def print_score() -> None:
-            """Print the score and the record on the screen"""
-            score_rect = pg.Rect(self._coord(3, 2), self._dim(4, 1))
-            score_text = self._add_drop_shadow('Score: ' + str(int(score)), Colours.DARK_TEXT, self._shadow_distance)
-            temp_score_text = "Score: " + str(int(score))
-            temp_record_text = "Record: " + str(int(record))
-            score_text = self._add_drop_shadow(temp_score_text + "   " + temp_record_text, Colours.DARK_TEXT, self._shadow_distance)
-
-            score_rect = score_text.get_rect(center=score_rect.center)
-            self._screen.blit(score_text, score_rect)
-
-        def print_tiles() -> None:
-            """Print tiles from gamefield on the screen"""
-            for i in range(4):
-                for j in range(4):
-                    value = matrix[i][j]
-                    # draw tiles of appropriate colour
-                    tile = pg.Rect(self._coord(3+j, 3+i), self._dim(1, 1))
-                    pg.draw.rect(self._screen, Colours.color[value], tile, 0, 20)
-                    # put numbers on tiles
-                    if value > 0:
-                        value_length = len(str(value))
-                        tile_font = pg.font.Font("NotoSans.ttf", 50 - (5 * value_length))
-                        value_text = tile_font.render(str(int(value)), True,
-                                                      Colours.LIGHT_TEXT if value > 32 else Colours.DARK_TEXT)
-                        value_rect = value_text.get_rect(center=tile.center)
-                        self._screen.blit(value_text, value_rect)
-
         def print_options() -> None:
             """Print instructions on the possible keys to press"""
             text_rect = pg.Rect(self._coord(3, 8), self._dim(4, 1))
@@ -200,30 +239,103 @@ class ViewGUI(InterfaceView):
             text_rect = text_text.get_rect(center=text_rect.center)
             self._screen.blit(text_text, text_rect)
 
+        self._print_score(score, record)
+        for i in range(4):
+            for j in range(4):
+                self._print_tile(i, j, matrix[i][j])
 
-        def print_flicker() -> None:
-            """Print a flickering field in current state"""
-            up = pg.Rect(self._coord(3, 0), self._dim(4, 2))
-            down = pg.Rect(self._coord(3, 8), self._dim(4, 2))
-            left = pg.Rect(self._coord(0, 3), self._dim(2, 4))
-            right = pg.Rect(self._coord(8, 3), self._dim(2, 4))
-            pg.draw.rect(self._screen, self._flicker(6), up)
-            pg.draw.rect(self._screen, self._flicker(8), right)
-            pg.draw.rect(self._screen, self._flicker(10), down)
-            pg.draw.rect(self._screen, self._flicker(15), left)
+        # the flickering fields are drawn by _animate() in every frame
+        if not self._bci:
+            print_options()
 
-        print_score()
-        print_tiles()
 
-        # test flicker function without bci by replacing the following part by this:
-        # print_flicker()
-        # self._count += 1
+    def _print_score(self, score: int, record: int) -> pg.Rect:
+        """Prints the score and the record on the screen
 
-        if self._bci:
-            print_flicker()
-            self._count += 1
-        else:
-            print_options()
+        Returns
+        -------
+        pg.Rect
+            The part of the screen that changed.
+        """
+        score_rect = pg.Rect(self._coord(3, 2), self._dim(4, 1))
+        temp_score_text = "Score: " + str(int(score))
+        temp_record_text = "Record: " + str(int(record))
+        score_text = self._add_drop_shadow(temp_score_text + "   " + temp_record_text, Colours.DARK_TEXT, self._shadow_distance)
+        score_rect = score_text.get_rect(center=score_rect.center)
+
+        # the old text may be wider than the new one
+        changed = score_rect if self._score_rect is None else score_rect.union(self._score_rect)
+        self._screen.fill(Colours.LIGHT_LILAC, changed)
+        self._screen.blit(score_text, score_rect)
+        self._score_rect = score_rect
+        return changed
+
+
+    def _print_tile(self, i: int, j: int, value) -> pg.Rect:
+        """Prints the tile in row i and column j on the screen
+
+        Returns
+        -------
+        pg.Rect
+            The part of the screen that changed.
+        """
+        tile = pg.Rect(self._coord(3+j, 3+i), self._dim(1, 1))
+        # the background shows at the rounded corners
+        self._screen.fill(Colours.LIGHT_LILAC, tile)
+        self._screen.blit(self._tile_surface(value, tile.size), tile)
+        return tile
+
+
+    def _print_flicker(self) -> list:
+        """Prints the flickering fields in their current state
+
+        Returns
+        -------
+        list
+            The parts of the screen that changed.
+        """
+        up = pg.Rect(self._coord(3, 0), self._dim(4, 2))
+        down = pg.Rect(self._coord(3, 8), self._dim(4, 2))
+        left = pg.Rect(self._coord(0, 3), self._dim(2, 4))
+        right = pg.Rect(self._coord(8, 3), self._dim(2, 4))
+        pg.draw.rect(self._screen, self._flicker(6), up)
+        pg.draw.rect(self._screen, self._flicker(8), right)
+        pg.draw.rect(self._screen, self._flicker(10), down)
+        pg.draw.rect(self._screen, self._flicker(15), left)
+        return [up, right, down, left]
+
+
+    def _tile_surface(self, value, size: (int, int)) -> pg.Surface:
+        """Returns a tile with its number, rendering it only once per value
+        until the window size changes.
+
+        Parameters
+        ----------
+        value
+            The value of the tile.
+        size: tuple
+            The width and height of the tile in pixels.
+        """
+        key = ("tile", value, size)
+        surface = self._surface_cache.get(key)
+        if surface is not None:
+            return surface
+
+        surface = pg.Surface(size, pg.SRCALPHA)
+        tile = surface.get_rect()
+        # draw tiles of appropriate colour, the palette ends at 2048
+        pg.draw.rect(surface, Colours.color.get(value, Colours.DARK_PURPLE), tile, 0, 20)
+        # put numbers on tiles
+        if value > 0:
+            value_length = len(str(value))
+            tile_font = self._get_font(50 - (5 * value_length))
+            value_text = tile_font.render(str(int(value)), True,
+                                          Colours.LIGHT_TEXT if value > 32 else Colours.DARK_TEXT)
+            value_rect = value_text.get_rect(center=tile.center)
+            surface.blit(value_text, value_rect)
+
+        self._cache_surface(key, surface)
+        return surface
 
 
     def _flicker(self, f: int) -> (int, int, int):
@@ -233,8 +345,7 @@ class ViewGUI(InterfaceView):
         ----------
         f: int
             flicker frequency in Hertz"""
-        n: int = int(255 * 0.5 * (1 + math.sin((self._count / 60) * f * 2 * math.pi)))
-        return (n, n, n)
+        return self._scheduler.colour(f)
 
 
     def _print_final(self, score: int, record: int) -> None:
@@ -247,7 +358,7 @@ class ViewGUI(InterfaceView):
             The current high score.
         """
         if self._game_state is Screen.WIN:
-            text = self._add_drop_shadow("You reached a 2048 tile and won!", Colours.CHINESE_VIOLET, self._shadow_distance)
+            text = self._add_drop_shadow(f"You reached a {self._game.get_target()} tile and won!", Colours.CHINESE_VIOLET, self._shadow_distance)
             self._screen.blit(text, self._coord(2, 3))
         if self._game_state is Screen.LOSE:
             text = self._add_drop_shadow("You lost!", Colours.DARK_TEXT, self._shadow_distance)
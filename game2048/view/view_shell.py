@@ -7,6 +7,7 @@ from .interface_view import InterfaceView
 from ..event_manager import EventManager
 from ..arguments import Screen
 from ..model import Model
+from ..board import tile_value
 from ..database import Database
 
 db = Database()
@@ -15,7 +16,7 @@ db = Database()
 class ViewShell(InterfaceView):
     """This class implements a shell output of the game 2048"""
 
-    def __init__(self, ev_manager: EventManager, game: Model, screen: curses.window):
+    def __init__(self, ev_manager: EventManager, game: Model, screen: curses.window, timing_path=None):
         """Constructs the shell output window
 
         Parameters
@@ -26,8 +27,10 @@ class ViewShell(InterfaceView):
             Reference to the model instance
         screen: curses.window
             the shell output screen
+        timing_path: str
+            CSV file for the timings of the last frames, written on quit
         """
-        super().__init__(ev_manager, game)
+        super().__init__(ev_manager, game, timing_path)
 
         self._screen = screen
         curses.noecho()
@@ -35,6 +38,8 @@ class ViewShell(InterfaceView):
         screen.keypad(True)
         curses.curs_set(False)
         screen.nodelay(True)
+        # The tile width of the drawn gamefield, see _update_game
+        self._drawn_tile_width = None
 
 
     def _quit(self, field: np.ndarray, highscore: int) -> None:
@@ -67,7 +72,7 @@ class ViewShell(InterfaceView):
         self._screen.clear()
         self._screen.addstr(1, 7, "WELCOME TO 2048!", curses.A_STANDOUT)
         self._screen.addstr(3, 0, "Your aim in this game is to reach a value of")
-        self._screen.addstr(4, 0, "2048 on one of the tiles by merging the appropriate tiles!")
+        self._screen.addstr(4, 0, f"{self._game.get_target()} on one of the tiles by merging the appropriate tiles!")
         self._screen.addstr(5, 0, "You should do so by cleverly sliding them ( ← | ↑ | → | ↓ )")
         self._screen.addstr(6, 0, "Be careful when sliding:")
         self._screen.addstr(7, 0, "you slide ALL the tiles in that direction, not just one :)")
@@ -86,7 +91,7 @@ class ViewShell(InterfaceView):
         self._screen.clear()
         if self._game_state is Screen.WIN:
             self._screen.addstr(1, 7, "CONGRATULATIONS!", curses.A_STANDOUT)
-            self._screen.addstr(3, 0, "You reached a 2048 tile and WON!")
+            self._screen.addstr(3, 0, f"You reached a {self._game.get_target()} tile and WON!")
             self._screen.addstr(4, 0, "Your Final Score: " + str(int(score)))
             self._screen.addstr(5, 0, "The Current Record: " + str(int(record)))
             self._screen.addstr(7, 0, "s ~ start new game  |  q ~ quit")
@@ -100,6 +105,60 @@ class ViewShell(InterfaceView):
             self._screen.addstr(7, 0, "s ~ start new game  |  q ~ quit")
         self._screen.refresh()
 
+    def _screen_key(self) -> (int, int):
+        """Returns the size of the terminal, a change redraws the whole screen"""
+        return self._screen.getmaxyx()
+
+    def _update_game(self, field: np.ndarray, score: int, record: int, cells: list) -> None:
+        """Rewrites the score and the changed tiles without clearing the screen.
+
+        Parameter
+        ---------
+        field: np.ndarray
+            The current gamefield as tile exponents (see board.py).
+        score: int
+            The current high score.
+        record: int
+            The record high score.
+        cells: list
+            The positions of the tiles that changed since the last frame.
+        """
+        # A bigger maximum tile widens all tiles
+        if self._tile_width(tile_value(np.max(field))) != self._drawn_tile_width:
+            super()._update_game(field, score, record, cells)
+            return
+
+        self._print_score(score, record)
+        tile_width = self._drawn_tile_width
+        for i, j in cells:
+            tile = self._tile_string(tile_value(field[i][j]), tile_width)
+            self._screen.addstr(5 + i * 3, 4 + j * (tile_width + 1), tile)
+        self._screen.refresh()
+
+    @staticmethod
+    def _tile_width(largest: int) -> int:
+        """Returns the width of the tiles, so that all tiles adjust to the biggest number on the field"""
+        return len(str(int(largest))) + 4
+
+    @staticmethod
+    def _tile_string(tile, tile_width: int) -> str:
+        """Return output string for a tile with correct number of empty spaces"""
+        tile_len: int = len(str(int(tile)))
+        spaces_r = int((tile_width - tile_len) / 2)
+        spaces_l = tile_width - tile_len - spaces_r
+
+        if int(tile) == 0:
+            return tile_width * ' ' + '|'
+
+        return spaces_l * ' ' + str(int(tile)) + spaces_r * ' ' + '|'
+
+    def _print_score(self, score: int, record: int) -> None:
+        """Writes the score lines, removing the rest of a longer old score"""
+        self._screen.addstr(1, 7, 'Current Score: ' + str(int(score)), curses.A_STANDOUT)
+        self._screen.clrtoeol()
+        self._screen.addstr(2, 7, 'Current Record: ' + str(int(record)), curses.A_STANDOUT)
+        self._screen.clrtoeol()
+
     def _print_game(self, matrix: np.ndarray, score: int, record: int) -> None:
         """Displays a given matrix and high score in the shell.
 
@@ -110,33 +169,12 @@ class ViewShell(InterfaceView):
         score: int
             The current high score.
         """
-        def max_tile() -> int:
-            """Returns max number of decimal places in all fields of matrix"""
-            max_elem: int = 0
-            for i in matrix:
-                for j in i:
-                    if int(j) > max_elem:
-                        max_elem = int(j)
-
-            return max_elem
-
-        def tile_string() -> str:
-            """Return output string for a tile with correct number of empty spaces"""
-            tile_len: int = len(str(int(tile)))
-            spaces_r = int((tile_width - tile_len) / 2)
-            spaces_l = tile_width - tile_len - spaces_r
-
-            if int(tile) == 0:
-                return tile_width * ' ' + '|'
-
-            return spaces_l * ' ' + str(int(tile)) + spaces_r * ' ' + '|'
-
-        width = len(matrix[0])                          # Calculates the needed width with the help of max_tile
-        tile_width = len(str(int(max_tile()))) + 4      #  so that all tile widths adjust to the biggest number 
-                                                        #  on the field
+        width = len(matrix[0])
+        tile_width = self._tile_width(np.max(matrix))
+        self._drawn_tile_width = tile_width
+
         self._screen.clear()
-        self._screen.addstr(1, 7, 'Current Score: ' + str(int(score)), curses.A_STANDOUT)
-        self._screen.addstr(2, 7, 'Current Record: ' + str(int(record)), curses.A_STANDOUT)
+        self._print_score(score, record)
 
         self._screen.addstr(3, 3, width * (' ' + tile_width * '_') + '\n')
 
@@ -145,7 +183,7 @@ class ViewShell(InterfaceView):
 
             line = '|'
             for tile in row:
-                line += tile_string()
+                line += self._tile_string(tile, tile_width)
 
             self._screen.addstr(5 + idx * 3, 3, line)
             self._screen.addstr(6 + idx * 3, 3, width * ('|' + tile_width * '_') + '|' + '\n')
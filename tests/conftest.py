@@ -0,0 +1,18 @@
+import pytest
+from game2048.database import Database, logging_config
+
+
+@pytest.fixture(autouse=True)
+def database_folder(tmp_path, monkeypatch):
+    """Writes the logs, traces and save files of Database into tmp_path"""
+    def create_folder(self):
+        self._path_folder = str(tmp_path)
+        return self._path_folder
+    monkeypatch.setattr(Database, "_create_folder", create_folder)
+    return tmp_path
+
+
+@pytest.fixture()
+def logged(monkeypatch):
+    """Logs the game, whatever the logging configuration says"""
+    monkeypatch.setattr(logging_config, "_enabled", True)
@@ -0,0 +1,91 @@
+import os
+import numpy as np
+import pytest
+from game2048.autosave import Autosave, JOURNAL_NAME
+from game2048.database import Database
+from game2048.game_env import GameEnv
+from game2048.arguments import DIRECTIONS
+
+
+def play(env, autosave, moves):
+    for n in range(moves):
+        _, points, _, info = env.step(DIRECTIONS[n % 3])
+        if info["changed"]:
+            autosave.record(DIRECTIONS[n % 3], info["spawn"], points)
+
+
+def recovered(database_folder):
+    score, field, generation = Database().read_save(os.path.join(database_folder, "Save - Game.json"))
+    env = GameEnv(*field.shape)
+    env.field = field
+    env.score = score
+    return env, Autosave(database_folder).recover(env, generation)
+
+
+@pytest.mark.parametrize("shape, compact_every", [((4, 4), 10 ** 6), ((5, 7), 7)])
+def test_recover_after_crash(database_folder, shape, compact_every):
+    env = GameEnv(*shape, seed=25)
+    env.reset()
+    autosave = Autosave(database_folder, delay=0.001, batch_size=3, compact_every=compact_every)
+    assert autosave.recover(env) == 0
+    autosave.start(env)
+    play(env, autosave, 40)
+    # close() only writes the queue, the save file is as old as after a crash
+    autosave.close()
+
+    game, replayed = recovered(database_folder)
+    assert 0 < replayed < compact_every
+    assert np.array_equal(game.field, env.field) and game.score == env.score
+
+
+def test_restart_and_stale_journal(database_folder):
+    env = GameEnv(seed=3)
+    env.reset()
+    autosave = Autosave(database_folder, delay=10)
+    autosave.recover(env)
+    autosave.start(env)
+    play(env, autosave, 10)
+    finished = env.score
+    env.reset()
+    autosave.restart(env.start_tiles)
+    autosave.close()
+    game, replayed = recovered(database_folder)
+    assert replayed == 0 and np.array_equal(game.field, env.field) and game.score == 0
+    # the score of the finished game reached the record
+    assert finished > 0 and Database().read_save(database_folder / "Save - Highscore.json")[0] == finished
+
+    # a save without generation (e.g. on quit) already contains the journal
+    autosave = Autosave(database_folder, delay=0)
+    autosave.recover(env)
+    autosave.start(env)
+    play(env, autosave, 10)
+    autosave.close()
+    Database().create_save(matrix=env.field, current_highscore=env.score)
+    assert recovered(database_folder)[1] == 0
+    assert os.path.exists(os.path.join(database_folder, JOURNAL_NAME))
+
+
+def test_failed_journal_is_retried(database_folder, monkeypatch):
+    from game2048 import autosave as autosave_module
+    write_atomic = autosave_module.write_atomic
+    calls = []
+
+    def fail_once(path, data):
+        calls.append(path)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        write_atomic(path, data)
+
+    monkeypatch.setattr(autosave_module, "write_atomic", fail_once)
+    env = GameEnv(5, 5, seed=7)
+    env.reset()
+    autosave = Autosave(database_folder, delay=0.001, batch_size=3, compact_every=10 ** 6)
+    autosave.recover(env)
+    autosave.start(env)
+    play(env, autosave, 40)
+    autosave.close()
+
+    # the journal of the first save failed, the next batch saves again
+    game, replayed = recovered(database_folder)
+    assert len(calls) == 2 and replayed > 0
+    assert np.array_equal(game.field, env.field) and game.score == env.score
@@ -0,0 +1,90 @@
+import random
+import numpy as np
+import pytest
+from game2048 import bitboard
+from game2048.board import to_exponents, to_values
+from game2048.model import Model
+from game2048.game_env import GameEnv
+from game2048.event_manager import EventManager
+from game2048.arguments import Command
+
+DIRECTIONS = [Command.LEFT, Command.RIGHT, Command.UP, Command.DOWN]
+
+
+def reference_slide(field, command):
+    """Straightforward slide that follows the rules of Model._slide"""
+    rotations = {Command.LEFT: 0, Command.RIGHT: 2, Command.UP: 1, Command.DOWN: 3}[command]
+    rotated = np.rot90(np.array(field, dtype=float), rotations).copy()
+    score = 0
+    for row in rotated:
+        moved = [tile for tile in row if tile != 0]
+        moved += [0] * (len(row) - len(moved))
+        for j in range(len(row) - 1):
+            if moved[j] == moved[j + 1]:
+                moved[j] *= 2
+                moved[j + 1] = 0
+                score += moved[j]
+        merged = [tile for tile in moved if tile != 0]
+        row[:] = merged + [0] * (len(row) - len(merged))
+    return np.rot90(rotated, -rotations), score
+
+
+@pytest.fixture()
+def init():
+    ev = EventManager()
+    return Model(ev_manager=ev)
+
+
+def encode(field):
+    return bitboard.encode_exponents(to_exponents(field))
+
+
+def decode(board):
+    return to_values(bitboard.decode_exponents(board))
+
+
+def test_encode_decode():
+    field = np.array([[0, 2, 4, 8], [16, 32, 64, 128], [256, 512, 1024, 2048], [4096, 8192, 16384, 0]])
+    assert np.array_equal(decode(encode(field)), field)
+
+
+def test_slide_matches_reference():
+    rng = random.Random(2048)
+    for _ in range(500):
+        field = np.array([[rng.choice([0, 0, 2, 2, 4, 8, 16, 1024]) for _ in range(4)] for _ in range(4)])
+        board = encode(field)
+        for command in DIRECTIONS:
+            expected_field, expected_score = reference_slide(field, command)
+            result, score = bitboard.slide(board, command)
+            assert np.array_equal(decode(result), expected_field)
+            assert score == expected_score
+
+
+def test_model_uses_packed_board(init):
+    init._field = np.array([[2, 2, 4, 4], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+    highscore = init._highscore
+    init._slide(Command.LEFT)
+    assert init._env._board is not None
+    assert list(init.get_game()[0][0][:2]) == [4, 8]
+    assert init._highscore == highscore + 12
+
+
+def test_merge_beyond_a_nibble():
+    with pytest.raises(OverflowError):
+        bitboard.slide(bitboard.encode_exponents([[15, 15, 0, 0]] + [[0] * 4] * 3), Command.LEFT)
+
+    env = GameEnv()
+    env.field = np.array([[16384] * 4] + [[0] * 4] * 3)
+    env.slide(Command.LEFT)
+    # a 2^15 tile is stored unpacked, so it can merge once more
+    assert env.board is None
+    env.slide(Command.LEFT)
+    assert list(env.field[0]) == [65536, 0, 0, 0]
+    assert env.score == 131072 and env.max_tile == 65536
+
+
+def test_empty_count():
+    rng = random.Random(22)
+    for _ in range(200):
+        board = bitboard.encode_exponents([[rng.choice([0, 0, 1, 7, 15]) for _ in range(4)] for _ in range(4)])
+        assert bitboard.empty_count(board) == len(bitboard.empty_cells(board))
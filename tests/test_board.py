@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from game2048.board import DTYPE, to_exponents, to_values, tile_value
+from game2048.game_env import GameEnv
+
+
+def test_conversion():
+    field = np.array([[0, 2, 4], [1024, 2048, 2 ** 40]])
+    board = to_exponents(field)
+    assert board.dtype == DTYPE and board.tolist() == [[0, 1, 2], [10, 11, 40]]
+    assert np.array_equal(to_values(board), field)
+    assert [tile_value(e) for e in board[1]] == [1024, 2048, 2 ** 40] and tile_value(board[0, 0]) == 0
+    with pytest.raises(ValueError):
+        to_exponents([[2, 3]])
+
+
+def test_game_env_exponents():
+    env = GameEnv(height=5, width=5, seed=4)
+    env.reset()
+    board = env.exponents
+    assert board.dtype == DTYPE and not board.flags.writeable
+    assert np.array_equal(to_values(board), env.field)
+    env.exponents = np.full((4, 4), 3)
+    assert env.board is not None and env.field[0, 0] == 8
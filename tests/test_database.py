@@ -2,17 +2,11 @@ from game2048.database import Database
 import numpy as np
 import pathlib
 import os
+import pytest
 from game2048.arguments import Logging
 
 # Set logging to true
-file_name = "Config - Logging.txt"
-current_path = pathlib.Path(__file__).parent.resolve()
-root_path = current_path.parent
-file_path = os.path.join(root_path, file_name)
-
-file_content = "True"
-with open(file_path, "w") as file:
-    file.write(file_content)
+pytestmark = pytest.mark.usefixtures("logged")
 
 # Get the current path of the running code
 # .../project2048/tests/
@@ -163,3 +157,138 @@ def test_matrix_to_markdown():
 
 def test_savestate_functions():
     assert t.class_test_savestate_functions()
+
+
+def test_log_writer():
+    db = Database()
+    Database.start_log_writer(flush_interval=10)
+    try:
+        db.log(content="first entry")
+        db.log(content=np.array([[2, 4], [8, 16]]), option=Logging.GAMEFIELD)
+        path_system, path_game = db.log(content="last entry", final_log=True)
+    finally:
+        Database.stop_log_writer()
+
+    with open(path_system) as file:
+        system_log = file.read()
+    with open(path_game) as file:
+        game_log = file.read()
+    os.remove(path_system)
+    os.remove(path_game)
+
+    assert "first entry" in system_log and "last entry" in system_log
+    assert "| 2 | 4 | " in system_log and "| 2 | 4 | " in game_log
+    assert "first entry" not in game_log
+
+
+def test_log_writer_survives_errors(tmp_path):
+    import threading
+    import datetime as dt
+    from game2048.database import _LogWriter
+    writer = _LogWriter(Database()._format_log, flush_size=1, flush_interval=10)
+    writer.put((str(tmp_path / "missing" / "log.md"),), "lost entry", Logging.COMMENT, dt.datetime.now())
+    drain = threading.Thread(target=writer.drain, daemon=True)
+    drain.start()
+    drain.join(timeout=5)
+    assert not drain.is_alive()
+
+    path = tmp_path / "log.md"
+    writer.put((str(path),), "kept entry", Logging.COMMENT, dt.datetime.now())
+    writer.drain()
+    assert "kept entry" in path.read_text()
+    writer.stop()
+
+
+def test_log_writer_keeps_other_files(tmp_path):
+    import datetime as dt
+    from game2048.database import _LogWriter
+    writer = _LogWriter(Database()._format_log, flush_size=10 ** 6, flush_interval=10)
+    path = tmp_path / "log.md"
+    missing = tmp_path / "missing" / "log.md"
+    writer.put((str(path),), "kept entry", Logging.COMMENT, dt.datetime.now())
+    writer.put((str(missing),), "lost entry", Logging.COMMENT, dt.datetime.now())
+    writer.stop()
+    text = path.read_text()
+    assert "kept entry" in text and str(missing) in text and "lost entry" not in text
+
+
+def test_stop_log_writer(logged):
+    from game2048 import database
+    Database.start_log_writer(flush_interval=10)
+    writer = database._log_writer
+    path, _ = Database().log(content="entry before stop")
+    Database.stop_log_writer()
+    assert not writer._thread.is_alive() and writer._files == {}
+    assert database._log_writer is None
+    assert "entry before stop" in pathlib.Path(path).read_text()
+
+
+def test_logging_config(monkeypatch):
+    from game2048.database import logging_config
+    try:
+        monkeypatch.setenv("GAME2048_LOGGING", "0")
+        assert not logging_config.reload()
+        assert Database().log(content="not logged") == (None, None)
+
+        logging_config.set(True)
+        assert logging_config.enabled
+        monkeypatch.setenv("GAME2048_LOGGING", "true")
+        assert logging_config.reload()
+    finally:
+        monkeypatch.delenv("GAME2048_LOGGING")
+        logging_config.reload()
+
+
+def test_logging_config_default(monkeypatch, tmp_path):
+    from game2048.database import LoggingConfig
+    monkeypatch.delenv("GAME2048_LOGGING", raising=False)
+    monkeypatch.setattr(LoggingConfig, "FILE_NAME", str(tmp_path / "missing.txt"))
+    assert not LoggingConfig().enabled
+
+
+def test_sanitize_gamefield():
+    from game2048.database import sanitize_gamefield
+    gamefield = [[0, 2, 1024, 2048.0], [1042, 3, -4, 2.5], [1, 2 ** 17, 2 ** 18, float("nan")]]
+    field, replaced = sanitize_gamefield(gamefield)
+    assert field.dtype == np.int64
+    assert field.tolist() == [[0, 2, 1024, 2048], [0, 0, 0, 0], [0, 2 ** 17, 0, 0]]
+    assert replaced == 7
+    assert sanitize_gamefield(np.full((3, 50), 2 ** 18), max_exponent=18)[1] == 0
+
+    for broken in ([[2, 4], [8]], [2, 4], [["a", 2]], []):
+        try:
+            sanitize_gamefield(broken)
+        except ValueError:
+            continue
+        assert False, broken
+
+
+def test_read_broken_save(tmp_path):
+    path = tmp_path / "Save - Game.json"
+    path.write_text('{"highscore": 12}')
+    loaded = Database().read_save(path)
+    assert loaded[0] is False and "gamefield" in loaded[1]
+    path.write_text('{"highscore": 12, "gamefield": [[2, 3], [4, 1024]]}')
+    highscore, field, _ = Database().read_save(path)
+    assert highscore == 12 and field.tolist() == [[2, 0], [4, 1024]]
+    assert Database().read_save(tmp_path / "Save - Highscore.json")[0] is False
+
+
+def test_save_stores_exponents(tmp_path):
+    import json
+    db = Database()
+    field = np.array([[2, 4, 0], [0, 1024, 2]])
+    path_game, path_record = db.create_save(matrix=field, current_highscore=20)
+    try:
+        with open(path_game) as file:
+            assert json.load(file)["exponents"] == [[1, 2, 0], [0, 10, 1]]
+        highscore, loaded, _ = db.read_save(path_game)
+        assert highscore == 20 and np.array_equal(loaded, field)
+    finally:
+        os.remove(path_game)
+        os.remove(path_record)
+
+    # saves of older versions store the tile values
+    path = tmp_path / "Save - Game.json"
+    path.write_text('{"highscore": 4, "gamefield": [[2.0, 4.0], [0.0, 8.0]]}')
+    assert Database().read_save(path)[1].tolist() == [[2, 4], [0, 8]]
@@ -0,0 +1,94 @@
+import asyncio
+from game2048.event_manager import (EventManager, Event, InputRequest, StateEvent,
+                                    SlideEvent, QuitEvent, StartEvent)
+from game2048.arguments import Command, Screen
+
+
+class Recorder:
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    def notify(self, event):
+        self.log.append((self.name, type(event)))
+
+
+def test_observers_only_get_their_event_types():
+    log = []
+    ev_manager = EventManager()
+    ev_manager.register_observer(Recorder("all", log))
+    ev_manager.register_observer(Recorder("state", log), (StateEvent,))
+    ev_manager.register_observer(Recorder("input", log), (InputRequest, StateEvent))
+
+    ev_manager._announce(InputRequest())
+    assert log == [("all", InputRequest), ("input", InputRequest)]
+
+    log.clear()
+    ev_manager._announce(StateEvent(Screen.GAME))
+    assert [name for name, _ in log] == ["all", "state", "input"]
+
+    log.clear()
+    ev_manager._announce(SlideEvent(Command.LEFT))
+    assert log == [("all", SlideEvent)]
+
+
+def test_subclasses_and_late_event_classes():
+    log = []
+    ev_manager = EventManager()
+    ev_manager.register_observer(Recorder("quit", log), (QuitEvent,))
+    ev_manager.register_observer(Recorder("base", log), (Event,))
+
+    class LateEvent(QuitEvent):
+        pass
+
+    ev_manager._announce(LateEvent())
+    assert log == [("quit", LateEvent), ("base", LateEvent)]
+
+
+def test_register_after_events():
+    log = []
+    ev_manager = EventManager()
+    ev_manager.register_observer(Recorder("state", log), (StateEvent,))
+    ev_manager._announce(StateEvent(Screen.GAME))
+    ev_manager._announce(InputRequest())
+    ev_manager.register_observer(Recorder("late", log), (StateEvent,))
+    ev_manager.register_observer(Recorder("all", log))
+
+    log.clear()
+    ev_manager._announce(StateEvent(Screen.GAME))
+    ev_manager._announce(InputRequest())
+    assert log == [("state", StateEvent), ("late", StateEvent), ("all", StateEvent), ("all", InputRequest)]
+
+
+class Player:
+    """Slides twice, then quits, from a task of the asyncio loop"""
+    def __init__(self, ev_manager, log):
+        self.ev_manager = ev_manager
+        self.log = log
+        ev_manager.register_observer(self, (StartEvent, SlideEvent))
+
+    def notify(self, event):
+        if isinstance(event, StartEvent):
+            self.ev_manager.add_task(self.play)
+        else:
+            self.log.append(event.data)
+
+    async def play(self):
+        for command in (Command.LEFT, Command.UP):
+            self.ev_manager.post(SlideEvent(command))
+            await asyncio.sleep(0)
+        self.ev_manager.post(QuitEvent())
+        await asyncio.sleep(10)
+
+
+def test_asyncio_sessions_share_one_loop():
+    first, second = [], []
+    managers = [EventManager(use_asyncio=True), EventManager(use_asyncio=True)]
+    Player(managers[0], first)
+    Player(managers[1], second)
+
+    async def main():
+        await asyncio.wait_for(asyncio.gather(*(manager.run() for manager in managers)), 5)
+
+    asyncio.run(main())
+    assert first == second == [Command.LEFT, Command.UP]
@@ -0,0 +1,34 @@
+import csv
+from game2048.view.frame_timing import FrameTimer
+
+
+def test_ring_buffer_keeps_the_latest_frames():
+    timer = FrameTimer(size=4)
+    for frame in range(6):
+        timer.record(frame, 0.0, 0.0, frame)
+    assert len(timer) == 4
+    assert timer.samples()[:, 0].tolist() == [2, 3, 4, 5]
+
+
+def test_percentiles():
+    timer = FrameTimer(size=200)
+    assert timer.percentiles() == {}
+    for frame in range(101):
+        timer.record(frame / 1000, 0.001, 0.0, 0)
+    stats = timer.percentiles()
+    assert stats["draw"]["p50"] == 0.05
+    assert stats["draw"]["p99"] == 0.099
+    assert stats["overshoot"]["p95"] == 0.001
+
+
+def test_dump_csv(tmp_path):
+    timer = FrameTimer(size=2)
+    for frame in range(3):
+        timer.record(0.5, 0.25, 0.125, 3)
+    path = tmp_path / "frames.csv"
+    timer.dump_csv(path)
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["frame", "draw", "overshoot", "poll", "queue"]
+    assert rows[1] == ["1", "0.5", "0.25", "0.125", "3"]
+    assert len(rows) == 3
@@ -0,0 +1,129 @@
+import numpy as np
+from game2048.game_env import GameEnv
+from game2048.arguments import Command
+
+
+def test_reset_is_reproducible():
+    first = GameEnv(seed=7).reset()
+    second = GameEnv().reset(seed=7)
+    assert np.array_equal(first, second)
+    assert np.count_nonzero(first) == 2
+
+
+def test_step():
+    env = GameEnv(seed=1)
+    env.field = np.array([[2, 2, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+    field, reward, done, info = env.step(Command.LEFT)
+    assert reward == 4 and info["changed"] and not done
+    assert field[0][0] == 4
+    assert np.count_nonzero(field) == 2
+    assert info["spawn"] is not None and env.score == 4
+
+
+def test_step_without_change_adds_no_tile():
+    env = GameEnv(seed=1)
+    env.field = np.array([[2, 4, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+    field, reward, done, info = env.step(Command.LEFT)
+    assert not info["changed"] and info["spawn"] is None and reward == 0
+    assert np.count_nonzero(field) == 2
+
+
+def test_legal_moves():
+    env = GameEnv()
+    env.field = np.array([[2, 4, 8, 16], [4, 8, 16, 32], [8, 16, 32, 64], [16, 32, 64, 0]])
+    assert set(env.legal_moves()) == {Command.RIGHT, Command.DOWN}
+    env.field = np.array([[2, 4, 8], [4, 8, 16], [8, 16, 2]])
+    assert env.legal_moves() == []
+    assert env.check_losing(env.field)
+
+
+def test_large_field():
+    env = GameEnv(height=5, width=6, seed=3)
+    env.reset()
+    assert env.field.shape == (5, 6)
+    while not env.step(env.legal_moves()[0])[2]:
+        pass
+    assert env.legal_moves() == []
+
+
+def test_version_counts_changes():
+    env = GameEnv(seed=1)
+    env.field = np.array([[2, 4, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+    version = env.version
+    env.step(Command.LEFT)
+    assert env.version == version
+    env.step(Command.RIGHT)
+    assert env.version > version
+
+
+def test_exponent_storage_matches_values():
+    from game2048.game_env import slide_batch
+    from game2048.board import to_exponents, to_values
+    rng = np.random.default_rng(21)
+    boards = rng.choice([0, 0, 2, 2, 4, 8, 2 ** 20], size=(50, 7, 9))
+    for command in [Command.LEFT, Command.RIGHT, Command.UP, Command.DOWN]:
+        values, score, changed = slide_batch(boards, command)
+        exponents, exponent_score, exponent_changed = slide_batch(to_exponents(boards), command, exponents=True)
+        assert exponents.dtype == np.uint8
+        assert np.array_equal(to_values(exponents), values)
+        assert np.array_equal(score, exponent_score) and np.array_equal(changed, exponent_changed)
+
+
+def test_large_board_checks():
+    env = GameEnv(height=300, width=200)
+    field = np.tile([[2, 4], [4, 2]], (150, 100))
+    env.field = field
+    assert env.check_losing(env.field) and env.legal_moves() == []
+    assert not env.check_winning(env.field)
+    field[-1, -1] = 2048
+    env.field = field
+    assert env.check_winning(env.field) and env.step(Command.LEFT)[3]["won"]
+
+
+def test_empty_tile_index():
+    env = GameEnv(height=12, width=10, seed=5)
+    env.reset()
+    for _ in range(100):
+        env.add_tile()
+        assert env.empty_count() == len(env.empty_tiles()) == np.count_nonzero(env.field == 0)
+    assert env.empty_tiles() == [(int(i), int(j)) for i, j in np.argwhere(env.field == 0)]
+    env.step(Command.LEFT)
+    assert env.empty_count() == np.count_nonzero(env.field == 0)
+
+
+def test_legal_move_mask_matches_slides():
+    from game2048.game_env import legal_move_mask, slide_batch
+    from game2048.arguments import DIRECTIONS
+    rng = np.random.default_rng(23)
+    boards = rng.choice([0, 2, 4, 8, 16, 32, 64], p=[0.1] + [0.15] * 6, size=(500, 3, 5))
+    mask = legal_move_mask(boards)
+    for n, command in enumerate(DIRECTIONS):
+        assert np.array_equal(mask[:, n], slide_batch(boards, command)[2])
+
+
+def test_target_and_max_tile():
+    env = GameEnv(height=3, width=3, target=64)
+    env.field = np.array([[32, 32, 0], [2, 0, 0], [0, 0, 0]])
+    assert env.max_tile == 32 and not env.won()
+    _, _, _, info = env.step(Command.LEFT)
+    assert env.max_tile == 64 and info["won"]
+    env = GameEnv(seed=2, target=8)
+    env.field = np.array([[4, 4, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+    assert env.step(Command.RIGHT)[3]["won"] and env.max_tile == 8
+
+
+def test_slide_during_decoding(monkeypatch):
+    from game2048 import game_env
+    env = GameEnv()
+    env.field = np.array([[2, 2, 0, 0]] + [[0] * 4] * 3)
+    decode = game_env.bitboard.decode_exponents
+
+    def slide_meanwhile(board):
+        # another thread slides, after the board was read
+        monkeypatch.setattr(game_env.bitboard, "decode_exponents", decode)
+        env.slide(Command.LEFT)
+        return decode(board)
+
+    monkeypatch.setattr(game_env.bitboard, "decode_exponents", slide_meanwhile)
+    assert list(env.field[0]) == [2, 2, 0, 0]
+    assert list(env.field[0]) == [4, 0, 0, 0]
@@ -0,0 +1,66 @@
+from game2048.arguments import Command, Screen
+from game2048.event_manager import EventManager, SlideEvent, InputRequest
+from game2048.controller.controller_remote import ControllerRemote
+from game2048.controller.input_stage import InputStage
+
+LEFT, RIGHT, UP = Command.LEFT, Command.RIGHT, Command.UP
+
+
+def commands(passed):
+    return [command for command, _ in passed]
+
+
+def test_debounce_and_rate():
+    stage = InputStage("debounce", window=0.1)
+    passed = []
+    for now, command in ((0.0, LEFT), (0.05, LEFT), (0.12, LEFT), (0.3, LEFT), (0.31, RIGHT)):
+        passed += stage.submit(command, now)
+    assert commands(passed) == [LEFT, LEFT, RIGHT]
+    assert stage.stats()["debounced"] == 2
+
+    stage = InputStage(max_rate=10)
+    passed = []
+    for now in (0.0, 0.05, 0.1, 0.15):
+        passed += stage.submit(UP, now)
+    assert commands(passed) == [UP, UP]
+    assert stage.stats()["rate_limited"] == 2
+
+
+def test_windows():
+    burst = ((0.0, LEFT), (0.01, RIGHT), (0.02, LEFT), (0.03, RIGHT))
+    for mode, expected in (("coalesce", RIGHT), ("vote", RIGHT)):
+        stage = InputStage(mode, window=0.1)
+        for now, command in burst:
+            assert stage.submit(command, now) == []
+        assert stage.poll(0.05) == []
+        assert stage.poll(0.1) == [(expected, 0.0)]
+        stats = stage.stats()
+        assert stats["merged"] == 3 and stats["passed"] == 1
+        assert abs(stats["window"]["max"] - 0.1) < 1e-9
+
+    stage = InputStage("vote", window=0.1)
+    for now, command in ((0.0, UP), (0.01, LEFT), (0.02, UP)):
+        stage.submit(command, now)
+    # the next command closes the window and opens a new one
+    assert stage.submit(RIGHT, 0.2) == [(UP, 0.0)]
+    assert stage.submit(Command.PAUSE, 0.21) == [(Command.PAUSE, 0.21)]
+
+
+def test_controller_plays_window_on_input_request():
+    clock = [0.0]
+    ev_manager = EventManager()
+    remote = ControllerRemote(ev_manager, hostname="127.0.0.1", port=0, write_config=False,
+                              input_stage=InputStage("vote", window=0.1, clock=lambda: clock[0]))
+    remote.wait_until_ready(timeout=5)
+    remote.stop()
+    remote._game_state = Screen.GAME
+    for command in ("a", "a", "d"):
+        remote._play_the_game(remote.input_parser(command))
+    ev_manager.post(InputRequest())
+    assert ev_manager.queue_size() == 0
+    clock[0] = 0.1
+    ev_manager.post(InputRequest())
+    assert ev_manager.queue_size() == 1
+    event = ev_manager._event_queue.get()
+    assert isinstance(event, SlideEvent) and event.data == LEFT
+    assert remote._input_stage.stats()["post"]["count"] == 1
@@ -2,6 +2,7 @@ from game2048.model import Model
 from game2048.event_manager import EventManager
 import numpy as np
 import pytest
+from game2048.arguments import Command
 
 
 @pytest.fixture()
@@ -35,3 +36,23 @@ def test_check_winning(init):
     f2 = np.array([[2, 4, 8, 16], [4, 8, 16, 32], [8, 16, 32, 64], [16, 32, 2048, 128]])
 
     assert (not init._check_winning(f1) and init._check_winning(f2))
+
+
+def test_legal_moves_and_target():
+    ev = EventManager()
+    game = Model(ev_manager=ev, target=128)
+    game._field = np.array([[2, 4, 8, 16], [4, 8, 16, 32], [8, 16, 32, 64], [16, 32, 64, 0]])
+    assert set(game.legal_moves()) == {Command.RIGHT, Command.DOWN}
+    assert not game._check_losing() and not game._check_winning()
+    game._field = np.array([[2, 4, 8, 16], [4, 8, 16, 32], [8, 16, 32, 64], [16, 32, 64, 128]])
+    assert game.legal_moves() == [] and game._check_losing() and game._check_winning()
+    assert game.get_target() == 128
+
+
+def test_target_argument():
+    from argparse import ArgumentTypeError
+    from game2048.__main__ import target_tile
+    assert target_tile("4") == 4 and target_tile("131072") == 131072
+    for text in ("2", "100", "-8", "x"):
+        with pytest.raises(ArgumentTypeError):
+            target_tile(text)
@@ -0,0 +1,47 @@
+from game2048.controller.protocol import (LineDecoder, encode_command, parse_command,
+                                          encode_ack, parse_ack)
+from game2048.controller.controller_remote import ControllerRemote
+from game2048.controller.controller_client import ControllerClient
+from game2048.controller.load_test import load_test
+from game2048.event_manager import EventManager
+from game2048.arguments import Command, Screen
+
+
+def test_line_decoder_joins_split_packets():
+    decoder = LineDecoder()
+    assert decoder.feed(b"1 le") == []
+    assert decoder.feed(b"ft\n2 up\n3") == ["1 left", "2 up"]
+    assert decoder.feed(b" down\n") == ["3 down"]
+    assert decoder.feed(b"pause") == []
+    assert decoder.close() == ["pause"]
+
+
+def test_commands_and_acks():
+    assert parse_command(encode_command(7, "left").decode().strip()) == (7, "left")
+    assert parse_command("w") == (0, "w")
+    assert parse_ack(encode_ack(7, "ok", 123).decode().strip()) == (7, 123, "ok")
+
+
+def test_pipelined_commands_are_answered_in_order():
+    ev_manager = EventManager()
+    remote = ControllerRemote(ev_manager, hostname="127.0.0.1", port=0, write_config=False)
+    remote._game_state = Screen.GAME
+    _, port = remote.wait_until_ready(timeout=5)
+
+    client = ControllerClient("127.0.0.1", interactive=False)
+    client.connect(port)
+    assert client.send("w", "a", "nonsense") == 3
+    assert client.send("d") == 4
+    client.close()
+    remote.stop()
+
+    assert len(client.latencies) == 4 and not client._sent
+    commands = []
+    while ev_manager.queue_size():
+        commands.append(ev_manager._event_queue.get().data)
+    assert commands == [Command.UP, Command.LEFT, Command.RIGHT]
+
+
+def test_load_test():
+    result = load_test(clients=20, commands=50, batch=7)
+    assert result["acked"] == result["events"] == 1000
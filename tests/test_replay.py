@@ -0,0 +1,79 @@
+import random
+import numpy as np
+import pytest
+from game2048.replay import Replay
+from game2048.trace import TraceReader
+from game2048.model import Model
+from game2048.event_manager import EventManager, QuitEvent
+from game2048.arguments import DIRECTIONS
+
+
+@pytest.fixture()
+def recorded(logged):
+    """Plays a seeded game with trace recording and returns the trace path"""
+    model = Model(ev_manager=EventManager(), seed=11)
+    rng = random.Random(0)
+    for _ in range(300):
+        model._slide(rng.choice(DIRECTIONS))
+    path = model._trace._file.name
+    model.notify(QuitEvent())
+    return path
+
+
+def test_seek_matches_sequential_replay(recorded):
+    replay = Replay(recorded, checkpoint_interval=16)
+    frames = list(replay.frames())
+    assert len(frames) == len(replay) == 300
+    for index in [1, 15, 16, 17, 200, 300]:
+        field, score = replay.seek(index)
+        assert np.array_equal(field, frames[index - 1][0]) and score == frames[index - 1][1]
+    assert len(replay._checkpoints) == 300 // 16 + 1
+
+
+def test_seek_from_the_middle(recorded):
+    replay = Replay(recorded, checkpoint_interval=16)
+    # all checkpoints exist before the first seek
+    assert len(replay._checkpoints) == 300 // 16 + 1
+    field, score = replay.seek(250)
+    expected = TraceReader(recorded).state_at(250)
+    assert np.array_equal(field, expected[0]) and score == expected[1]
+    with pytest.raises(IndexError):
+        replay.seek(301)
+
+
+def test_seeded_game_can_be_repeated(recorded):
+    assert Replay(recorded).verify() is None
+
+
+def test_seeded_models_are_equal():
+    first = Model(ev_manager=EventManager(), seed=5)
+    second = Model(ev_manager=EventManager(), seed=5)
+    assert np.array_equal(first._env.reset(), second._env.reset())
+    first = Model(ev_manager=EventManager(), rng=random.Random(5))
+    second = Model(ev_manager=EventManager(), rng=random.Random(5))
+    assert np.array_equal(first._env.reset(), second._env.reset())
+
+
+def test_logging_keeps_the_tiles(monkeypatch):
+    from game2048.database import logging_config
+    fields = []
+    for enabled in (False, True):
+        monkeypatch.setattr(logging_config, "_enabled", enabled)
+        model = Model(ev_manager=EventManager(), seed=5)
+        for command in DIRECTIONS * 10:
+            model._slide(command)
+        model.notify(QuitEvent())
+        fields.append(model.get_game()[0])
+    assert np.array_equal(*fields)
+
+
+def test_restarted_game_can_be_repeated(logged):
+    for seed in range(10):
+        model = Model(ev_manager=EventManager(), seed=seed)
+        for number in range(40):
+            model._slide(DIRECTIONS[number % 4])
+            if number % 10 == 9:
+                model._restart()
+        path = model._trace._file.name
+        model.notify(QuitEvent())
+        assert Replay(path).verify() is None, seed
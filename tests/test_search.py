@@ -0,0 +1,41 @@
+import numpy as np
+from game2048 import bitboard
+from game2048.board import to_exponents
+from game2048.search import Expectimax
+from game2048.arguments import Command
+
+
+def encode(field):
+    return bitboard.encode_exponents(to_exponents(np.array(field)))
+
+
+def test_best_move_is_legal():
+    field = np.array([[2, 4, 8, 16], [4, 8, 16, 32], [8, 16, 32, 64], [16, 32, 64, 0]])
+    move = Expectimax(time_budget=None, max_depth=2).best_move(encode(field))
+    assert move in (Command.RIGHT, Command.DOWN)
+
+
+def test_no_move_on_lost_board():
+    field = np.array([[2, 4, 8, 16], [4, 8, 16, 32], [8, 16, 32, 64], [16, 32, 64, 128]])
+    assert Expectimax(time_budget=None, max_depth=2).best_move(encode(field)) is None
+
+
+def test_transposition_table_is_bounded():
+    searcher = Expectimax(time_budget=None, max_depth=2, table_size=50)
+    searcher.best_move(encode([[2, 0, 0, 2], [0, 4, 0, 0], [0, 0, 0, 0], [0, 0, 8, 0]]))
+    assert len(searcher._table) <= 50
+
+
+def test_time_budget():
+    searcher = Expectimax(time_budget=0.005)
+    move = searcher.best_move(encode([[2, 0, 0, 2], [0, 4, 0, 0], [0, 0, 0, 0], [0, 0, 8, 0]]))
+    assert move is not None
+    assert searcher.last_latency < 0.05
+
+
+def test_choose_on_other_sizes():
+    field = np.array([[2, 2, 0], [0, 0, 0], [4, 0, 0]])
+    assert Expectimax().choose(to_exponents(field)) in (Command.LEFT, Command.RIGHT)
+    # two 2^15 tiles can't be searched on a bitboard
+    field = np.array([[32768, 32768, 0, 0], [0] * 4, [0] * 4, [0] * 4])
+    assert Expectimax().choose(to_exponents(field)) in (Command.LEFT, Command.RIGHT)
@@ -0,0 +1,18 @@
+from game2048.simulation import game_seeds, play_game, simulate, summarize
+
+
+def test_games_are_reproducible():
+    (game_seed, policy_seed), = game_seeds(5, 1)
+    first = play_game("greedy", game_seed, policy_seed)
+    second = play_game("greedy", game_seed, policy_seed)
+    assert first["score"] == second["score"] and first["moves"] == second["moves"]
+    assert first["max_tile"] >= 8
+
+
+def test_simulate_and_summarize():
+    results = list(simulate(games=3, workers=2, policy="random", seed=1))
+    assert sorted(result["game"] for result in results) == [0, 1, 2]
+    summary = summarize(results, wall_time=1.0)
+    assert summary["games"] == 3
+    assert summary["moves"] == sum(result["moves"] for result in results)
+    assert sum(summary["max_tiles"].values()) == 3
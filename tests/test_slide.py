@@ -62,4 +62,30 @@ def test_slide_merge_rot(init):
                     [4, 8, 4, 4]])
     init._field = old
     init._slide(Command.DOWN)
-    assert not_equal(init._field, new)
\ No newline at end of file
+    assert not_equal(init._field, new)
+
+def test_slide_batch_matches_model():
+    from game2048 import bitboard
+    from game2048.board import to_exponents, to_values
+    from game2048.model import slide_batch
+    rng = np.random.default_rng(2048)
+    boards = rng.choice([0, 0, 0, 2, 2, 4, 8, 16, 32], size=(300, 4, 4))
+    for command in [Command.LEFT, Command.RIGHT, Command.UP, Command.DOWN]:
+        result, score, changed = slide_batch(boards, command)
+        for n, board in enumerate(boards):
+            packed, points = bitboard.slide(bitboard.encode_exponents(to_exponents(board)), command)
+            assert np.array_equal(result[n], to_values(bitboard.decode_exponents(packed)))
+            assert score[n] == points
+            assert changed[n] == (packed != bitboard.encode_exponents(to_exponents(board)))
+
+
+def test_slide_batch_rectangular():
+    from game2048.model import slide_batch
+    boards = np.array([[[2, 2, 2, 0, 2],
+                        [4, 0, 4, 8, 8],
+                        [0, 0, 0, 0, 2]]])
+    result, score, changed = slide_batch(boards, Command.RIGHT)
+    assert np.array_equal(result[0], [[0, 0, 0, 4, 4],
+                                      [0, 0, 0, 8, 16],
+                                      [0, 0, 0, 0, 2]])
+    assert score[0] == 4 + 4 + 8 + 16 and changed[0]
@@ -0,0 +1,84 @@
+import time
+import numpy as np
+from game2048.spectator import SpectatorBroadcast
+from game2048.controller.protocol import apply_update
+from game2048.controller.controller_remote import ControllerRemote, _Subscription
+from game2048.controller.controller_client import ControllerClient
+from game2048.event_manager import EventManager, SlideEvent, StartEvent
+from game2048.model import Model
+from game2048.arguments import Command, Screen
+
+
+class Spectator:
+    def __init__(self, accept=True):
+        self.accept = accept
+        self.field = None
+        self.lines = []
+
+    def push(self, message):
+        if not self.accept:
+            return False
+        line = message.decode().strip()
+        self.lines.append(line)
+        self.field, self.score = apply_update(line, self.field)
+        return True
+
+
+def test_deltas_rebuild_the_board():
+    ev_manager = EventManager()
+    game = Model(ev_manager, seed=3)
+    broadcast = SpectatorBroadcast(ev_manager, game)
+    spectator, slow = Spectator(), Spectator()
+    broadcast.subscribe(spectator)
+    broadcast.subscribe(slow)
+    slow.accept = False
+
+    for command in (Command.LEFT, Command.UP, Command.RIGHT, Command.DOWN):
+        game.notify(SlideEvent(command))
+        broadcast.notify(SlideEvent(command))
+
+    assert np.array_equal(spectator.field, game.get_board()[0])
+    assert spectator.score == game.get_board()[1]
+    assert spectator.lines[0].startswith("BOARD")
+    assert len(broadcast) == 1
+
+
+def test_slow_subscription_is_dropped():
+    ev_manager = EventManager()
+    remote = ControllerRemote(ev_manager, hostname="127.0.0.1", port=0, write_config=False)
+    remote.wait_until_ready(timeout=5)
+    subscription = _Subscription(remote._wakeup_sender, max_backlog=10)
+    assert subscription.push(b"DELTA 4\n")
+    assert not subscription.push(b"DELTA 8\n")
+    assert subscription.closed
+    remote.stop()
+
+
+def test_watch_over_the_network():
+    ev_manager = EventManager()
+    game = Model(ev_manager, seed=5)
+    broadcast = SpectatorBroadcast(ev_manager, game)
+    remote = ControllerRemote(ev_manager, hostname="127.0.0.1", port=0, write_config=False,
+                              spectators=broadcast)
+    remote._game_state = Screen.GAME
+    _, port = remote.wait_until_ready(timeout=5)
+    ev_manager.post(StartEvent())
+
+    watcher = ControllerClient("127.0.0.1", interactive=False)
+    watcher.connect(port)
+    watcher.watch()
+    player = ControllerClient("127.0.0.1", interactive=False)
+    player.connect(port)
+    player.send("a", "w", "d", "s")
+    player.close()
+
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        if watcher.field is not None and np.array_equal(watcher.field, game.get_board()[0]) \
+                and len(watcher.latencies) == 1 and ev_manager.queue_size() == 0:
+            break
+        time.sleep(0.01)
+    assert np.array_equal(watcher.field, game.get_board()[0])
+    assert watcher.score == game.get_board()[1]
+    watcher.close()
+    remote.stop()
@@ -0,0 +1,28 @@
+import time
+from game2048.view.stimulus import StimulusScheduler
+
+
+def test_tables_hold_whole_periods():
+    scheduler = StimulusScheduler(fps=60)
+    assert len(scheduler._tables[6]) == 10
+    assert len(scheduler._tables[8]) == 15
+    assert len(scheduler._tables[15]) == 4
+    assert scheduler.colour(10) == (127, 127, 127)
+
+
+def test_frames_keep_their_slots():
+    scheduler = StimulusScheduler(fps=200)
+    for _ in range(20):
+        scheduler.wait()
+    assert scheduler.frame >= 20
+    stats = scheduler.stats()
+    assert abs(stats["frequencies"][10]["error"]) < 1
+
+
+def test_late_frames_are_dropped():
+    scheduler = StimulusScheduler(fps=100)
+    scheduler.wait()
+    time.sleep(0.055)
+    scheduler.wait()
+    assert scheduler.dropped >= 4
+    assert scheduler.frame >= 6
@@ -0,0 +1,75 @@
+import os
+import random
+import numpy as np
+import pytest
+from game2048.trace import TraceWriter, TraceReader
+from game2048.game_env import GameEnv
+from game2048.model import Model
+from game2048.event_manager import EventManager, QuitEvent
+from game2048.arguments import Command, DIRECTIONS
+
+
+@pytest.fixture()
+def path(tmp_path):
+    return os.path.join(tmp_path, "game.g2048")
+
+
+def play(env, writer, moves):
+    """Plays random moves and records them, returns the visited states"""
+    rng = random.Random(0)
+    states = []
+    for _ in range(moves):
+        command = rng.choice(DIRECTIONS)
+        field, score, done, info = env.step(command)
+        writer.record(command, info["spawn"], score)
+        states.append((np.copy(field), env.score))
+        if done:
+            env.reset()
+            writer.restart(env.start_tiles)
+    return states
+
+
+def test_header(path):
+    field = np.array([[0, 2, 0], [4, 0, 1024]])
+    TraceWriter(path, field, seed=42).close()
+    reader = TraceReader(path)
+    assert (reader.height, reader.width, reader.seed) == (2, 3, 42)
+    assert np.array_equal(reader.field, field)
+    assert list(reader) == []
+
+
+def test_states_are_reconstructed(path):
+    env = GameEnv(seed=3)
+    env.reset()
+    writer = TraceWriter(path, env.field, env.seed)
+    states = play(env, writer, 400)
+    writer.close()
+
+    reconstructed = [(field, score) for field, score, record in TraceReader(path).states()
+                     if record.command in DIRECTIONS]
+    assert len(reconstructed) == len(states)
+    for (field, score), (expected_field, expected_score) in zip(reconstructed, states):
+        assert np.array_equal(field, expected_field) and score == expected_score
+
+
+def test_incomplete_record_is_skipped(path):
+    env = GameEnv(seed=1)
+    env.reset()
+    writer = TraceWriter(path, env.field, env.seed)
+    play(env, writer, 5)
+    writer.close()
+    with open(path, "ab") as file:
+        file.write(b"\x01\x02")
+    assert len(list(TraceReader(path))) == 5
+
+
+def test_model_records_trace(logged):
+    model = Model(ev_manager=EventManager())
+    for command in [Command.LEFT, Command.UP, Command.RIGHT, Command.DOWN] * 5:
+        model._slide(command)
+    path = model._trace._file.name
+    model.notify(QuitEvent())
+
+    reader = TraceReader(path)
+    field, score = reader.state_at(len(list(reader)))
+    assert np.array_equal(field, model.get_game()[0])
@@ -1,3 +1,10 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+from game2048.view.view_gui import ViewGUI
+from game2048.model import Model
+from game2048.event_manager import EventManager
+
+
 # from game2048.view.view_shell import ViewShell as Shell
 # import numpy as np
 #
@@ -24,3 +31,9 @@
 #     s = Shell()
 #     matrix = np.array([[2, 4, 8, 16], [4, 8, 16, 32], [8, 16, 32, 64], [16, 32, 64, 128]])
 #     s.print_matrix(matrix=matrix, score=0)
+
+
+def test_tiles_above_2048():
+    view = ViewGUI(EventManager(), Model(EventManager(), target=4096), False)
+    for value in (4096, 2 ** 17):
+        assert view._tile_surface(value, (80, 80)).get_size() == (80, 80)